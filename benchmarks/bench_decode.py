@@ -0,0 +1,117 @@
+"""Per-call cost of decoding and validating large list_driver/list_invitations payloads.
+
+Compares the previous path (stdlib json + a model built per item in Python)
+with the current one (tessie.codec + a single model_validate call).
+
+    python benchmarks/bench_decode.py [items]
+"""
+import json
+import sys
+import timeit
+
+from typing import Any, Callable
+
+from tessie import codec
+from tessie.model import Driver, DriverList, Invitation, InvitationList
+
+
+def drivers_payload(items: int) -> bytes:
+    return json.dumps({
+        "response": [
+            {
+                "id": i,
+                "user_id": i,
+                "user_id_s": str(i),
+                "vault_uuid": f"00000000-0000-0000-0000-{i:012d}",
+                "driver_first_name": f"First{i}",
+                "driver_last_name": f"Last{i}",
+                "granular_access": {"hide_private": False},
+                "active_pubkeys": [],
+                "public_key": "",
+            }
+            for i in range(items)
+        ]
+    }).encode()
+
+
+def invitations_payload(items: int) -> bytes:
+    return json.dumps({
+        "response": [
+            {
+                "id": i,
+                "id_s": str(i),
+                "owner_id": 1,
+                "share_type": "customer",
+                "state": "pending",
+                "code": f"code{i}",
+                "expires_at": "2030-01-01T00:00:00.000Z",
+                "revoked_at": None,
+                "share_link": f"https://www.tesla.com/_rs/1/code{i}",
+            }
+            for i in range(items)
+        ]
+    }).encode()
+
+
+def drivers_before(body: bytes) -> Any:
+    data = json.loads(body)
+    drivers = DriverList(
+        drivers=[
+            Driver(
+                user_id=driver["user_id_s"],
+                name=driver["driver_first_name"] + " " + driver["driver_last_name"]
+            )
+            for driver in data["response"]
+        ]
+    )
+    return drivers.model_dump(mode="json", exclude_none=True)
+
+
+def drivers_after(body: bytes) -> Any:
+    data = codec.loads(body)
+    return DriverList.model_validate({"drivers": data["response"]}).model_dump(mode="json", exclude_none=True)
+
+
+def invitations_before(body: bytes) -> Any:
+    data = json.loads(body)
+    invitations = InvitationList(
+        invitations=[
+            Invitation(
+                id=invitation["id_s"],
+                share_link=invitation["share_link"],
+                state=invitation["state"]
+            )
+            for invitation in data["response"]
+        ]
+    )
+    return invitations.model_dump(mode="json", exclude_none=True)
+
+
+def invitations_after(body: bytes) -> Any:
+    data = codec.loads(body)
+    return InvitationList.model_validate({"invitations": data["response"]}).model_dump(mode="json", exclude_none=True)
+
+
+def measure(fn: Callable[[bytes], Any], body: bytes, number: int = 20) -> float:
+    """Returns the best per-call time in milliseconds."""
+    return min(timeit.repeat(lambda: fn(body), number=number, repeat=5)) / number * 1000
+
+
+def run(items: int = 5000) -> dict[str, dict[str, float]]:
+    results = {}
+    for name, payload, before, after in (
+        ("list_driver", drivers_payload(items), drivers_before, drivers_after),
+        ("list_invitations", invitations_payload(items), invitations_before, invitations_after),
+    ):
+        assert before(payload) == after(payload)
+        before_ms, after_ms = measure(before, payload), measure(after, payload)
+        results[name] = {"before_ms": before_ms, "after_ms": after_ms, "speedup": before_ms / after_ms}
+    return results
+
+
+if __name__ == "__main__":
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    print(f"{items} items per payload, orjson={'on' if codec.FAST_JSON else 'off'}")
+    for name, result in run(items).items():
+        print(f"{name:<18} before {result['before_ms']:8.2f} ms   after {result['after_ms']:8.2f} ms   "
+              f"x{result['speedup']:.2f}")
@@ -0,0 +1,176 @@
+"""Throughput and latency of the tool functions against the mock Tessie API on localhost.
+
+Every scenario starts a MockServer with the given latency and error rate and
+runs a mix of tool calls (get_location, get_battery, get_vehicle_snapshot,
+list_driver, list_invitation) with a number of concurrent callers. The tools
+go through the real registry, pool, cache, rate limiter and retries; only the
+API itself is simulated.
+
+    python benchmarks/bench_tools.py [--concurrency 1 8 32 64] [--calls 400] [--latency 0.02] [--error-rate 0.01]
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+
+from typing import Any, Awaitable, Callable
+
+from arcade_tdk import ToolContext, ToolSecretItem
+from arcade_tdk.errors import ToolExecutionError
+
+from tessie.cache import default_cache
+from tessie.mock import MockConfig, MockServer, MockTessieTransport
+from tessie.pool import BASE_URL_ENV, default_pool
+from tessie.ratelimit import RateLimitConfig, default_limiters
+from tessie.registry import default_clients
+from tessie.singleflight import default_refreshes, default_singleflight
+from tessie.store import default_store
+from tessie.tenancy import TenantBudget, default_scheduler
+from tessie.tools.car import get_battery, get_location, get_vehicle_snapshot
+from tessie.tools.drivers import list_driver
+from tessie.tools.invitation import list_invitation
+
+WORKLOAD: list[tuple[str, Callable[[str, ToolContext], Awaitable[Any]]]] = [
+    ("get_location", get_location),
+    ("get_battery", get_battery),
+    ("get_vehicle_snapshot", get_vehicle_snapshot),
+    ("list_driver", list_driver),
+    ("list_invitation", list_invitation),
+]
+
+
+def context_for(token: str) -> ToolContext:
+    context = ToolContext()
+    context.secrets = [ToolSecretItem(key="TESSIE_TOKEN", value=token)]
+    return context
+
+
+def percentile(ordered: list[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def reset(tessie_limits: bool) -> None:
+    await default_refreshes.drain()
+    await default_clients.clear()
+    default_refreshes.reset()
+    default_cache.clear()
+    default_store.clear()
+    default_singleflight.reset()
+    default_limiters.clear()
+    await default_pool.aclose()
+    default_scheduler.clear()
+    if tessie_limits:
+        default_limiters.configure(RateLimitConfig())
+        default_scheduler.configure(capacity=64, default_budget=TenantBudget())
+    else:
+        # Measure the client rather than the per-token request budget.
+        default_limiters.configure(RateLimitConfig(rate=1e6, burst=1_000_000))
+        default_scheduler.configure(capacity=1024, default_budget=TenantBudget(max_in_flight=1024, max_queued=100_000))
+
+
+async def scenario(concurrency: int,
+                   calls: int,
+                   config: MockConfig,
+                   vins: int = 100,
+                   tokens: int = 1,
+                   tessie_limits: bool = False) -> dict[str, Any]:
+    await reset(tessie_limits)
+    transport = MockTessieTransport(config, vins=[f"5YJ3E1EA4KF{i:06d}" for i in range(vins)])
+    rng = random.Random(config.seed)
+    contexts = [context_for(f"bench-token-{i}") for i in range(tokens)]
+    latencies: list[float] = []
+    errors = 0
+    remaining = calls
+
+    async def worker() -> None:
+        nonlocal errors, remaining
+        while remaining > 0:
+            remaining -= 1
+            _, tool = WORKLOAD[remaining % len(WORKLOAD)]
+            vin = rng.choice(transport.vins)
+            context = rng.choice(contexts)
+            started = time.perf_counter()
+            try:
+                await tool(vin, context)
+            except ToolExecutionError:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    async with MockServer(transport) as server:
+        os.environ[BASE_URL_ENV] = server.url
+        try:
+            started = time.perf_counter()
+            await asyncio.gather(*[worker() for _ in range(concurrency)])
+            elapsed = time.perf_counter() - started
+        finally:
+            del os.environ[BASE_URL_ENV]
+            await reset(tessie_limits)
+
+    latencies.sort()
+    upstream = transport.stats()
+    cache = default_cache.stats()
+    return {
+        "concurrency": concurrency,
+        "calls": calls,
+        "tokens": tokens,
+        "latency_s": config.latency,
+        "error_rate": config.error_rate,
+        "duration_s": round(elapsed, 4),
+        "calls_per_s": round(calls / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "errors": errors,
+        "connections_opened": server.connections,
+        "upstream_requests": upstream.requests,
+        "upstream_errors": upstream.errors,
+        "upstream_routes": upstream.routes,
+        "cache_hits": cache.hits,
+    }
+
+
+async def run(concurrency: list[int],
+              calls: int = 400,
+              latency: float = 0.02,
+              jitter: float = 0.01,
+              error_rate: float = 0.01,
+              vins: int = 100,
+              tokens: int = 1,
+              tessie_limits: bool = False) -> list[dict[str, Any]]:
+    config = MockConfig(latency=latency, jitter=jitter, error_rate=error_rate, seed=1)
+    return [await scenario(level, calls, config, vins, tokens, tessie_limits) for level in concurrency]
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 64])
+    parser.add_argument("--calls", type=int, default=400, help="Tool calls per concurrency level")
+    parser.add_argument("--latency", type=float, default=0.02, help="Mock API latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.01, help="Extra random latency of up to this many seconds")
+    parser.add_argument("--error-rate", type=float, default=0.01, help="Share of mock responses that fail with 503")
+    parser.add_argument("--vins", type=int, default=100)
+    parser.add_argument("--tokens", type=int, default=1, help="Number of tenants the calls are spread over")
+    parser.add_argument("--tessie-limits", action="store_true",
+                        help="Keep the default per-token rate limits instead of lifting them")
+
+
+def run_from_args(args: argparse.Namespace) -> list[dict[str, Any]]:
+    return asyncio.run(run(args.concurrency, args.calls, args.latency, args.jitter, args.error_rate,
+                           args.vins, args.tokens, args.tessie_limits))
+
+
+def print_table(results: list[dict[str, Any]]) -> None:
+    print(f"{'conc':>5} {'calls/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7} "
+          f"{'conns':>6} {'upstream':>9}")
+    for result in results:
+        print(f"{result['concurrency']:>5} {result['calls_per_s']:>9.1f} {result['p50_ms']:>8.2f} "
+              f"{result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f} {result['errors']:>7} "
+              f"{result['connections_opened']:>6} {result['upstream_requests']:>9}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_arguments(parser)
+    print_table(run_from_args(parser.parse_args()))
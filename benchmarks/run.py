@@ -0,0 +1,43 @@
+"""Runs all benchmarks and writes one JSON report that can be compared across versions.
+
+    python benchmarks/run.py [--output bench-report.json] [bench_tools options] [--decode-items 5000]
+"""
+import argparse
+import json
+import platform
+import sys
+
+from datetime import datetime, timezone
+from importlib import metadata
+
+import bench_decode
+import bench_tools
+
+from tessie import codec
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default="bench-report.json")
+    parser.add_argument("--decode-items", type=int, default=5000)
+    bench_tools.add_arguments(parser)
+    args = parser.parse_args()
+
+    tools = bench_tools.run_from_args(args)
+    bench_tools.print_table(tools)
+    report = {
+        "version": metadata.version("tessie"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "orjson": codec.FAST_JSON,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "tools": tools,
+        "decode": bench_decode.run(args.decode_items),
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+
+from typing import Any, AsyncIterator, Callable, Optional, TypeVar
+from pydantic import BaseModel
+
+from tessie.model import Charge, Drive, DriverList, InvitationList, PathPoint
+from tessie.tessie_client import TessieClient
+from tessie.timeseries import SeriesBuilder, TelemetrySeries
+
+ARCHIVE_PATH_ENV = "TESSIE_ARCHIVE_PATH"
+
+# Seconds below the high-water mark that are fetched again on the next sync: drives and
+# charges in progress only show up once they end, path points arrive with a short delay.
+SYNC_OVERLAP = {"path": 600, "drives": 6 * 3600, "charges": 6 * 3600}
+BATCH_SIZE = 5000
+
+# Bumped whenever SCHEMA changes incompatibly; the tables of older archives are dropped, which
+# only costs a re-download.
+SCHEMA_VERSION = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS path (
+    token_key TEXT NOT NULL,
+    vin TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    latitude REAL NOT NULL,
+    longitude REAL NOT NULL,
+    battery_level REAL,
+    battery_range REAL,
+    PRIMARY KEY (token_key, vin, timestamp)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS drives (
+    token_key TEXT NOT NULL,
+    vin TEXT NOT NULL,
+    started_at INTEGER NOT NULL,
+    id INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (token_key, vin, started_at, id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS charges (
+    token_key TEXT NOT NULL,
+    vin TEXT NOT NULL,
+    started_at INTEGER NOT NULL,
+    id INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (token_key, vin, started_at, id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS snapshots (
+    token_key TEXT NOT NULL,
+    vin TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    taken_at REAL NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (token_key, vin, kind)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sync_state (
+    token_key TEXT NOT NULL,
+    vin TEXT NOT NULL,
+    stream TEXT NOT NULL,
+    synced_from INTEGER NOT NULL,
+    synced_to INTEGER NOT NULL,
+    PRIMARY KEY (token_key, vin, stream, synced_from)
+) WITHOUT ROWID;
+"""
+
+T = TypeVar("T")
+M = TypeVar("M", bound=BaseModel)
+
+
+class SyncRange(BaseModel):
+    synced_from: int
+    synced_to: int
+
+
+class TelemetryArchive:
+    """On-disk (SQLite) copy of path, drive and charge history plus driver/invitation snapshots.
+
+    Rows are keyed by (token fingerprint, vin, timestamp), so range queries are
+    index scans and tenants sharing a worker never see each other's data. Each
+    token, VIN and stream remembers the disjoint time ranges it was synced for; a sync
+    only asks Tessie for the parts of the requested range not covered by them,
+    re-fetching SYNC_OVERLAP seconds before the end of a synced range. All
+    database work runs in a worker thread.
+    """
+
+    path: str
+    _conn: sqlite3.Connection
+    _lock: threading.Lock
+
+    def __init__(self, path: str = ":memory:") -> None:
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            if self._conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                for table in ("path", "drives", "charges", "snapshots", "sync_state"):
+                    self._conn.execute(f"DROP TABLE IF EXISTS {table}")
+                self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self._conn.executescript(SCHEMA)
+
+    async def _run(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        def locked() -> T:
+            with self._lock, self._conn:
+                return fn(self._conn)
+
+        return await asyncio.to_thread(locked)
+
+    async def close(self) -> None:
+        await self._run(lambda conn: None)
+        self._conn.close()
+
+    async def synced_ranges(self, token_key: str, vin: str, stream: str) -> list[SyncRange]:
+        rows = await self._run(
+            lambda conn: conn.execute(
+                "SELECT synced_from, synced_to FROM sync_state WHERE token_key = ? AND vin = ? AND stream = ? "
+                "ORDER BY synced_from",
+                (token_key, vin, stream),
+            ).fetchall()
+        )
+        return [SyncRange(synced_from=synced_from, synced_to=synced_to) for synced_from, synced_to in rows]
+
+    async def high_water(self, token_key: str, vin: str, stream: str) -> Optional[int]:
+        ranges = await self.synced_ranges(token_key, vin, stream)
+        return ranges[-1].synced_to if ranges else None
+
+    async def _gaps(self, token_key: str, vin: str, stream: str, start: int, end: int) -> list[tuple[int, int]]:
+        gaps = []
+        cursor, after_synced = start, False
+        for synced in await self.synced_ranges(token_key, vin, stream):
+            if synced.synced_to < cursor:
+                continue
+            if synced.synced_from > end:
+                break
+            if synced.synced_from > cursor:
+                gaps.append((max(start, cursor - SYNC_OVERLAP[stream]) if after_synced else cursor, synced.synced_from))
+            cursor, after_synced = max(cursor, synced.synced_to), True
+        if cursor < end:
+            gaps.append((max(start, cursor - SYNC_OVERLAP[stream]) if after_synced else cursor, end))
+        return gaps
+
+    async def _mark_synced(self, token_key: str, vin: str, stream: str, start: int, end: int) -> None:
+        """Records start..end as synced, merging it with the ranges it overlaps or touches."""
+        def merge(conn: sqlite3.Connection) -> None:
+            where = "token_key = ? AND vin = ? AND stream = ? AND synced_from <= ? AND synced_to >= ?"
+            params = (token_key, vin, stream, end, start)
+            rows = conn.execute(f"SELECT synced_from, synced_to FROM sync_state WHERE {where}", params).fetchall()
+            conn.execute(f"DELETE FROM sync_state WHERE {where}", params)
+            conn.execute(
+                "INSERT INTO sync_state VALUES (?, ?, ?, ?, ?)",
+                (token_key, vin, stream, min([start, *(row[0] for row in rows)]), max([end, *(row[1] for row in rows)])),
+            )
+
+        await self._run(merge)
+
+    async def _write(self, sql: str, rows: list[tuple]) -> None:
+        if rows:
+            await self._run(lambda conn: conn.executemany(sql, rows))
+
+    async def sync_path(self, client: TessieClient, vin: str, start: int, end: int) -> int:
+        """Downloads the path points between start and end that are not stored yet; returns the number fetched."""
+        sql = "INSERT OR REPLACE INTO path VALUES (?, ?, ?, ?, ?, ?, ?)"
+        token_key = client.token_key
+        fetched = 0
+        for gap_start, gap_end in await self._gaps(token_key, vin, "path", start, end):
+            rows: list[tuple] = []
+            async for point in client.iter_path(vin, gap_start, gap_end):
+                rows.append((token_key, vin, point.timestamp, point.latitude, point.longitude, point.battery_level, None))
+                if len(rows) >= BATCH_SIZE:
+                    await self._write(sql, rows)
+                    fetched, rows = fetched + len(rows), []
+            await self._write(sql, rows)
+            fetched += len(rows)
+            await self._mark_synced(token_key, vin, "path", gap_start, gap_end)
+        return fetched
+
+    async def sync_drives(self, client: TessieClient, vin: str, start: int, end: int) -> int:
+        token_key = client.token_key
+        fetched = 0
+        for gap_start, gap_end in await self._gaps(token_key, vin, "drives", start, end):
+            rows = [
+                (token_key, vin, drive.started_at, drive.id, drive.model_dump_json())
+                async for drive in client.iter_drives(vin, gap_start, gap_end)
+            ]
+            await self._write("INSERT OR REPLACE INTO drives VALUES (?, ?, ?, ?, ?)", rows)
+            await self._mark_synced(token_key, vin, "drives", gap_start, gap_end)
+            fetched += len(rows)
+        return fetched
+
+    async def sync_charges(self, client: TessieClient, vin: str, start: int, end: int) -> int:
+        token_key = client.token_key
+        fetched = 0
+        for gap_start, gap_end in await self._gaps(token_key, vin, "charges", start, end):
+            rows = [
+                (token_key, vin, charge.started_at, charge.id, charge.model_dump_json())
+                async for charge in client.iter_charges(vin, gap_start, gap_end)
+            ]
+            await self._write("INSERT OR REPLACE INTO charges VALUES (?, ?, ?, ?, ?)", rows)
+            await self._mark_synced(token_key, vin, "charges", gap_start, gap_end)
+            fetched += len(rows)
+        return fetched
+
+    async def _select(self, sql: str, params: tuple) -> AsyncIterator[list[Any]]:
+        """Yields the result of a query in batches, so a long range is never loaded at once."""
+        def open_cursor(conn: sqlite3.Connection) -> sqlite3.Cursor:
+            return conn.execute(sql, params)
+
+        cursor = await self._run(open_cursor)
+        try:
+            while True:
+                rows = await self._run(lambda conn: cursor.fetchmany(BATCH_SIZE))
+                if not rows:
+                    break
+                yield rows
+        finally:
+            cursor.close()
+
+    async def iter_path(self, token_key: str, vin: str, start: int, end: int) -> AsyncIterator[PathPoint]:
+        sql = "SELECT timestamp, latitude, longitude, battery_level FROM path " \
+              "WHERE token_key = ? AND vin = ? AND timestamp BETWEEN ? AND ? ORDER BY timestamp"
+        async for rows in self._select(sql, (token_key, vin, start, end)):
+            for timestamp, latitude, longitude, battery_level in rows:
+                yield PathPoint(
+                    timestamp=timestamp,
+                    latitude=latitude,
+                    longitude=longitude,
+                    battery_level=None if battery_level is None else int(battery_level),
+                )
+
+    async def path_series(self, token_key: str, vin: str, start: int, end: int) -> TelemetrySeries:
+        builder = SeriesBuilder()
+        sql = "SELECT timestamp, latitude, longitude, battery_level, battery_range FROM path " \
+              "WHERE token_key = ? AND vin = ? AND timestamp BETWEEN ? AND ? ORDER BY timestamp"
+        async for rows in self._select(sql, (token_key, vin, start, end)):
+            for timestamp, latitude, longitude, battery_level, battery_range in rows:
+                builder.append(
+                    {
+                        "timestamp": timestamp,
+                        "latitude": latitude,
+                        "longitude": longitude,
+                        "battery_level": battery_level,
+                        "battery_range": battery_range,
+                    }
+                )
+        return builder.build()
+
+    async def iter_drives(self, token_key: str, vin: str, start: int, end: int) -> AsyncIterator[Drive]:
+        sql = "SELECT data FROM drives WHERE token_key = ? AND vin = ? AND started_at BETWEEN ? AND ? ORDER BY started_at, id"
+        async for rows in self._select(sql, (token_key, vin, start, end)):
+            for (data,) in rows:
+                yield Drive.model_validate_json(data)
+
+    async def iter_charges(self, token_key: str, vin: str, start: int, end: int) -> AsyncIterator[Charge]:
+        sql = "SELECT data FROM charges WHERE token_key = ? AND vin = ? AND started_at BETWEEN ? AND ? ORDER BY started_at, id"
+        async for rows in self._select(sql, (token_key, vin, start, end)):
+            for (data,) in rows:
+                yield Charge.model_validate_json(data)
+
+    async def save_snapshot(self, token_key: str, vin: str, kind: str, snapshot: BaseModel) -> None:
+        await self._run(
+            lambda conn: conn.execute(
+                "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?)",
+                (token_key, vin, kind, time.time(), snapshot.model_dump_json(exclude_none=True)),
+            )
+        )
+
+    async def _load_snapshot(self, token_key: str, vin: str, kind: str, model: type[M]) -> Optional[M]:
+        row = await self._run(
+            lambda conn: conn.execute(
+                "SELECT data FROM snapshots WHERE token_key = ? AND vin = ? AND kind = ?", (token_key, vin, kind)
+            ).fetchone()
+        )
+        return model.model_validate_json(row[0]) if row else None
+
+    async def drivers(self, token_key: str, vin: str) -> Optional[DriverList]:
+        return await self._load_snapshot(token_key, vin, "drivers", DriverList)
+
+    async def invitations(self, token_key: str, vin: str) -> Optional[InvitationList]:
+        return await self._load_snapshot(token_key, vin, "invitations", InvitationList)
+
+
+_default_archive: Optional[TelemetryArchive] = None
+
+
+def configure_archive(path: Optional[str]) -> Optional[TelemetryArchive]:
+    """Opens the process-wide archive at path (None disables it)."""
+    global _default_archive
+    _default_archive = TelemetryArchive(path) if path else None
+    return _default_archive
+
+
+def default_archive() -> Optional[TelemetryArchive]:
+    """Returns the process-wide archive, opening it from TESSIE_ARCHIVE_PATH on first use."""
+    if _default_archive is None and os.environ.get(ARCHIVE_PATH_ENV):
+        return configure_archive(os.environ[ARCHIVE_PATH_ENV])
+    return _default_archive
@@ -0,0 +1,159 @@
+import time
+
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional
+from pydantic import BaseModel, Field
+
+from tessie.instrumentation import Instrumentation, default_instrumentation
+
+
+DEFAULT_TTLS: dict[str, float] = {
+    "drive_state": 10.0,
+    "charge_state": 60.0,
+    "climate_state": 60.0,
+    "vehicle_state": 60.0,
+    "drivers": 300.0,
+    "invitations": 300.0,
+    "status": 5.0,
+}
+
+# (token fingerprint, VIN, endpoint)
+CacheKey = tuple[str, str, str]
+
+
+class CacheStats(BaseModel):
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+
+
+class CacheEntry(BaseModel):
+    value: Any
+    stored_at: float
+    as_of: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire after a per-endpoint TTL.
+
+    All operations are synchronous and never await, so they are atomic with
+    respect to the event loop and safe to share between concurrent tool calls.
+    Expired entries are kept until they are evicted or overwritten so callers
+    can still fall back to them explicitly.
+    """
+
+    _entries: "OrderedDict[CacheKey, CacheEntry]"
+    _ttls: dict[str, float]
+    _default_ttl: float
+    _max_size: int
+    _clock: Callable[[], float]
+    _stats: CacheStats
+    _instrumentation: Instrumentation
+    _generations: dict[CacheKey, int]
+
+    def __init__(self,
+                 ttls: Optional[dict[str, float]] = None,
+                 default_ttl: float = 30.0,
+                 max_size: int = 4096,
+                 clock: Callable[[], float] = time.monotonic,
+                 instrumentation: Optional[Instrumentation] = None) -> None:
+        self._entries = OrderedDict()
+        self._ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self._default_ttl = default_ttl
+        self._max_size = max_size
+        self._clock = clock
+        self._stats = CacheStats()
+        self._instrumentation = instrumentation if instrumentation is not None else default_instrumentation
+        self._generations = {}
+
+    def ttl(self, endpoint: str) -> float:
+        return self._ttls.get(endpoint, self._default_ttl)
+
+    def set_ttl(self, endpoint: str, ttl: float) -> None:
+        self._ttls[endpoint] = ttl
+
+    def get(self, key: CacheKey, max_age: Optional[float] = None) -> Optional[Any]:
+        """Returns the cached value if it is younger than max_age (default: the endpoint TTL)."""
+        entry = self._entries.get(key)
+        limit = self.ttl(key[2]) if max_age is None else max_age
+        if entry is None or self._clock() - entry.stored_at > limit:
+            self._stats.misses += 1
+            if self._instrumentation.enabled:
+                self._instrumentation.count("tessie.cache.misses", endpoint=key[2])
+            return None
+
+        self._entries.move_to_end(key)
+        self._stats.hits += 1
+        if self._instrumentation.enabled:
+            self._instrumentation.count("tessie.cache.hits", endpoint=key[2])
+        return entry.value
+
+    def get_entry(self, key: CacheKey) -> Optional[CacheEntry]:
+        """Returns the entry regardless of its age, without touching the counters."""
+        return self._entries.get(key)
+
+    def age(self, entry: CacheEntry) -> float:
+        return self._clock() - entry.stored_at
+
+    def generation(self, key: CacheKey) -> int:
+        """Returns how often the key has been patched; read it before fetching and pass it to set()."""
+        return self._generations.get(key, 0)
+
+    def set(self, key: CacheKey, value: Any, generation: Optional[int] = None) -> bool:
+        """Stores value, unless the key was patched since generation was read.
+
+        A value fetched before a write would otherwise overwrite the patched one
+        with data that does not reflect the write. Returns whether it was stored.
+        """
+        if generation is not None and generation != self.generation(key):
+            return False
+
+        self._entries[key] = CacheEntry(value=value, stored_at=self._clock())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            self._stats.evictions += 1
+        return True
+
+    def patch(self, key: CacheKey, update: Callable[[Any], Any]) -> bool:
+        """Replaces a cached value with update(value), keeping its original age.
+
+        Bumps the key's generation even if nothing was cached, so fetches that
+        started before the write are not stored. Returns False if nothing was
+        cached for the key.
+        """
+        self._generations[key] = self.generation(key) + 1
+        entry = self._entries.get(key)
+        if entry is None:
+            return False
+
+        self._entries[key] = entry.model_copy(update={"value": update(entry.value)})
+        return True
+
+    def invalidate(self, key: CacheKey) -> None:
+        self._entries.pop(key, None)
+
+    def invalidate_token(self, token_key: str) -> int:
+        """Drops every entry of one token and returns how many there were."""
+        keys = [key for key in self._entries if key[0] == token_key]
+        for key in keys:
+            del self._entries[key]
+        for key in [key for key in self._generations if key[0] == token_key]:
+            del self._generations[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._generations.clear()
+        self._stats = CacheStats()
+
+    def stats(self) -> CacheStats:
+        return self._stats.model_copy(update={"size": len(self._entries)})
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+default_cache = TTLCache()
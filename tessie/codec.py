@@ -0,0 +1,24 @@
+import json
+
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the installed extras
+    orjson = None  # type: ignore[assignment]
+
+# True when responses are decoded with orjson; install the `fast` extra to enable it.
+FAST_JSON = orjson is not None
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decodes a JSON document with orjson when it is installed, falling back to the stdlib."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":")).encode()
@@ -0,0 +1,64 @@
+import time
+import httpx
+
+from typing import Callable, Optional, Union
+from pydantic import BaseModel
+
+
+class TimeoutConfig(BaseModel):
+    connect: float = 5.0
+    read: float = 10.0
+    write: float = 10.0
+    pool: float = 5.0
+    total: float = 30.0
+
+    def per_attempt(self) -> httpx.Timeout:
+        return httpx.Timeout(connect=self.connect, read=self.read, write=self.write, pool=self.pool)
+
+
+class DeadlineExceeded(httpx.TimeoutException):
+    """The overall time budget of a call ran out, including queueing and retries."""
+
+
+# Hints for the model when a tool call runs out of time, passed as additional_prompt_content.
+READ_TIMEOUT_HINT = "Retry with a larger deadline or accept an older cached value via max_age."
+WRITE_TIMEOUT_HINT = "The change may still have been applied; check the current state before retrying."
+
+
+class Deadline:
+    """A time budget that is handed down from a tool call through every retry."""
+
+    seconds: float
+    _expires_at: float
+    _clock: Callable[[], float]
+
+    def __init__(self, seconds: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.seconds = seconds
+        self._clock = clock
+        self._expires_at = clock() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self._expires_at - self._clock())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+    def allows(self, delay: float) -> bool:
+        """Returns True if waiting for delay seconds still leaves budget for another attempt."""
+        return delay < self.remaining()
+
+    @classmethod
+    def within(cls, seconds: "DeadlineLike", default: float) -> "Deadline":
+        """Returns seconds if it already is a Deadline, otherwise starts a new one (default if None)."""
+        if isinstance(seconds, Deadline):
+            return seconds
+        return cls(seconds if seconds is not None else default)
+
+    @classmethod
+    def start(cls, seconds: Optional[float]) -> Optional["Deadline"]:
+        """Starts the budget of a whole tool call, shared by every request it makes."""
+        return cls(seconds) if seconds is not None else None
+
+
+# A budget in seconds that starts when the request is sent, or one that is already running.
+DeadlineLike = Union[float, Deadline, None]
@@ -0,0 +1,303 @@
+import math
+import time
+
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Iterable, Optional, Sequence
+
+from pydantic import BaseModel, Field, model_validator
+
+from tessie.history import haversine_km
+
+KM_PER_DEGREE_LAT = 111.32
+EARTH_RADIUS_KM = 6371.0
+DEFAULT_CELL_DEG = 0.05
+DEFAULT_POSITIONS_TTL = 30.0
+
+
+class Geofence(BaseModel):
+    """A named area, either a circle (center and radius) or a polygon of (latitude, longitude) points."""
+
+    name: str
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    radius_km: Optional[float] = None
+    polygon: Optional[list[tuple[float, float]]] = None
+
+    @model_validator(mode="after")
+    def _check_shape(self) -> "Geofence":
+        circle = self.latitude is not None and self.longitude is not None and self.radius_km is not None
+        if circle == (self.polygon is not None):
+            raise ValueError("A geofence needs either latitude, longitude and radius_km or a polygon")
+        if self.polygon is not None and len(self.polygon) < 3:
+            raise ValueError("A polygon geofence needs at least 3 points")
+        if self.radius_km is not None and self.radius_km <= 0:
+            raise ValueError("radius_km must be positive")
+        return self
+
+    def contains(self, latitude: float, longitude: float) -> bool:
+        if self.polygon is not None:
+            return point_in_polygon(latitude, longitude, self.polygon)
+        assert self.latitude is not None and self.longitude is not None and self.radius_km is not None
+        return haversine_km(self.latitude, self.longitude, latitude, longitude) <= self.radius_km
+
+    def bounds(self) -> tuple[float, float, float, float]:
+        """Returns (min_lat, min_lon, max_lat, max_lon)."""
+        if self.polygon is not None:
+            lats = [lat for lat, _ in self.polygon]
+            lons = [lon for _, lon in self.polygon]
+            return min(lats), min(lons), max(lats), max(lons)
+        assert self.latitude is not None and self.longitude is not None and self.radius_km is not None
+        return circle_bounds(self.latitude, self.longitude, self.radius_km)
+
+
+class GeofenceEvent(BaseModel):
+    vin: str
+    geofence: str
+    event: str
+    latitude: float
+    longitude: float
+    at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class Neighbor(BaseModel):
+    vin: str
+    latitude: float
+    longitude: float
+    distance_km: float
+
+
+def point_in_polygon(latitude: float, longitude: float, polygon: Sequence[tuple[float, float]]) -> bool:
+    """Ray casting test; the polygon is a list of (latitude, longitude) vertices and closes itself."""
+    inside = False
+    j = len(polygon) - 1
+    for i in range(len(polygon)):
+        lat_i, lon_i = polygon[i]
+        lat_j, lon_j = polygon[j]
+        if (lat_i > latitude) != (lat_j > latitude):
+            crossing = lon_i + (latitude - lat_i) * (lon_j - lon_i) / (lat_j - lat_i)
+            if longitude < crossing:
+                inside = not inside
+        j = i
+    return inside
+
+
+def normalize_longitude(longitude: float) -> float:
+    """Maps a longitude onto [-180, 180)."""
+    return (longitude + 180.0) % 360.0 - 180.0
+
+
+def circle_bounds(latitude: float, longitude: float, radius_km: float) -> tuple[float, float, float, float]:
+    """Returns (min_lat, min_lon, max_lat, max_lon); the longitudes may run past ±180 when the circle crosses the antimeridian."""
+    dlat = radius_km / KM_PER_DEGREE_LAT
+    if abs(latitude) + dlat >= 90.0:
+        # The circle covers a pole, so it spans every longitude.
+        return max(-90.0, latitude - dlat), -180.0, min(90.0, latitude + dlat), 180.0
+    cos_lat = math.cos(math.radians(abs(latitude) + dlat))
+    dlon = min(180.0, radius_km / (KM_PER_DEGREE_LAT * cos_lat))
+    longitude = normalize_longitude(longitude)
+    return latitude - dlat, longitude - dlon, latitude + dlat, longitude + dlon
+
+
+def longitude_spans(min_lon: float, max_lon: float) -> list[tuple[float, float]]:
+    """Splits a longitude range that crosses the antimeridian into ranges within [-180, 180]."""
+    if max_lon - min_lon >= 360.0:
+        return [(-180.0, 180.0)]
+    if min_lon < -180.0:
+        return [(min_lon + 360.0, 180.0), (-180.0, max_lon)]
+    if max_lon > 180.0:
+        return [(min_lon, 180.0), (-180.0, max_lon - 360.0)]
+    return [(min_lon, max_lon)]
+
+
+class SpatialIndex:
+    """Positions of VINs in a fixed grid of cell_deg x cell_deg cells (a geohash-style bucket grid).
+
+    Lookups only visit the cells overlapping the query area, so their cost
+    depends on the number of cars nearby rather than on the fleet size.
+    """
+
+    _cell_deg: float
+    _lon_cells: int
+    _cells: defaultdict[tuple[int, int], set[str]]
+    _positions: dict[str, tuple[float, float]]
+
+    def __init__(self, cell_deg: float = DEFAULT_CELL_DEG) -> None:
+        self._cell_deg = cell_deg
+        self._lon_cells = math.ceil(360.0 / cell_deg)
+        self._cells = defaultdict(set)
+        self._positions = {}
+
+    def _cell(self, latitude: float, longitude: float) -> tuple[int, int]:
+        # Longitude cells are counted from -180, so 180 and -180 land in the same column.
+        column = math.floor((normalize_longitude(longitude) + 180.0) / self._cell_deg)
+        return math.floor(latitude / self._cell_deg), min(column, self._lon_cells - 1)
+
+    def _column(self, longitude: float) -> int:
+        """The cell column of a bound in [-180, 180]; unlike _cell, 180 maps to the last column."""
+        return max(0, min(math.floor((longitude + 180.0) / self._cell_deg), self._lon_cells - 1))
+
+    def update(self, vin: str, latitude: float, longitude: float) -> None:
+        self.remove(vin)
+        self._positions[vin] = (latitude, longitude)
+        self._cells[self._cell(latitude, longitude)].add(vin)
+
+    def remove(self, vin: str) -> None:
+        position = self._positions.pop(vin, None)
+        if position is None:
+            return
+        cell = self._cell(*position)
+        self._cells[cell].discard(vin)
+        if not self._cells[cell]:
+            del self._cells[cell]
+
+    def position(self, vin: str) -> Optional[tuple[float, float]]:
+        return self._positions.get(vin)
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def _in_bounds(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> Iterable[str]:
+        for span_min, span_max in longitude_spans(min_lon, max_lon):
+            yield from self._in_span(min_lat, span_min, max_lat, span_max)
+
+    def _in_span(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> Iterable[str]:
+        lo_lat, lo_lon = math.floor(min_lat / self._cell_deg), self._column(min_lon)
+        hi_lat, hi_lon = math.floor(max_lat / self._cell_deg), self._column(max_lon)
+        cell_count = (hi_lat - lo_lat + 1) * (hi_lon - lo_lon + 1)
+        if cell_count > len(self._cells):
+            # The query covers more cells than are occupied; walking the occupied ones is cheaper.
+            for (cell_lat, cell_lon), vins in self._cells.items():
+                if lo_lat <= cell_lat <= hi_lat and lo_lon <= cell_lon <= hi_lon:
+                    yield from vins
+            return
+        for cell_lat in range(lo_lat, hi_lat + 1):
+            for cell_lon in range(lo_lon, hi_lon + 1):
+                yield from self._cells.get((cell_lat, cell_lon), ())
+
+    def within_radius(self, latitude: float, longitude: float, radius_km: float) -> list[Neighbor]:
+        """Returns the VINs within radius_km of the point, nearest first."""
+        if radius_km >= math.pi * EARTH_RADIUS_KM:
+            # Half the circumference reaches the antipode, i.e. every point on the globe.
+            candidates: Iterable[str] = self._positions
+        else:
+            candidates = self._in_bounds(*circle_bounds(latitude, longitude, radius_km))
+        found = []
+        for vin in candidates:
+            lat, lon = self._positions[vin]
+            distance = haversine_km(latitude, longitude, lat, lon)
+            if distance <= radius_km:
+                found.append(Neighbor(vin=vin, latitude=lat, longitude=lon, distance_km=distance))
+        return sorted(found, key=lambda neighbor: (neighbor.distance_km, neighbor.vin))
+
+    def nearest(self, latitude: float, longitude: float, k: int) -> list[Neighbor]:
+        """Returns the k VINs closest to the point, searching outwards until no closer one can exist."""
+        if k <= 0 or not self._positions:
+            return []
+        radius_km = self._cell_deg * KM_PER_DEGREE_LAT
+        while True:
+            found = self.within_radius(latitude, longitude, radius_km)
+            if len(found) >= k or len(found) == len(self._positions) or radius_km >= math.pi * EARTH_RADIUS_KM:
+                return found[:k]
+            radius_km *= 2
+
+    def within_polygon(self, polygon: Sequence[tuple[float, float]]) -> list[str]:
+        return self.within(Geofence(name="query", polygon=list(polygon)))
+
+    def within(self, fence: Geofence) -> list[str]:
+        return sorted(vin for vin in self._in_bounds(*fence.bounds()) if fence.contains(*self._positions[vin]))
+
+
+class FleetGeo:
+    """The spatial index of one account plus its geofences and the enter/exit events not yet reported."""
+
+    index: SpatialIndex
+    positions_ttl: float
+    refreshed_at: Optional[float]
+    _fences: dict[str, Geofence]
+    _inside: defaultdict[str, set[str]]
+    _events: list[GeofenceEvent]
+
+    def __init__(self, cell_deg: float = DEFAULT_CELL_DEG, positions_ttl: float = DEFAULT_POSITIONS_TTL) -> None:
+        self.index = SpatialIndex(cell_deg)
+        self.positions_ttl = positions_ttl
+        self.refreshed_at = None
+        self._fences = {}
+        self._inside = defaultdict(set)
+        self._events = []
+
+    @property
+    def fresh(self) -> bool:
+        """Whether the positions were loaded less than positions_ttl seconds ago."""
+        return self.refreshed_at is not None and time.monotonic() - self.refreshed_at < self.positions_ttl
+
+    def mark_refreshed(self) -> None:
+        self.refreshed_at = time.monotonic()
+
+    @property
+    def fences(self) -> list[Geofence]:
+        return [self._fences[name] for name in sorted(self._fences)]
+
+    def add_fence(self, fence: Geofence) -> None:
+        """Adds or replaces a geofence; cars already inside it do not produce an enter event."""
+        self._fences[fence.name] = fence
+        self._inside[fence.name] = set(self.index.within(fence))
+
+    def remove_fence(self, name: str) -> bool:
+        self._inside.pop(name, None)
+        return self._fences.pop(name, None) is not None
+
+    def inside(self, name: str) -> list[str]:
+        return sorted(self._inside.get(name, ()))
+
+    def update(self, vin: str, latitude: float, longitude: float) -> list[GeofenceEvent]:
+        """Moves a car and records an event for every geofence it entered or left."""
+        self.index.update(vin, latitude, longitude)
+        events = []
+        for name, fence in self._fences.items():
+            was_inside = vin in self._inside[name]
+            if fence.contains(latitude, longitude) == was_inside:
+                continue
+            if was_inside:
+                self._inside[name].discard(vin)
+            else:
+                self._inside[name].add(vin)
+            events.append(
+                GeofenceEvent(
+                    vin=vin,
+                    geofence=name,
+                    event="exit" if was_inside else "enter",
+                    latitude=latitude,
+                    longitude=longitude,
+                )
+            )
+        self._events.extend(events)
+        return events
+
+    def drain_events(self) -> list[GeofenceEvent]:
+        events, self._events = self._events, []
+        return events
+
+
+class GeoRegistry:
+    _accounts: dict[str, FleetGeo]
+
+    def __init__(self) -> None:
+        self._accounts = {}
+
+    def get(self, token_key: str) -> FleetGeo:
+        if token_key not in self._accounts:
+            self._accounts[token_key] = FleetGeo()
+        return self._accounts[token_key]
+
+    def __len__(self) -> int:
+        return len(self._accounts)
+
+    def discard(self, token_key: str) -> None:
+        self._accounts.pop(token_key, None)
+
+    def clear(self) -> None:
+        self._accounts.clear()
+
+
+default_geo = GeoRegistry()
@@ -0,0 +1,59 @@
+import math
+
+from typing import AsyncIterable
+
+from tessie.model import Charge, ChargeSummary, Drive, DriveSummary, PathPoint, PathSummary
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in km between two points given in degrees."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+async def summarize_drives(drives: AsyncIterable[Drive]) -> DriveSummary:
+    summary = DriveSummary()
+    async for drive in drives:
+        summary.drives += 1
+        summary.distance_km += drive.odometer_distance or 0.0
+        summary.energy_used_kwh += drive.energy_used or 0.0
+        summary.duration_s += drive.ended_at - drive.started_at
+
+    if summary.distance_km > 0:
+        summary.kwh_per_100km = 100 * summary.energy_used_kwh / summary.distance_km
+    return summary
+
+
+async def summarize_charges(charges: AsyncIterable[Charge]) -> ChargeSummary:
+    summary = ChargeSummary()
+    async for charge in charges:
+        summary.sessions += 1
+        summary.supercharger_sessions += 1 if charge.is_supercharger else 0
+        summary.energy_added_kwh += charge.energy_added or 0.0
+        summary.duration_s += charge.ended_at - charge.started_at
+        summary.cost += charge.cost or 0.0
+    return summary
+
+
+async def summarize_path(points: AsyncIterable[PathPoint]) -> PathSummary:
+    """Sums the distance between consecutive points, keeping only the previous point in memory."""
+    summary = PathSummary()
+    previous = None
+    first_battery = last_battery = None
+    async for point in points:
+        summary.points += 1
+        if previous is not None:
+            summary.distance_km += haversine_km(previous.latitude, previous.longitude, point.latitude, point.longitude)
+        if point.battery_level is not None:
+            first_battery = point.battery_level if first_battery is None else first_battery
+            last_battery = point.battery_level
+        previous = point
+
+    if first_battery is not None and last_battery is not None:
+        summary.battery_used = first_battery - last_battery
+    return summary
@@ -0,0 +1,305 @@
+import functools
+import itertools
+import os
+import re
+import time
+
+from contextvars import ContextVar, Token
+from typing import Any, Awaitable, Callable, Optional, Protocol, TypeVar, Union, cast
+from pydantic import BaseModel
+
+INSTRUMENTATION_ENV = "TESSIE_INSTRUMENTATION"
+
+# Upper bounds in seconds of the latency histogram buckets; the last bucket is unbounded.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_VIN_SEGMENT = re.compile(r"/[A-HJ-NPR-Z0-9]{17}(?=/|$)")
+_ID_SEGMENT = re.compile(r"(?<=/invitations)/[^/]+")
+
+Labels = tuple[tuple[str, str], ...]
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+
+def endpoint_of(url: str) -> str:
+    """Returns the URL path with VINs and invitation IDs replaced, e.g. /api/1/vehicles/{vin}/drivers."""
+    path = url.split("?", 1)[0]
+    if "://" in path:
+        path = "/" + path.split("://", 1)[1].partition("/")[2]
+    return _ID_SEGMENT.sub("/{id}", _VIN_SEGMENT.sub("/{vin}", path))
+
+
+class Span:
+    name: str
+    trace_id: int
+    span_id: int
+    parent_id: Optional[int]
+    attributes: dict[str, Any]
+    start: float
+    end: Optional[float]
+    status: str
+    error: Optional[str]
+
+    def __init__(self, name: str, trace_id: int, span_id: int, parent_id: Optional[int],
+                 attributes: dict[str, Any]) -> None:
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.start = time.perf_counter()
+        self.end = None
+        self.status = "ok"
+        self.error = None
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+
+class _NoopSpan:
+    """Returned by Instrumentation.span while disabled; entering it and setting attributes does nothing."""
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        return None
+
+
+_NOOP_SPAN = _NoopSpan()
+_current_span: ContextVar[Optional[Span]] = ContextVar("tessie_current_span", default=None)
+
+
+class SpanExporter(Protocol):
+    def export(self, span: Span) -> None:
+        ...
+
+
+class InMemoryExporter:
+    """Keeps finished spans in a list, for tests and ad-hoc debugging."""
+
+    spans: list[Span]
+
+    def __init__(self) -> None:
+        self.spans = []
+
+    def export(self, span: Span) -> None:
+        self.spans.append(span)
+
+    def named(self, name: str) -> list[Span]:
+        return [span for span in self.spans if span.name == name]
+
+    def clear(self) -> None:
+        self.spans.clear()
+
+
+class HistogramSnapshot(BaseModel):
+    name: str
+    labels: dict[str, str]
+    count: int
+    sum: float
+    buckets: dict[str, int]
+
+
+class CounterSnapshot(BaseModel):
+    name: str
+    labels: dict[str, str]
+    value: float
+
+
+class Histogram:
+    bounds: tuple[float, ...]
+    counts: list[int]
+    count: int
+    sum: float
+
+    def __init__(self, bounds: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        index = next((i for i, bound in enumerate(self.bounds) if value <= bound), len(self.bounds))
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+
+def _labels(labels: dict[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class _ActiveSpan:
+    _instrumentation: "Instrumentation"
+    _span: Span
+    _token: Optional[Token[Optional[Span]]]
+
+    def __init__(self, instrumentation: "Instrumentation", span: Span) -> None:
+        self._instrumentation = instrumentation
+        self._span = span
+        self._token = None
+
+    def __enter__(self) -> Span:
+        self._token = _current_span.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type: Any, exc: Optional[BaseException], traceback: Any) -> None:
+        if exc is not None:
+            self._span.status = "error"
+            self._span.error = f"{type(exc).__name__}: {exc}"
+        if self._token is not None:
+            _current_span.reset(self._token)
+        self._instrumentation.finish(self._span)
+
+
+class Instrumentation:
+    """Tracing spans and metrics for requests and tool calls.
+
+    While disabled, span() hands out a shared no-op span and the recording
+    methods return immediately; callers on hot paths check enabled first so
+    they do not even compute labels. Spans form a tree through a context
+    variable, so a tool span contains its do_request spans, which contain the
+    connection, TLS, request/response and JSON decoding spans.
+    """
+
+    enabled: bool
+    _exporters: list[SpanExporter]
+    _ids: "itertools.count[int]"
+    _counters: dict[tuple[str, Labels], float]
+    _histograms: dict[tuple[str, Labels], Histogram]
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self._exporters = []
+        self._ids = itertools.count(1)
+        self._counters = {}
+        self._histograms = {}
+
+    def enable(self, *exporters: SpanExporter) -> None:
+        self._exporters.extend(exporters)
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+        self._exporters.clear()
+
+    def span(self, name: str, **attributes: Any) -> Union[_ActiveSpan, _NoopSpan]:
+        if not self.enabled:
+            return _NOOP_SPAN
+        return _ActiveSpan(self, self.start(name, _current_span.get(), attributes))
+
+    def start(self, name: str, parent: Optional[Span], attributes: Optional[dict[str, Any]] = None) -> Span:
+        span_id = next(self._ids)
+        trace_id = parent.trace_id if parent is not None else span_id
+        return Span(name, trace_id, span_id, parent.span_id if parent is not None else None, attributes or {})
+
+    def finish(self, span: Span) -> None:
+        span.end = time.perf_counter()
+        for exporter in self._exporters:
+            exporter.export(span)
+
+    def current_span(self) -> Optional[Span]:
+        return _current_span.get()
+
+    def count(self, name: str, value: float = 1, **labels: Any) -> None:
+        if not self.enabled:
+            return
+        key = (name, _labels(labels))
+        self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        if not self.enabled:
+            return
+        key = (name, _labels(labels))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = Histogram()
+        histogram.observe(value)
+
+    def counter(self, name: str, **labels: Any) -> float:
+        return self._counters.get((name, _labels(labels)), 0)
+
+    def histogram(self, name: str, **labels: Any) -> Optional[Histogram]:
+        return self._histograms.get((name, _labels(labels)))
+
+    def snapshot(self) -> tuple[list[CounterSnapshot], list[HistogramSnapshot]]:
+        counters = [
+            CounterSnapshot(name=name, labels=dict(labels), value=value)
+            for (name, labels), value in sorted(self._counters.items())
+        ]
+        histograms = [
+            HistogramSnapshot(
+                name=name,
+                labels=dict(labels),
+                count=histogram.count,
+                sum=histogram.sum,
+                buckets={
+                    **{f"le_{bound:g}": n for bound, n in zip(histogram.bounds, histogram.counts)},
+                    "inf": histogram.counts[-1],
+                },
+            )
+            for (name, labels), histogram in sorted(self._histograms.items())
+        ]
+        return counters, histograms
+
+    def reset_metrics(self) -> None:
+        self._counters.clear()
+        self._histograms.clear()
+
+    def httpx_tracer(self) -> Callable[[str, dict[str, Any]], Awaitable[None]]:
+        """Returns a callback for httpx's "trace" request extension that turns httpcore events into spans.
+
+        httpcore reports connect_tcp (including DNS resolution), start_tls,
+        send_request_headers/body, receive_response_headers (the upstream
+        wait) and receive_response_body as .started/.complete/.failed pairs.
+        """
+        parent = _current_span.get()
+        open_spans: dict[str, Span] = {}
+
+        async def trace(event_name: str, info: dict[str, Any]) -> None:
+            name, _, phase = event_name.rpartition(".")
+            if phase == "started":
+                open_spans[name] = self.start(name, parent)
+                return
+            span = open_spans.pop(name, None)
+            if span is None:
+                return
+            if phase == "failed":
+                span.status = "error"
+                span.error = repr(info.get("exception"))
+            self.finish(span)
+
+        return trace
+
+    def tool(self, func: F) -> F:
+        """Wraps a tool in a span and records its duration and errors; a plain pass-through while disabled."""
+        tool_name = func.__name__
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not self.enabled:
+                return await func(*args, **kwargs)
+            started = time.perf_counter()
+            outcome = "ok"
+            try:
+                with self.span(f"tool.{tool_name}", tool=tool_name):
+                    return await func(*args, **kwargs)
+            except Exception as exc:
+                outcome = type(exc).__name__
+                self.count("tessie.tool.errors", tool=tool_name, error=outcome)
+                raise
+            finally:
+                self.observe("tessie.tool.duration", time.perf_counter() - started, tool=tool_name, outcome=outcome)
+
+        return cast(F, wrapper)
+
+
+default_instrumentation = Instrumentation(enabled=os.environ.get(INSTRUMENTATION_ENV) == "1")
+instrumented = default_instrumentation.tool
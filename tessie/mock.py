@@ -0,0 +1,350 @@
+import asyncio
+import hashlib
+import math
+import random
+import re
+import time
+import httpx
+
+from typing import Any, Awaitable, Callable, Optional
+from pydantic import BaseModel
+
+from tessie import codec
+
+DEFAULT_VINS = ("5YJ3E1EA4KF000001", "5YJ3E1EA4KF000002", "5YJ3E1EA4KF000003")
+
+
+class MockConfig(BaseModel):
+    """Behaviour of the mock Tessie API: response latency (seconds), injected errors and data volume."""
+
+    latency: float = 0.05
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+    drivers: int = 3
+    invitations: int = 2
+    path_interval: int = 30
+    seed: Optional[int] = None
+
+
+class MockStats(BaseModel):
+    requests: int = 0
+    errors: int = 0
+    routes: dict[str, int] = {}
+
+
+def _seed(vin: str) -> int:
+    return int(hashlib.sha256(vin.encode()).hexdigest()[:8], 16)
+
+
+class MockTessieTransport(httpx.AsyncBaseTransport):
+    """An in-process stand-in for the Tessie API that answers every endpoint TessieClient uses.
+
+    Vehicle data is derived from the VIN, so it is stable across runs; driver
+    and invitation changes are kept in memory. Every response is delayed by
+    latency (plus up to jitter) seconds and fails with error_status at
+    error_rate, which makes it usable for offline load tests and benchmarks.
+    """
+
+    config: MockConfig
+    vins: list[str]
+    _sleep: Callable[[float], Awaitable[None]]
+    _random: random.Random
+    _drivers: dict[str, list[dict[str, Any]]]
+    _invitations: dict[str, list[dict[str, Any]]]
+    _routes: list[tuple[str, "re.Pattern[str]", str, Callable[..., Any]]]
+    _stats: MockStats
+
+    def __init__(self,
+                 config: Optional[MockConfig] = None,
+                 vins: Optional[list[str]] = None,
+                 sleep: Callable[[float], Awaitable[None]] = asyncio.sleep) -> None:
+        self.config = config or MockConfig()
+        self.vins = list(vins or DEFAULT_VINS)
+        self._sleep = sleep
+        self._random = random.Random(self.config.seed)
+        self._drivers = {}
+        self._invitations = {}
+        self._stats = MockStats()
+        self._routes = [
+            ("GET", re.compile(r"^/api/1/vehicles/(?P<vin>\w+)/vehicle_data$"), "vehicle_data", self._vehicle_data),
+            ("GET", re.compile(r"^/api/1/vehicles/(?P<vin>\w+)/invitations$"), "invitations", self._list_invitations),
+            ("POST", re.compile(r"^/api/1/vehicles/(?P<vin>\w+)/invitations$"), "create_invitation",
+             self._create_invitation),
+            ("POST", re.compile(r"^/api/1/vehicles/(?P<vin>\w+)/invitations/(?P<invite_id>\w+)/revoke$"),
+             "revoke_invitation", self._revoke_invitation),
+            ("GET", re.compile(r"^/api/1/vehicles/(?P<vin>\w+)/drivers$"), "drivers", self._list_drivers),
+            ("DELETE", re.compile(r"^/api/1/vehicles/(?P<vin>\w+)/drivers$"), "delete_driver", self._delete_driver),
+            ("GET", re.compile(r"^/api/1/vehicles/(?P<vin>\w+)$"), "status", self._status),
+            ("GET", re.compile(r"^/vehicles$"), "vehicles", self._vehicles),
+            ("GET", re.compile(r"^/(?P<vin>\w+)/state$"), "state", self._state),
+            ("GET", re.compile(r"^/(?P<vin>\w+)/path$"), "path", self._path),
+            ("GET", re.compile(r"^/(?P<vin>\w+)/drives$"), "drives", self._drives),
+            ("GET", re.compile(r"^/(?P<vin>\w+)/charges$"), "charges", self._charges),
+        ]
+
+    def stats(self) -> MockStats:
+        return self._stats.model_copy(deep=True)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        delay = self.config.latency + self._random.uniform(0, self.config.jitter)
+        if delay > 0:
+            await self._sleep(delay)
+
+        self._stats.requests += 1
+        path = request.url.path
+        for method, pattern, name, handler in self._routes:
+            match = pattern.match(path)
+            if method != request.method or match is None:
+                continue
+            self._stats.routes[name] = self._stats.routes.get(name, 0) + 1
+            if self._random.random() < self.config.error_rate:
+                self._stats.errors += 1
+                return self._json(self.config.error_status, {"error": "Injected error"}, request)
+            params = dict(request.url.params)
+            return self._json(200, handler(params=params, **match.groupdict()), request)
+
+        return self._json(404, {"error": f"No mock route for {request.method} {path}"}, request)
+
+    @staticmethod
+    def _json(status: int, body: Any, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            status, content=codec.dumps(body), headers={"Content-Type": "application/json"}, request=request
+        )
+
+    def _sections(self, vin: str) -> dict[str, Any]:
+        rng = random.Random(_seed(vin))
+        now = int(time.time())
+        battery_level = rng.randint(20, 95)
+        return {
+            "drive_state": {
+                "latitude": 37.4929681 + rng.uniform(-0.2, 0.2),
+                "longitude": -121.9453489 + rng.uniform(-0.2, 0.2),
+                "heading": rng.randint(0, 359),
+                "speed": None,
+                "shift_state": None,
+                "timestamp": now * 1000,
+            },
+            "charge_state": {
+                "battery_level": battery_level,
+                "battery_range": round(battery_level * 3.1, 2),
+                "charging_state": "Disconnected",
+                "charge_limit_soc": 80,
+                "charge_energy_added": round(rng.uniform(0, 40), 2),
+                "timestamp": now * 1000,
+            },
+            "climate_state": {
+                "inside_temp": round(rng.uniform(15, 30), 1),
+                "outside_temp": round(rng.uniform(5, 30), 1),
+                "is_climate_on": False,
+                "timestamp": now * 1000,
+            },
+            "vehicle_state": {
+                "locked": True,
+                "odometer": round(rng.uniform(1000, 60000), 1),
+                "sentry_mode": False,
+                "car_version": "2024.8.7",
+                "timestamp": now * 1000,
+            },
+        }
+
+    def _vehicle_data(self, vin: str, params: dict[str, str]) -> Any:
+        sections = self._sections(vin)
+        endpoints = params.get("endpoints", ";".join(sections)).split(";")
+        return {"response": {endpoint: sections[endpoint] for endpoint in endpoints if endpoint in sections}}
+
+    def _status(self, vin: str, params: dict[str, str]) -> Any:
+        return {"response": {"vin": vin, "state": "online"}}
+
+    def _state(self, vin: str, params: dict[str, str]) -> Any:
+        return {"vin": vin, "state": "asleep", **self._sections(vin)}
+
+    def _vehicles(self, params: dict[str, str]) -> Any:
+        return {"results": [{"vin": vin, "is_active": True, "last_state": self._sections(vin)} for vin in self.vins]}
+
+    def _invitation_list(self, vin: str) -> list[dict[str, Any]]:
+        if vin not in self._invitations:
+            self._invitations[vin] = [self._new_invitation(i) for i in range(self.config.invitations)]
+        return self._invitations[vin]
+
+    def _new_invitation(self, invite_id: int) -> dict[str, Any]:
+        return {
+            "id": invite_id,
+            "id_s": str(invite_id),
+            "owner_id": 1,
+            "share_type": "customer",
+            "state": "pending",
+            "code": f"code{invite_id}",
+            "share_link": f"https://www.tesla.com/_rs/1/code{invite_id}",
+        }
+
+    def _list_invitations(self, vin: str, params: dict[str, str]) -> Any:
+        return {"response": self._invitation_list(vin)}
+
+    def _create_invitation(self, vin: str, params: dict[str, str]) -> Any:
+        invitations = self._invitation_list(vin)
+        invitation = self._new_invitation(max((item["id"] for item in invitations), default=0) + 1)
+        invitations.append(invitation)
+        return {"response": invitation}
+
+    def _revoke_invitation(self, vin: str, invite_id: str, params: dict[str, str]) -> Any:
+        invitations = self._invitation_list(vin)
+        remaining = [item for item in invitations if item["id_s"] != invite_id]
+        self._invitations[vin] = remaining
+        return {"response": len(remaining) < len(invitations)}
+
+    def _driver_list(self, vin: str) -> list[dict[str, Any]]:
+        if vin not in self._drivers:
+            self._drivers[vin] = [
+                {
+                    "id": i,
+                    "user_id": 1000 + i,
+                    "user_id_s": str(1000 + i),
+                    "driver_first_name": f"Driver{i}",
+                    "driver_last_name": "Mock",
+                    "granular_access": {"hide_private": False},
+                    "active_pubkeys": [],
+                }
+                for i in range(self.config.drivers)
+            ]
+        return self._drivers[vin]
+
+    def _list_drivers(self, vin: str, params: dict[str, str]) -> Any:
+        return {"response": self._driver_list(vin)}
+
+    def _delete_driver(self, vin: str, params: dict[str, str]) -> Any:
+        user_id = params.get("share_user_id")
+        self._drivers[vin] = [driver for driver in self._driver_list(vin) if driver["user_id_s"] != user_id]
+        return {"response": "ok"}
+
+    def _path(self, vin: str, params: dict[str, str]) -> Any:
+        start, end = int(params["from"]), int(params["to"])
+        interval = self.config.path_interval
+        rng = random.Random(_seed(vin))
+        lat0, lon0 = 37.4929681 + rng.uniform(-0.2, 0.2), -121.9453489 + rng.uniform(-0.2, 0.2)
+        first = start + (-start) % interval
+        return {
+            "results": [
+                {
+                    "timestamp": t,
+                    "latitude": lat0 + 0.01 * math.sin(t / 3600),
+                    "longitude": lon0 + 0.01 * math.cos(t / 3600),
+                    "heading": (t // 10) % 360,
+                    "speed": 40,
+                    "battery_level": 90 - (t // 3600) % 70,
+                    "odometer": 1000 + t / 3600,
+                }
+                for t in range(first, end + 1, interval)
+            ]
+        }
+
+    def _drives(self, vin: str, params: dict[str, str]) -> Any:
+        start, end = int(params["from"]), int(params["to"])
+        period = 6 * 3600
+        return {
+            "results": [
+                {
+                    "id": t // period,
+                    "started_at": t,
+                    "ended_at": t + 1800,
+                    "starting_battery": 80,
+                    "ending_battery": 76,
+                    "odometer_distance": 25.0,
+                    "energy_used": 4.0,
+                }
+                for t in range(start + (-start) % period, end + 1, period)
+            ]
+        }
+
+    def _charges(self, vin: str, params: dict[str, str]) -> Any:
+        start, end = int(params["from"]), int(params["to"])
+        period = 86400
+        return {
+            "results": [
+                {
+                    "id": t // period,
+                    "started_at": t,
+                    "ended_at": t + 3600,
+                    "is_supercharger": (t // period) % 3 == 0,
+                    "energy_added": 30.0,
+                    "starting_battery": 40,
+                    "ending_battery": 80,
+                    "cost": 9.5,
+                }
+                for t in range(start + (-start) % period, end + 1, period)
+            ]
+        }
+
+
+class MockServer:
+    """Serves a MockTessieTransport over HTTP/1.1 on localhost and counts the connections it accepts.
+
+    Unlike passing the transport to the pool directly, requests go through a real
+    socket, so connection reuse shows up in load tests.
+    """
+
+    transport: MockTessieTransport
+    connections: int
+    _host: str
+    _port: int
+    _server: Optional[asyncio.Server]
+
+    def __init__(self, transport: Optional[MockTessieTransport] = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.transport = transport or MockTessieTransport()
+        self.connections = 0
+        self._host = host
+        self._port = port
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self._host}:{self._port}"
+
+    async def start(self) -> str:
+        self._server = await asyncio.start_server(self._handle, self._host, self._port)
+        self._port = self._server.sockets[0].getsockname()[1]
+        return self.url
+
+    async def aclose(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "MockServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = []
+                while True:
+                    line = await reader.readline()
+                    if not line.strip():
+                        break
+                    name, value = line.decode("latin-1").split(":", 1)
+                    headers.append((name.strip(), value.strip()))
+                length = int(next((value for name, value in headers if name.lower() == "content-length"), "0"))
+                body = await reader.readexactly(length) if length else b""
+
+                request = httpx.Request(method, self.url + target, headers=headers, content=body)
+                response = await self.transport.handle_async_request(request)
+                head = (
+                    f"HTTP/1.1 {response.status_code} {response.reason_phrase}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(response.content)}\r\n\r\n"
+                )
+                writer.write(head.encode("latin-1") + response.content)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
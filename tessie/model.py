@@ -1,27 +1,177 @@
-from pydantic import BaseModel
+from datetime import datetime
+from typing import Any, Optional
+from pydantic import AliasChoices, BaseModel, Field, model_validator
+
+VEHICLE_DATA_ENDPOINTS = ("drive_state", "charge_state", "climate_state", "vehicle_state")
 
 class Driver(BaseModel):
-    user_id: str
+    user_id: str = Field(validation_alias=AliasChoices("user_id_s", "user_id"))
     name: str
 
+    @model_validator(mode="before")
+    @classmethod
+    def _name_from_api(cls, data: Any) -> Any:
+        if isinstance(data, dict) and "name" not in data and "driver_first_name" in data:
+            return {**data, "name": f"{data['driver_first_name']} {data['driver_last_name']}"}
+        return data
+
 class DriverList(BaseModel):
     drivers: list[Driver]
+    stale: Optional[bool] = None
 
 class Invitation(BaseModel):
-    id: str
+    id: str = Field(validation_alias=AliasChoices("id_s", "id"))
     share_link: str
     state: str
 
 class InvitationList(BaseModel):
     invitations: list[Invitation]
+    stale: Optional[bool] = None
 
 class Location(BaseModel):
     latitude: str
     longitude: str
+    stale: Optional[bool] = None
+    as_of: Optional[datetime] = None
+    live: Optional[bool] = None
 
 class Battery(BaseModel):
     battery_level: str
     battery_range: str
+    stale: Optional[bool] = None
+    as_of: Optional[datetime] = None
+    live: Optional[bool] = None
+
+class LocationV2(BaseModel):
+    latitude: float
+    longitude: float
+    stale: Optional[bool] = None
+    as_of: Optional[datetime] = None
+    live: Optional[bool] = None
+
+class BatteryV2(BaseModel):
+    battery_level: int
+    battery_range: float
+    battery_range_unit: str = "mi"
+    stale: Optional[bool] = None
+    as_of: Optional[datetime] = None
+    live: Optional[bool] = None
 
 class ActionResult(BaseModel):
-    success: bool
\ No newline at end of file
+    success: bool
+
+class DriveState(BaseModel):
+    latitude: float
+    longitude: float
+    heading: Optional[int] = None
+    speed: Optional[float] = None
+    shift_state: Optional[str] = None
+    timestamp: Optional[int] = None
+
+class ChargeState(BaseModel):
+    battery_level: int
+    battery_range: float
+    charging_state: Optional[str] = None
+    charge_limit_soc: Optional[int] = None
+    charge_energy_added: Optional[float] = None
+    timestamp: Optional[int] = None
+
+class ClimateState(BaseModel):
+    inside_temp: Optional[float] = None
+    outside_temp: Optional[float] = None
+    is_climate_on: Optional[bool] = None
+    timestamp: Optional[int] = None
+
+class VehicleState(BaseModel):
+    locked: Optional[bool] = None
+    odometer: Optional[float] = None
+    sentry_mode: Optional[bool] = None
+    car_version: Optional[str] = None
+    timestamp: Optional[int] = None
+
+class VehicleSnapshot(BaseModel):
+    vin: str
+    drive_state: Optional[DriveState] = None
+    charge_state: Optional[ChargeState] = None
+    climate_state: Optional[ClimateState] = None
+    vehicle_state: Optional[VehicleState] = None
+    stale: Optional[bool] = None
+    as_of: Optional[datetime] = None
+    live: Optional[bool] = None
+
+class VehicleList(BaseModel):
+    vehicles: list[VehicleSnapshot]
+
+class FleetVehicle(BaseModel):
+    location: Optional[Location] = None
+    battery: Optional[Battery] = None
+
+class FleetSnapshot(BaseModel):
+    vehicles: dict[str, FleetVehicle]
+
+class VehicleStatus(BaseModel):
+    vin: str
+    state: str
+
+    @property
+    def online(self) -> bool:
+        return self.state == "online"
+
+class PathPoint(BaseModel):
+    timestamp: int
+    latitude: float
+    longitude: float
+    heading: Optional[int] = None
+    speed: Optional[float] = None
+    battery_level: Optional[int] = None
+    odometer: Optional[float] = None
+
+class Drive(BaseModel):
+    id: int
+    started_at: int
+    ended_at: int
+    starting_latitude: Optional[float] = None
+    starting_longitude: Optional[float] = None
+    ending_latitude: Optional[float] = None
+    ending_longitude: Optional[float] = None
+    starting_battery: Optional[int] = None
+    ending_battery: Optional[int] = None
+    odometer_distance: Optional[float] = None
+    energy_used: Optional[float] = None
+
+class Charge(BaseModel):
+    id: int
+    started_at: int
+    ended_at: int
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    is_supercharger: Optional[bool] = None
+    energy_added: Optional[float] = None
+    starting_battery: Optional[int] = None
+    ending_battery: Optional[int] = None
+    cost: Optional[float] = None
+
+class DriveSummary(BaseModel):
+    drives: int = 0
+    distance_km: float = 0.0
+    energy_used_kwh: float = 0.0
+    duration_s: int = 0
+    kwh_per_100km: Optional[float] = None
+
+class ChargeSummary(BaseModel):
+    sessions: int = 0
+    supercharger_sessions: int = 0
+    energy_added_kwh: float = 0.0
+    duration_s: int = 0
+    cost: float = 0.0
+
+class PathSummary(BaseModel):
+    points: int = 0
+    distance_km: float = 0.0
+    battery_used: Optional[int] = None
+
+class EnergyReport(BaseModel):
+    points: int = 0
+    distance_km: float = 0.0
+    kwh_per_km: Optional[float] = None
+    idle_drain_per_hour: Optional[float] = None
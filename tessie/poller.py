@@ -0,0 +1,133 @@
+import asyncio
+import time
+import httpx
+
+from typing import Awaitable, Callable, Optional, Sequence
+from pydantic import BaseModel
+
+from tessie.archive import default_archive
+from tessie.model import VehicleSnapshot
+from tessie.tessie_client import TessieClient
+
+POLLED_ENDPOINTS = ("drive_state", "charge_state")
+DRIVING_SHIFT_STATES = ("D", "R", "N")
+
+
+class PollSchedule(BaseModel):
+    """Seconds between two polls of a VIN, depending on what the car is doing."""
+
+    driving: float = 15.0
+    charging: float = 60.0
+    parked: float = 300.0
+    asleep: float = 900.0
+    error: float = 60.0
+    sharing: float = 3600.0
+
+    def interval(self, mode: str) -> float:
+        return float(getattr(self, mode))
+
+
+def vehicle_mode(snapshot: VehicleSnapshot) -> str:
+    if snapshot.live is False:
+        return "asleep"
+    if snapshot.drive_state is not None and snapshot.drive_state.shift_state in DRIVING_SHIFT_STATES:
+        return "driving"
+    if snapshot.charge_state is not None and snapshot.charge_state.charging_state == "Charging":
+        return "charging"
+    return "parked"
+
+
+class TelemetryPoller:
+    """Keeps the client's StateStore fresh for a set of VINs on an adaptive schedule.
+
+    Cars are polled every few seconds while driving, less often while charging
+    or parked, and rarely while asleep. Polls never wake a sleeping car. Drivers
+    and invitations are refreshed on the slower `sharing` interval. Records stay
+    valid for two poll intervals, so tool reads are served from memory as long
+    as the poller keeps up.
+    """
+
+    _client: TessieClient
+    _vins: list[str]
+    _schedule: PollSchedule
+    _clock: Callable[[], float]
+    _sleep: Callable[[float], Awaitable[None]]
+    _concurrency: int
+    _due: dict[str, float]
+    _sharing_due: dict[str, float]
+    _task: "Optional[asyncio.Task[None]]"
+
+    def __init__(self,
+                 client: TessieClient,
+                 vins: Sequence[str],
+                 schedule: Optional[PollSchedule] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+                 concurrency: int = 10) -> None:
+        self._client = client
+        self._vins = sorted(set(vins))
+        self._schedule = schedule or PollSchedule()
+        self._clock = clock
+        self._sleep = sleep
+        self._concurrency = concurrency
+        now = clock()
+        self._due = {vin: now for vin in self._vins}
+        self._sharing_due = {vin: now for vin in self._vins}
+        self._task = None
+
+    def next_poll(self, vin: str) -> float:
+        return self._due[vin]
+
+    async def poll_once(self, vin: str) -> float:
+        """Refreshes one VIN and returns the number of seconds until it should be polled again."""
+        snapshot = await self._client.get_vehicle_data(vin, POLLED_ENDPOINTS, force_refresh=True, allow_wake=False)
+        mode = vehicle_mode(snapshot)
+        interval = self._schedule.interval(mode)
+        fields: dict[str, object] = {"snapshot": snapshot, "mode": mode}
+
+        if self._clock() >= self._sharing_due.get(vin, 0.0):
+            drivers = await self._client.list_driver(vin, force_refresh=True)
+            invitations = await self._client.list_invitations(vin, force_refresh=True)
+            fields.update(drivers=drivers, invitations=invitations)
+            archive = default_archive()
+            if archive is not None:
+                await archive.save_snapshot(self._client.token_key, vin, "drivers", drivers)
+                await archive.save_snapshot(self._client.token_key, vin, "invitations", invitations)
+            self._sharing_due[vin] = self._clock() + self._schedule.sharing
+
+        self._client.store.update(self._client.token_key, vin, valid_for=2 * interval, **fields)
+        return interval
+
+    async def _poll(self, vin: str, semaphore: asyncio.Semaphore) -> None:
+        async with semaphore:
+            try:
+                interval = await self.poll_once(vin)
+            except (httpx.HTTPError, KeyError, ValueError):
+                interval = self._schedule.error
+        self._due[vin] = self._clock() + interval
+
+    async def run_once(self) -> float:
+        """Polls every VIN that is due and returns the seconds until the next one is."""
+        now = self._clock()
+        semaphore = asyncio.Semaphore(self._concurrency)
+        await asyncio.gather(*[self._poll(vin, semaphore) for vin, due in self._due.items() if due <= now])
+        return max(0.0, min(self._due.values()) - self._clock()) if self._due else self._schedule.parked
+
+    async def run(self) -> None:
+        async with self._client.held():
+            while True:
+                await self._sleep(await self.run_once())
+
+    def start(self) -> "asyncio.Task[None]":
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self.run())
+        return self._task
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,145 @@
+import hashlib
+import os
+import httpx
+
+from typing import Optional
+from pydantic import BaseModel
+
+
+DEFAULT_BASE_URL = "https://api.tessie.com"
+
+# Named backends for TESSIE_BASE_URL; the Tesla Fleet API serves the same /api/1 paths
+# (Tessie-only endpoints such as history and /vehicles are not available there).
+BASE_URLS = {
+    "tessie": DEFAULT_BASE_URL,
+    "fleet-na": "https://fleet-api.prd.na.vn.cloud.tesla.com",
+    "fleet-eu": "https://fleet-api.prd.eu.vn.cloud.tesla.com",
+    "fleet-cn": "https://fleet-api.prd.cn.vn.cloud.tesla.cn",
+}
+BASE_URL_ENV = "TESSIE_BASE_URL"
+TRANSPORT_ENV = "TESSIE_TRANSPORT"
+MOCK_LATENCY_ENV = "TESSIE_MOCK_LATENCY"
+
+
+class PoolConfig(BaseModel):
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = True
+
+
+def resolve_base_url(base_url: str) -> str:
+    """Accepts a URL or one of the names in BASE_URLS."""
+    return BASE_URLS.get(base_url, base_url).rstrip("/")
+
+
+def default_base_url() -> str:
+    return resolve_base_url(os.environ.get(BASE_URL_ENV) or DEFAULT_BASE_URL)
+
+
+def transport_from_env() -> Optional[httpx.AsyncBaseTransport]:
+    """Returns the in-process mock API when TESSIE_TRANSPORT=mock, otherwise None (real network)."""
+    if os.environ.get(TRANSPORT_ENV) == "mock":
+        # Imported here so production processes never load the mock API.
+        from tessie.mock import MockConfig, MockTessieTransport
+
+        return MockTessieTransport(MockConfig(latency=float(os.environ.get(MOCK_LATENCY_ENV, "0.05"))))
+    return None
+
+
+def token_fingerprint(api_token: str) -> str:
+    """Returns a stable, non-reversible key for an API token."""
+    return hashlib.sha256(api_token.encode()).hexdigest()[:16]
+
+
+class ClientPool:
+    """Long-lived httpx.AsyncClient instances shared per (token, base URL).
+
+    Reusing a client keeps TCP/TLS connections alive between tool calls instead
+    of paying the handshake to the Tessie API on every request.
+    """
+
+    _config: PoolConfig
+    _transport: Optional[httpx.AsyncBaseTransport]
+    _clients: dict[tuple[str, str], httpx.AsyncClient]
+    _holders: dict[str, int]
+
+    def __init__(self,
+                 config: Optional[PoolConfig] = None,
+                 transport: Optional[httpx.AsyncBaseTransport] = None) -> None:
+        self._config = config or PoolConfig()
+        self._transport = transport
+        self._clients = {}
+        self._holders = {}
+
+    @property
+    def config(self) -> PoolConfig:
+        return self._config
+
+    def configure(self, config: PoolConfig) -> None:
+        """Changes the limits used for clients created from now on."""
+        self._config = config
+
+    def set_transport(self, transport: Optional[httpx.AsyncBaseTransport]) -> None:
+        """Routes clients created from now on through transport (None for the network)."""
+        self._transport = transport
+
+    def get(self, api_token: str, base_url: str = DEFAULT_BASE_URL) -> httpx.AsyncClient:
+        key = (token_fingerprint(api_token), base_url)
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                base_url=base_url,
+                headers={"Authorization": f"Bearer {api_token}"},
+                http2=self._config.http2,
+                limits=httpx.Limits(
+                    max_connections=self._config.max_connections,
+                    max_keepalive_connections=self._config.max_keepalive_connections,
+                    keepalive_expiry=self._config.keepalive_expiry,
+                ),
+                transport=self._transport,
+            )
+            self._clients[key] = client
+        return client
+
+    def unauthenticated(self) -> httpx.AsyncClient:
+        """Returns a new client without the token, for hosts other than the API; the caller closes it."""
+        return httpx.AsyncClient(http2=self._config.http2, transport=self._transport)
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def hold(self, api_token: str) -> None:
+        """Registers one more user of the token's clients and per-token state."""
+        fingerprint = token_fingerprint(api_token)
+        self._holders[fingerprint] = self._holders.get(fingerprint, 0) + 1
+
+    def release(self, api_token: str) -> bool:
+        """Drops one user of the token and returns True if no other user remains."""
+        fingerprint = token_fingerprint(api_token)
+        holders = self._holders.pop(fingerprint, 0) - 1
+        if holders > 0:
+            self._holders[fingerprint] = holders
+            return False
+        return True
+
+    async def discard(self, api_token: str) -> None:
+        """Closes the clients of one token, whatever their base URL."""
+        fingerprint = token_fingerprint(api_token)
+        for key in [key for key in self._clients if key[0] == fingerprint]:
+            await self._clients.pop(key).aclose()
+
+    async def aclose(self) -> None:
+        clients = list(self._clients.values())
+        self._clients.clear()
+        self._holders.clear()
+        for client in clients:
+            await client.aclose()
+
+
+default_pool = ClientPool(transport=transport_from_env())
+
+
+async def close_clients() -> None:
+    """Shutdown hook for the Arcade worker: closes every pooled connection."""
+    await default_pool.aclose()
@@ -0,0 +1,207 @@
+import asyncio
+import time
+
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Awaitable, Callable, Mapping, Optional
+from pydantic import BaseModel
+
+
+class RateLimitConfig(BaseModel):
+    rate: float = 10.0
+    burst: int = 20
+    min_rate: float = 0.5
+    max_throttle_retries: int = 3
+
+
+class RateLimiterStats(BaseModel):
+    rate: float
+    tokens: float
+    queue_depth: int
+    in_flight: int
+    requests: int
+    throttled: int
+    total_wait: float
+    max_wait: float
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Returns the number of seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at - (time.time() if now is None else now))
+
+
+class RateLimiter:
+    """Token bucket for a single API token.
+
+    Callers are admitted strictly in arrival order, so a burst queues up
+    instead of erroring. The refill rate adapts at runtime: a 429 halves it
+    and pauses the bucket for Retry-After, and successful responses slowly
+    restore it to the configured rate. Concurrent requests are capped by the
+    token's TenantBudget.max_in_flight in tessie.tenancy, not here.
+    """
+
+    _config: RateLimitConfig
+    _clock: Callable[[], float]
+    _sleep: Callable[[float], Awaitable[None]]
+    _rate: float
+    _tokens: float
+    _updated_at: float
+    _blocked_until: float
+    _admission: asyncio.Lock
+    _queue_depth: int
+    _in_flight: int
+    _requests: int
+    _throttled: int
+    _total_wait: float
+    _max_wait: float
+
+    def __init__(self,
+                 config: Optional[RateLimitConfig] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], Awaitable[None]] = asyncio.sleep) -> None:
+        self._config = config or RateLimitConfig()
+        self._clock = clock
+        self._sleep = sleep
+        self._rate = self._config.rate
+        self._tokens = float(self._config.burst)
+        self._updated_at = clock()
+        self._blocked_until = 0.0
+        self._admission = asyncio.Lock()
+        self._queue_depth = 0
+        self._in_flight = 0
+        self._requests = 0
+        self._throttled = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    @property
+    def config(self) -> RateLimitConfig:
+        return self._config
+
+    def _refill(self) -> float:
+        now = self._clock()
+        self._tokens = min(float(self._config.burst), self._tokens + (now - self._updated_at) * self._rate)
+        self._updated_at = now
+        return now
+
+    async def acquire(self) -> None:
+        started = self._clock()
+        self._queue_depth += 1
+        try:
+            async with self._admission:
+                while True:
+                    now = self._refill()
+                    if now < self._blocked_until:
+                        await self._sleep(self._blocked_until - now)
+                    elif self._tokens >= 1.0:
+                        self._tokens -= 1.0
+                        break
+                    else:
+                        await self._sleep((1.0 - self._tokens) / self._rate)
+        finally:
+            self._queue_depth -= 1
+
+        waited = self._clock() - started
+        self._in_flight += 1
+        self._requests += 1
+        self._total_wait += waited
+        self._max_wait = max(self._max_wait, waited)
+
+    def release(self) -> None:
+        self._in_flight -= 1
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def pause(self, seconds: float) -> None:
+        self._blocked_until = max(self._blocked_until, self._clock() + seconds)
+
+    def observe(self, status_code: int, headers: Mapping[str, str]) -> Optional[float]:
+        """Adapts the bucket to a response; returns the back-off in seconds for a 429."""
+        remaining = headers.get("x-ratelimit-remaining")
+        reset = headers.get("x-ratelimit-reset")
+        if remaining is not None and reset is not None:
+            try:
+                if int(remaining) <= 0:
+                    reset_in = float(reset)
+                    # Some APIs send an epoch timestamp, others the seconds until reset.
+                    self.pause(reset_in - time.time() if reset_in > 1e9 else reset_in)
+            except ValueError:
+                pass
+
+        if status_code == 429:
+            self._throttled += 1
+            self._rate = max(self._config.min_rate, self._rate / 2)
+            delay = parse_retry_after(headers.get("retry-after"))
+            if delay is None:
+                delay = 1.0 / self._rate
+            self.pause(delay)
+            return delay
+
+        if self._rate < self._config.rate:
+            self._rate = min(self._config.rate, self._rate + self._config.rate / 20)
+        return None
+
+    def stats(self) -> RateLimiterStats:
+        self._refill()
+        return RateLimiterStats(
+            rate=self._rate,
+            tokens=self._tokens,
+            queue_depth=self._queue_depth,
+            in_flight=self._in_flight,
+            requests=self._requests,
+            throttled=self._throttled,
+            total_wait=self._total_wait,
+            max_wait=self._max_wait,
+        )
+
+
+class RateLimiterRegistry:
+    """One RateLimiter per API token fingerprint, shared by every client in the process."""
+
+    _config: RateLimitConfig
+    _limiters: dict[str, RateLimiter]
+
+    def __init__(self, config: Optional[RateLimitConfig] = None) -> None:
+        self._config = config or RateLimitConfig()
+        self._limiters = {}
+
+    def configure(self, config: RateLimitConfig) -> None:
+        """Changes the limits used for limiters created from now on."""
+        self._config = config
+
+    def get(self, token_key: str) -> RateLimiter:
+        limiter = self._limiters.get(token_key)
+        if limiter is None:
+            limiter = RateLimiter(self._config)
+            self._limiters[token_key] = limiter
+        return limiter
+
+    def stats(self) -> dict[str, RateLimiterStats]:
+        return {token_key: limiter.stats() for token_key, limiter in self._limiters.items()}
+
+    def discard(self, token_key: str) -> None:
+        self._limiters.pop(token_key, None)
+
+    def clear(self) -> None:
+        self._limiters.clear()
+
+
+default_limiters = RateLimiterRegistry()
@@ -0,0 +1,99 @@
+import asyncio
+import time
+
+from collections import OrderedDict
+from typing import Callable
+from pydantic import BaseModel
+
+from tessie.pool import token_fingerprint
+from tessie.tessie_client import TessieClient
+
+
+class ClientRegistryStats(BaseModel):
+    clients: int = 0
+    created: int = 0
+    reused: int = 0
+    evicted: int = 0
+
+
+class ClientRegistry:
+    """One TessieClient per API token (keyed by its fingerprint), shared by every tool call.
+
+    Clients unused for idle_timeout seconds are evicted, as is the least
+    recently used one once max_clients is reached. Eviction closes the client;
+    the token's connections, cache entries, rate limiter and stored state are
+    released with it unless a poller, stream, other client or in-flight request
+    still holds them (see TessieClient.aclose).
+    """
+
+    _idle_timeout: float
+    _max_clients: int
+    _clock: Callable[[], float]
+    _factory: Callable[[str], TessieClient]
+    _clients: "OrderedDict[str, tuple[TessieClient, float]]"
+    _lock: asyncio.Lock
+    _stats: ClientRegistryStats
+
+    def __init__(self,
+                 idle_timeout: float = 900.0,
+                 max_clients: int = 1000,
+                 clock: Callable[[], float] = time.monotonic,
+                 factory: Callable[[str], TessieClient] = TessieClient) -> None:
+        self._idle_timeout = idle_timeout
+        self._max_clients = max_clients
+        self._clock = clock
+        self._factory = factory
+        self._clients = OrderedDict()
+        self._lock = asyncio.Lock()
+        self._stats = ClientRegistryStats()
+
+    async def get(self, api_token: str) -> TessieClient:
+        key = token_fingerprint(api_token)
+        async with self._lock:
+            now = self._clock()
+            evicted = self._pop_idle(now)
+            entry = self._clients.get(key)
+            if entry is None:
+                while len(self._clients) >= self._max_clients:
+                    evicted.append(self._clients.popitem(last=False)[1][0])
+                client = self._factory(api_token)
+                self._stats.created += 1
+            else:
+                client = entry[0]
+                self._stats.reused += 1
+            self._clients[key] = (client, now)
+            self._clients.move_to_end(key)
+            await self._close(evicted)
+        return client
+
+    def _pop_idle(self, now: float) -> list[TessieClient]:
+        idle = [key for key, (_, last_used) in self._clients.items() if now - last_used > self._idle_timeout]
+        return [self._clients.pop(key)[0] for key in idle]
+
+    async def _close(self, clients: list[TessieClient]) -> None:
+        for client in clients:
+            await client.aclose()
+        self._stats.evicted += len(clients)
+
+    async def evict_idle(self) -> int:
+        """Evicts the clients that have been idle for too long and returns how many there were."""
+        async with self._lock:
+            evicted = self._pop_idle(self._clock())
+            await self._close(evicted)
+        return len(evicted)
+
+    def stats(self) -> ClientRegistryStats:
+        return self._stats.model_copy(update={"clients": len(self._clients)})
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    async def clear(self) -> None:
+        async with self._lock:
+            clients = [client for client, _ in self._clients.values()]
+            self._clients.clear()
+            await self._close(clients)
+        self._stats = ClientRegistryStats()
+
+
+default_clients = ClientRegistry()
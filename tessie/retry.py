@@ -0,0 +1,39 @@
+import random
+import httpx
+
+from typing import Optional
+from pydantic import BaseModel
+
+
+class RetryPolicy(BaseModel):
+    """When and how often do_request retries a failed request.
+
+    Only idempotent methods are retried by default. Delays use exponential
+    backoff with full jitter and never push a call past its overall deadline.
+    """
+
+    max_attempts: int = 3
+    backoff_base: float = 0.2
+    backoff_max: float = 5.0
+    deadline: Optional[float] = 15.0
+    retry_methods: frozenset[str] = frozenset({"GET", "HEAD", "OPTIONS"})
+    retry_statuses: frozenset[int] = frozenset({500, 502, 503, 504})
+
+    def backoff(self, attempt: int) -> float:
+        """Returns the delay before the attempt following the given (1-based) attempt."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+    def should_retry(self, method: str, exc: Exception, attempt: int) -> bool:
+        if method not in self.retry_methods or attempt >= self.max_attempts:
+            return False
+        return self.transient(exc)
+
+    def transient(self, exc: Exception) -> bool:
+        """Returns True for connection errors, timeouts and the retry_statuses, which may go away on their own."""
+        if isinstance(exc, httpx.HTTPStatusError):
+            return exc.response.status_code in self.retry_statuses
+        return isinstance(exc, httpx.TransportError)
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+NO_RETRY = RetryPolicy(max_attempts=1)
@@ -0,0 +1,68 @@
+import asyncio
+
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+from pydantic import BaseModel
+
+
+T = TypeVar("T")
+
+
+class SingleFlightStats(BaseModel):
+    calls: int = 0
+    shared: int = 0
+    in_flight: int = 0
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into a single execution.
+
+    The first caller starts the call as a task; every caller that arrives
+    while it is still running awaits the same task and receives the same
+    result (or exception). Cancelling one waiter does not cancel the shared
+    call for the others.
+    """
+
+    _calls: "dict[Hashable, asyncio.Task[Any]]"
+    _stats: SingleFlightStats
+
+    def __init__(self) -> None:
+        self._calls = {}
+        self._stats = SingleFlightStats()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        return await asyncio.shield(self.start(key, fn))
+
+    def start(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> "asyncio.Task[T]":
+        """Starts fn unless a call with the same key is already running, without waiting for it."""
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+            self._stats.calls += 1
+        else:
+            self._stats.shared += 1
+        return task
+
+    async def drain(self) -> None:
+        """Waits for every call that is currently in flight."""
+        if self._calls:
+            await asyncio.gather(*self._calls.values(), return_exceptions=True)
+
+    def _forget(self, key: Hashable, task: "asyncio.Task[Any]") -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every waiter went away.
+            task.exception()
+
+    def stats(self) -> SingleFlightStats:
+        return self._stats.model_copy(update={"in_flight": len(self._calls)})
+
+    def reset(self) -> None:
+        self._calls.clear()
+        self._stats = SingleFlightStats()
+
+
+default_singleflight = SingleFlight()
+default_refreshes = SingleFlight()
@@ -0,0 +1,119 @@
+import time
+
+from datetime import datetime, timezone
+from typing import Callable, Optional, Sequence
+from pydantic import BaseModel, Field
+
+from tessie.model import DriverList, InvitationList, VehicleSnapshot
+
+
+class VehicleRecord(BaseModel):
+    vin: str
+    snapshot: Optional[VehicleSnapshot] = None
+    drivers: Optional[DriverList] = None
+    invitations: Optional[InvitationList] = None
+    mode: Optional[str] = None
+    updated_at: float = 0.0
+    sharing_updated_at: float = 0.0
+    expires_at: float = 0.0
+    as_of: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class StateStore:
+    """In-memory, per-token and per-VIN vehicle state kept fresh by a background feed.
+
+    Writers (the poller or a streaming feed) set how long each record stays
+    valid; readers only get records that have not expired.
+    """
+
+    _records: dict[tuple[str, str], VehicleRecord]
+    _clock: Callable[[], float]
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._records = {}
+        self._clock = clock
+
+    def get(self, token_key: str, vin: str) -> Optional[VehicleRecord]:
+        return self._records.get((token_key, vin))
+
+    def update(self, token_key: str, vin: str, valid_for: float, **fields: object) -> VehicleRecord:
+        """Merges the given fields into the VIN's record and marks it valid for valid_for seconds."""
+        now = self._clock()
+        record = self._records.get((token_key, vin)) or VehicleRecord(vin=vin)
+        if "drivers" in fields or "invitations" in fields:
+            fields["sharing_updated_at"] = now
+        record = record.model_copy(
+            update={
+                **fields,
+                "updated_at": now,
+                "expires_at": now + valid_for,
+                "as_of": datetime.now(timezone.utc),
+            }
+        )
+        self._records[(token_key, vin)] = record
+        return record
+
+    def fresh(self, token_key: str, vin: str, max_age: Optional[float] = None) -> Optional[VehicleRecord]:
+        record = self._records.get((token_key, vin))
+        now = self._clock()
+        if record is None or now > record.expires_at:
+            return None
+        if max_age is not None and now - record.updated_at > max_age:
+            return None
+        return record
+
+    def snapshot(self,
+                 token_key: str,
+                 vin: str,
+                 endpoints: Sequence[str],
+                 max_age: Optional[float] = None) -> Optional[VehicleSnapshot]:
+        """Returns the requested sections if a fresh record holds all of them."""
+        record = self.fresh(token_key, vin, max_age)
+        if record is None or record.snapshot is None:
+            return None
+        if any(getattr(record.snapshot, endpoint) is None for endpoint in endpoints):
+            return None
+
+        return VehicleSnapshot(
+            vin=vin,
+            as_of=record.as_of,
+            live=record.snapshot.live,
+            **{endpoint: getattr(record.snapshot, endpoint) for endpoint in endpoints},
+        )
+
+    def _sharing(self, token_key: str, vin: str, max_age: Optional[float]) -> Optional[VehicleRecord]:
+        record = self.fresh(token_key, vin)
+        if record is None or (max_age is not None and self._clock() - record.sharing_updated_at > max_age):
+            return None
+        return record
+
+    def drivers(self, token_key: str, vin: str, max_age: Optional[float] = None) -> Optional[DriverList]:
+        """Returns the polled driver list if the record is valid and the list is younger than max_age."""
+        record = self._sharing(token_key, vin, max_age)
+        return record.drivers if record is not None else None
+
+    def invitations(self, token_key: str, vin: str, max_age: Optional[float] = None) -> Optional[InvitationList]:
+        record = self._sharing(token_key, vin, max_age)
+        return record.invitations if record is not None else None
+
+    def forget(self, token_key: str, vin: str, *fields: str) -> None:
+        """Drops fields from a record, e.g. after a change that makes the polled value outdated."""
+        record = self._records.get((token_key, vin))
+        if record is not None:
+            self._records[(token_key, vin)] = record.model_copy(update={field: None for field in fields})
+
+    def vins(self, token_key: str) -> list[str]:
+        return sorted(vin for key, vin in self._records if key == token_key)
+
+    def discard(self, token_key: str) -> None:
+        for key in [key for key in self._records if key[0] == token_key]:
+            del self._records[key]
+
+    def clear(self) -> None:
+        self._records.clear()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+default_store = StateStore()
@@ -0,0 +1,221 @@
+import asyncio
+import random
+import httpx
+
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+from pydantic import BaseModel, ValidationError
+
+from tessie import codec
+from tessie.model import VEHICLE_DATA_ENDPOINTS, VehicleSnapshot
+from tessie.poller import vehicle_mode
+from tessie.tessie_client import TessieClient
+
+
+class ServerSentEvent(BaseModel):
+    data: str
+    event: str = "message"
+    id: Optional[str] = None
+    retry: Optional[int] = None
+
+
+class StreamStats(BaseModel):
+    events: int = 0
+    applied: int = 0
+    coalesced: int = 0
+    invalid: int = 0
+    reconnects: int = 0
+    backpressure_waits: int = 0
+
+
+async def parse_sse(lines: AsyncIterator[str]) -> AsyncIterator[ServerSentEvent]:
+    """Parses a text/event-stream body into events, following the WHATWG field rules."""
+    data: list[str] = []
+    fields: dict[str, Any] = {}
+    async for line in lines:
+        line = line.rstrip("\r\n")
+        if not line:
+            if data:
+                yield ServerSentEvent(data="\n".join(data), **fields)
+            data, fields = [], {}
+            continue
+        if line.startswith(":"):
+            continue
+
+        name, _, value = line.partition(":")
+        value = value[1:] if value.startswith(" ") else value
+        if name == "data":
+            data.append(value)
+        elif name == "event":
+            fields["event"] = value
+        elif name == "id" and "\0" not in value:
+            fields["id"] = value
+        elif name == "retry" and value.isdigit():
+            fields["retry"] = int(value)
+
+
+def _merge(pending: dict[str, Any], update: dict[str, Any]) -> None:
+    for section, values in update.items():
+        if isinstance(values, dict) and isinstance(pending.get(section), dict):
+            pending[section].update(values)
+        else:
+            pending[section] = values
+
+
+class TelemetryStream:
+    """Applies a push feed of vehicle telemetry (server-sent events) to the client's StateStore.
+
+    Each event carries a VIN and partial state sections, e.g.
+    ``{"vin": "...", "charge_state": {"battery_level": 80}}``; partial sections
+    are merged into the last known values. Between the reader and the store sits
+    a buffer that coalesces updates per VIN, so a burst for one car never grows
+    it; when updates for more than max_pending distinct VINs are waiting, the
+    reader stops consuming the connection until the store catches up. After a
+    disconnect the stream reconnects with backoff and resumes from the last
+    event id via Last-Event-ID.
+    """
+
+    _client: TessieClient
+    _url: str
+    _headers: dict[str, str]
+    _valid_for: float
+    _max_pending: int
+    _reconnect_base: float
+    _reconnect_max: float
+    _sleep: Callable[[float], Awaitable[None]]
+    _pending: dict[str, dict[str, Any]]
+    _state: dict[str, dict[str, Any]]
+    _ready: asyncio.Event
+    _space: asyncio.Event
+    _task: "Optional[asyncio.Task[None]]"
+    last_event_id: Optional[str]
+    stats: StreamStats
+
+    def __init__(self,
+                 client: TessieClient,
+                 url: str,
+                 valid_for: float = 300.0,
+                 max_pending: int = 1000,
+                 reconnect_base: float = 0.5,
+                 reconnect_max: float = 30.0,
+                 sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+                 headers: Optional[dict[str, str]] = None) -> None:
+        self._client = client
+        self._url = url
+        self._headers = headers or {}
+        self._valid_for = valid_for
+        self._max_pending = max_pending
+        self._reconnect_base = reconnect_base
+        self._reconnect_max = reconnect_max
+        self._sleep = sleep
+        self._pending = {}
+        self._state = {}
+        self._ready = asyncio.Event()
+        self._space = asyncio.Event()
+        self._space.set()
+        self._task = None
+        self.last_event_id = None
+        self.stats = StreamStats()
+
+    async def connect_once(self) -> None:
+        """Consumes one connection until the server closes it."""
+        headers = {**self._headers, "Accept": "text/event-stream"}
+        if self.last_event_id is not None:
+            headers["Last-Event-ID"] = self.last_event_id
+
+        async with self._client.open_stream(self._url, headers=headers) as resp:
+            async for event in parse_sse(resp.aiter_lines()):
+                if event.retry is not None:
+                    self._reconnect_base = event.retry / 1000
+                await self._enqueue(event)
+                if event.id is not None:
+                    self.last_event_id = event.id
+
+    async def _enqueue(self, event: ServerSentEvent) -> None:
+        self.stats.events += 1
+        try:
+            update = codec.loads(event.data)
+        except ValueError:
+            update = None
+        vin = update.pop("vin", None) if isinstance(update, dict) else None
+        if not isinstance(vin, str):
+            self.stats.invalid += 1
+            return
+
+        while vin not in self._pending and len(self._pending) >= self._max_pending:
+            self.stats.backpressure_waits += 1
+            self._space.clear()
+            await self._space.wait()
+
+        if vin in self._pending:
+            self.stats.coalesced += 1
+        _merge(self._pending.setdefault(vin, {}), update)
+        self._ready.set()
+
+    def flush(self) -> int:
+        """Applies every pending update to the store and returns the number of VINs updated."""
+        pending, self._pending = self._pending, {}
+        self._ready.clear()
+        self._space.set()
+
+        for vin, update in pending.items():
+            state = self._state.setdefault(vin, {})
+            _merge(state, update)
+            sections = {}
+            for endpoint in VEHICLE_DATA_ENDPOINTS:
+                if endpoint not in state:
+                    continue
+                try:
+                    sections[endpoint] = VehicleSnapshot.model_validate({"vin": vin, endpoint: state[endpoint]})
+                except ValidationError:
+                    # Wait for the fields that are still missing from this section.
+                    continue
+
+            snapshot = VehicleSnapshot(
+                vin=vin,
+                live=True,
+                **{endpoint: getattr(section, endpoint) for endpoint, section in sections.items()},
+            )
+            self._client.store.update(
+                self._client.token_key, vin, valid_for=self._valid_for, snapshot=snapshot, mode=vehicle_mode(snapshot)
+            )
+        self.stats.applied += len(pending)
+        return len(pending)
+
+    async def _apply_forever(self) -> None:
+        while True:
+            await self._ready.wait()
+            self.flush()
+            # Let the reader refill the buffer so bursts are coalesced before the next flush.
+            await asyncio.sleep(0)
+
+    async def run(self) -> None:
+        applier = asyncio.ensure_future(self._apply_forever())
+        failures = 0
+        try:
+            async with self._client.held():
+                while True:
+                    try:
+                        await self.connect_once()
+                        failures = 0
+                    except httpx.HTTPError:
+                        failures += 1
+                    self.stats.reconnects += 1
+                    delay = min(self._reconnect_max, self._reconnect_base * 2 ** failures)
+                    await self._sleep(random.uniform(delay / 2, delay))
+        finally:
+            applier.cancel()
+
+    def start(self) -> "asyncio.Task[None]":
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self.run())
+        return self._task
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.flush()
@@ -0,0 +1,208 @@
+import asyncio
+import time
+import httpx
+
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Optional
+from pydantic import BaseModel
+
+# Latency samples kept per tenant for the percentile metrics.
+SAMPLE_SIZE = 1024
+
+
+class TenantBudget(BaseModel):
+    """A tenant's share of the worker: relative weight, concurrent requests and queue length."""
+
+    weight: float = 1.0
+    max_in_flight: int = 8
+    max_queued: int = 200
+
+
+class TenantStats(BaseModel):
+    requests: int = 0
+    errors: int = 0
+    rejected: int = 0
+    in_flight: int = 0
+    queued: int = 0
+    wait_p50: float = 0.0
+    wait_p99: float = 0.0
+    latency_p50: float = 0.0
+    latency_p99: float = 0.0
+
+
+class TenantBudgetExceeded(httpx.HTTPError):
+    """The tenant already has max_queued requests waiting for a slot."""
+
+
+def _percentile(samples: "deque[float]", q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class _Tenant:
+    budget: Optional[TenantBudget]
+    queue: "deque[tuple[float, asyncio.Future[None]]]"
+    in_flight: int
+    last_tag: float
+    stats: TenantStats
+    waits: "deque[float]"
+    latencies: "deque[float]"
+
+    def __init__(self) -> None:
+        self.budget = None
+        self.queue = deque()
+        self.in_flight = 0
+        self.last_tag = 0.0
+        self.stats = TenantStats()
+        self.waits = deque(maxlen=SAMPLE_SIZE)
+        self.latencies = deque(maxlen=SAMPLE_SIZE)
+
+
+class FairScheduler:
+    """Shares the worker's request slots between tenants with weighted fair queueing.
+
+    Every request gets a virtual start tag: the later of the scheduler's
+    virtual time and the tenant's previous tag, plus 1 / weight. Free slots go
+    to the waiting request with the smallest tag whose tenant is below its
+    max_in_flight, so a tenant with a long backlog is interleaved with the
+    others instead of delaying them.
+    """
+
+    _capacity: int
+    _default_budget: TenantBudget
+    _clock: Callable[[], float]
+    _tenants: dict[str, _Tenant]
+    _in_flight: int
+    _virtual_time: float
+
+    def __init__(self,
+                 capacity: int = 64,
+                 default_budget: Optional[TenantBudget] = None,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self._capacity = capacity
+        self._default_budget = default_budget or TenantBudget()
+        self._clock = clock
+        self._tenants = {}
+        self._in_flight = 0
+        self._virtual_time = 0.0
+
+    def _tenant(self, token_key: str) -> _Tenant:
+        tenant = self._tenants.get(token_key)
+        if tenant is None:
+            tenant = self._tenants[token_key] = _Tenant()
+        return tenant
+
+    def budget(self, token_key: str) -> TenantBudget:
+        tenant = self._tenants.get(token_key)
+        return tenant.budget if tenant is not None and tenant.budget is not None else self._default_budget
+
+    def set_budget(self, token_key: str, budget: TenantBudget) -> None:
+        self._tenant(token_key).budget = budget
+        self._dispatch()
+
+    def configure(self, capacity: Optional[int] = None, default_budget: Optional[TenantBudget] = None) -> None:
+        if capacity is not None:
+            self._capacity = capacity
+        if default_budget is not None:
+            self._default_budget = default_budget
+        self._dispatch()
+
+    async def acquire(self, token_key: str) -> None:
+        tenant = self._tenant(token_key)
+        budget = self.budget(token_key)
+        if len(tenant.queue) >= budget.max_queued:
+            tenant.stats.rejected += 1
+            raise TenantBudgetExceeded(f"Too many queued requests for tenant {token_key}")
+
+        tag = max(self._virtual_time, tenant.last_tag) + 1.0 / budget.weight
+        tenant.last_tag = tag
+        future: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        tenant.queue.append((tag, future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was granted just before the cancellation arrived.
+                self.release(token_key)
+            elif (tag, future) in tenant.queue:
+                tenant.queue.remove((tag, future))
+            raise
+
+    def release(self, token_key: str) -> None:
+        tenant = self._tenants[token_key]
+        tenant.in_flight -= 1
+        self._in_flight -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while self._in_flight < self._capacity:
+            best: Optional[_Tenant] = None
+            for token_key, tenant in self._tenants.items():
+                if tenant.queue and tenant.in_flight < self.budget(token_key).max_in_flight \
+                        and (best is None or tenant.queue[0][0] < best.queue[0][0]):
+                    best = tenant
+            if best is None:
+                return
+
+            tag, future = best.queue.popleft()
+            if future.done():
+                continue
+            self._virtual_time = max(self._virtual_time, tag)
+            best.in_flight += 1
+            self._in_flight += 1
+            future.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self, token_key: str) -> AsyncIterator[None]:
+        """Holds one of the worker's slots for token_key and records its wait time and latency."""
+        queued_at = self._clock()
+        await self.acquire(token_key)
+        tenant = self._tenants[token_key]
+        started_at = self._clock()
+        tenant.waits.append(started_at - queued_at)
+        tenant.stats.requests += 1
+        try:
+            yield
+        except BaseException:
+            self.record_error(token_key)
+            raise
+        finally:
+            tenant.latencies.append(self._clock() - started_at)
+            self.release(token_key)
+
+    def record_error(self, token_key: str) -> None:
+        """Counts a failed request, either an exception or an error response returned from slot()."""
+        self._tenant(token_key).stats.errors += 1
+
+    def stats(self) -> dict[str, TenantStats]:
+        return {
+            token_key: tenant.stats.model_copy(
+                update={
+                    "in_flight": tenant.in_flight,
+                    "queued": len(tenant.queue),
+                    "wait_p50": _percentile(tenant.waits, 0.5),
+                    "wait_p99": _percentile(tenant.waits, 0.99),
+                    "latency_p50": _percentile(tenant.latencies, 0.5),
+                    "latency_p99": _percentile(tenant.latencies, 0.99),
+                }
+            )
+            for token_key, tenant in self._tenants.items()
+        }
+
+    def discard(self, token_key: str) -> None:
+        """Forgets a tenant's budget and metrics if it has nothing in flight or queued."""
+        tenant = self._tenants.get(token_key)
+        if tenant is not None and tenant.in_flight == 0 and not tenant.queue:
+            del self._tenants[token_key]
+
+    def clear(self) -> None:
+        self._tenants.clear()
+        self._in_flight = 0
+        self._virtual_time = 0.0
+
+
+default_scheduler = FairScheduler()
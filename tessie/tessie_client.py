@@ -1,90 +1,704 @@
+import asyncio
+import time
 import httpx
 
-from typing import Optional
-from tessie.model import InvitationList, Invitation, DriverList, Driver, Location, Battery, ActionResult
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Optional, Sequence, TypeVar
+from pydantic import BaseModel
+from tessie import codec
+from tessie.cache import CacheEntry, CacheKey, TTLCache, default_cache
+from tessie.deadline import Deadline, DeadlineExceeded, DeadlineLike, TimeoutConfig
+from tessie.geo import GeoRegistry, default_geo
+from tessie.instrumentation import Instrumentation, default_instrumentation, endpoint_of
+from tessie.model import InvitationList, Invitation, DriverList, Location, Battery, ActionResult, \
+    LocationV2, BatteryV2, \
+    VehicleSnapshot, VehicleList, VehicleStatus, DriveState, ChargeState, VEHICLE_DATA_ENDPOINTS, PathPoint, Drive, Charge
+from tessie.pool import ClientPool, default_base_url, default_pool, resolve_base_url, token_fingerprint
+from tessie.ratelimit import RateLimiter, RateLimiterRegistry, default_limiters
+from tessie.retry import DEFAULT_RETRY_POLICY, RetryPolicy
+from tessie.singleflight import SingleFlight, default_refreshes, default_singleflight
+from tessie.store import StateStore, default_store
+from tessie.tenancy import FairScheduler, default_scheduler
+from tessie.timeseries import SeriesBuilder, TelemetrySeries
+
+M = TypeVar("M", bound=BaseModel)
+
+# Oldest cached vehicle state that stale-while-revalidate reads will still serve, in seconds.
+STALE_WHILE_REVALIDATE_LIMIT = 3600.0
+
+# Seconds of history requested per page. Path data is recorded about once per second
+# while driving, so its pages are kept short; drives and charges are sparse.
+PATH_WINDOW = 3 * 3600
+DRIVES_WINDOW = 30 * 86400
+CHARGES_WINDOW = 30 * 86400
+
+
+class MissingVehicleState(httpx.HTTPError):
+    """The requested state section is absent, e.g. Tessie has no last known state for a sleeping car."""
+
+
+def _provenance(snapshot: Optional[VehicleSnapshot]) -> dict[str, Any]:
+    if snapshot is None:
+        return {}
+    return {"stale": snapshot.stale, "as_of": snapshot.as_of, "live": snapshot.live}
+
+
+def location_from(drive_state: DriveState, snapshot: Optional[VehicleSnapshot] = None) -> Location:
+    return Location(
+        latitude=f"{drive_state.latitude:.9f}",
+        longitude=f"{drive_state.longitude:.9f}",
+        **_provenance(snapshot),
+    )
+
+
+def battery_from(charge_state: ChargeState, snapshot: Optional[VehicleSnapshot] = None) -> Battery:
+    return Battery(
+        battery_level=f"{charge_state.battery_level:.9f}",
+        battery_range=f"{charge_state.battery_range:.9f}",
+        **_provenance(snapshot),
+    )
+
+
+def location_v2_from(drive_state: DriveState, snapshot: Optional[VehicleSnapshot] = None) -> LocationV2:
+    return LocationV2(latitude=drive_state.latitude, longitude=drive_state.longitude, **_provenance(snapshot))
+
+
+def battery_v2_from(charge_state: ChargeState, snapshot: Optional[VehicleSnapshot] = None) -> BatteryV2:
+    return BatteryV2(
+        battery_level=charge_state.battery_level,
+        battery_range=charge_state.battery_range,
+        **_provenance(snapshot),
+    )
 
 
 class TessieClient:
     _api_token: str
+    _base_url: str
+    _pool: ClientPool
+    _cache: TTLCache
+    _singleflight: SingleFlight
+    _refreshes: SingleFlight
+    _limiters: RateLimiterRegistry
+    _retry_policy: RetryPolicy
+    _timeouts: TimeoutConfig
+    _store: StateStore
+    _scheduler: FairScheduler
+    _geo: GeoRegistry
+    _instrumentation: Instrumentation
+    _token_key: str
+    _closed: bool
 
-    def __init__(self, api_token: str) -> None:
+    def __init__(self,
+                 api_token: str,
+                 base_url: Optional[str] = None,
+                 pool: Optional[ClientPool] = None,
+                 cache: Optional[TTLCache] = None,
+                 singleflight: Optional[SingleFlight] = None,
+                 refreshes: Optional[SingleFlight] = None,
+                 limiters: Optional[RateLimiterRegistry] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 timeouts: Optional[TimeoutConfig] = None,
+                 store: Optional[StateStore] = None,
+                 scheduler: Optional[FairScheduler] = None,
+                 geo: Optional[GeoRegistry] = None,
+                 instrumentation: Optional[Instrumentation] = None) -> None:
         self._api_token = api_token
+        self._base_url = resolve_base_url(base_url) if base_url is not None else default_base_url()
+        self._pool = pool if pool is not None else default_pool
+        self._cache = cache if cache is not None else default_cache
+        self._singleflight = singleflight if singleflight is not None else default_singleflight
+        self._refreshes = refreshes if refreshes is not None else default_refreshes
+        self._limiters = limiters if limiters is not None else default_limiters
+        self._retry_policy = retry_policy if retry_policy is not None else DEFAULT_RETRY_POLICY
+        self._timeouts = timeouts if timeouts is not None else TimeoutConfig()
+        self._store = store if store is not None else default_store
+        self._scheduler = scheduler if scheduler is not None else default_scheduler
+        self._geo = geo if geo is not None else default_geo
+        self._instrumentation = instrumentation if instrumentation is not None else default_instrumentation
+        self._token_key = token_fingerprint(api_token)
+        self._closed = False
+        self._pool.hold(api_token)
+
+    @property
+    def cache(self) -> TTLCache:
+        return self._cache
+
+    @property
+    def store(self) -> StateStore:
+        return self._store
+
+    @property
+    def token_key(self) -> str:
+        return self._token_key
+
+    async def aclose(self) -> None:
+        """Stops using the token's connections, cached values, rate limiter, stored state and geofences.
 
-    async def do_request(self, method: str, url: str, payload: Optional[dict] = None) -> dict:
-        headers = {"Authorization": f"Bearer {self._api_token}"}
-        async with httpx.AsyncClient() as client:
-            request = httpx.Request(method, url, headers=headers, json=payload)
-            resp = await client.send(request)
-            resp.raise_for_status()
-            return resp.json()  # type: ignore[no-any-return]
-
-    async def list_invitations(self, vin: str) -> InvitationList:
-        url = f"https://api.tessie.com/api/1/vehicles/{vin}/invitations"
-        data = await self.do_request("GET", url)
-        return InvitationList(
-            invitations=[
-                Invitation(
-                    id=invitation["id_s"],
-                    share_link=invitation["share_link"],
-                    state=invitation["state"]
+        They are shared with other clients for the same token, running pollers and
+        streams, and requests in flight, and are only released once none of them
+        holds the token any more.
+        """
+        if not self._closed:
+            self._closed = True
+            await self._release()
+
+    @asynccontextmanager
+    async def held(self) -> AsyncIterator[None]:
+        """Keeps the token's shared state alive for the duration of the block, even if the client is closed."""
+        self._pool.hold(self._api_token)
+        try:
+            yield
+        finally:
+            await self._release()
+
+    async def _release(self) -> None:
+        if not self._pool.release(self._api_token):
+            return
+        await self._pool.discard(self._api_token)
+        self._cache.invalidate_token(self._token_key)
+        self._limiters.discard(self._token_key)
+        self._store.discard(self._token_key)
+        self._scheduler.discard(self._token_key)
+        self._geo.discard(self._token_key)
+
+    def _cache_key(self, vin: str, endpoint: str) -> CacheKey:
+        return self._token_key, vin, endpoint
+
+    def _stale(self, key: CacheKey) -> Optional[Any]:
+        entry = self._cache.get_entry(key)
+        return entry.value if entry is not None else None
+
+    @asynccontextmanager
+    async def open_stream(self, url: str, headers: Optional[dict[str, str]] = None) -> AsyncIterator[httpx.Response]:
+        """Opens a long-lived streaming GET; there is no read timeout.
+
+        Paths and URLs on the API host use the pooled, authenticated connection.
+        Any other host gets a separate client that never sees the Tessie token,
+        so its credentials have to be passed in headers.
+        """
+        base = httpx.URL(self._base_url)
+        target = base.join(url)
+        timeout = httpx.Timeout(self._timeouts.read, connect=self._timeouts.connect, read=None)
+        async with self.held():
+            if (target.scheme, target.host, target.port) == (base.scheme, base.host, base.port):
+                client = self._pool.get(self._api_token, self._base_url)
+                async with client.stream("GET", target, headers=headers, timeout=timeout) as resp:
+                    resp.raise_for_status()
+                    yield resp
+                return
+            async with self._pool.unauthenticated() as client:
+                async with client.stream("GET", target, headers=headers, timeout=timeout) as resp:
+                    resp.raise_for_status()
+                    yield resp
+
+    async def do_request(self,
+                         method: str,
+                         url: str,
+                         payload: Optional[dict] = None,
+                         deadline: DeadlineLike = None,
+                         generation: int = 0) -> dict:
+        """Sends a request within a total time budget (default: the client's total timeout).
+
+        Raises DeadlineExceeded once the budget is used up, whether by queueing, the
+        request itself or retries. Concurrent GETs only share one upstream request if
+        they pass the same cache generation, so a read started after a write never
+        joins one that started before it.
+        """
+        budget = Deadline.within(deadline, self._timeouts.total)
+        async with self.held():
+            if not self._instrumentation.enabled:
+                return await self._within(method, url, payload, budget, generation)
+            with self._instrumentation.span("tessie.request", method=method, endpoint=endpoint_of(url)):
+                return await self._within(method, url, payload, budget, generation)
+
+    async def _within(self,
+                      method: str,
+                      url: str,
+                      payload: Optional[dict],
+                      budget: Deadline,
+                      generation: int) -> dict:
+        try:
+            return await asyncio.wait_for(
+                self._dispatch(method, url, payload, budget, generation), budget.remaining()
+            )
+        except asyncio.TimeoutError as exc:
+            raise DeadlineExceeded(f"{method} {url} exceeded its {budget.seconds:g}s deadline") from exc
+
+    async def _dispatch(self,
+                        method: str,
+                        url: str,
+                        payload: Optional[dict],
+                        budget: Deadline,
+                        generation: int) -> dict:
+        if method == "GET" and payload is None:
+            # Identical concurrent reads share one upstream request and one decoded body;
+            # callers must treat the returned dict as read-only.
+            key = (method, self._base_url, url, self._token_key, generation)
+            return await self._singleflight.do(key, lambda: self._send(method, url, payload, budget))
+        return await self._send(method, url, payload, budget)
+
+    async def _send(self, method: str, url: str, payload: Optional[dict], budget: Deadline) -> dict:
+        client = self._pool.get(self._api_token, self._base_url)
+        limiter = self._limiters.get(self._token_key)
+        policy = self._retry_policy
+        if policy.deadline is not None and policy.deadline < budget.remaining():
+            budget = Deadline(policy.deadline)
+        attempt = 1
+        while True:
+            try:
+                resp = await self._send_throttled(client, limiter, method, url, payload)
+                resp.raise_for_status()
+                with self._instrumentation.span("json.decode", bytes=len(resp.content)):
+                    return codec.loads(resp.content)  # type: ignore[no-any-return]
+            except (httpx.TransportError, httpx.HTTPStatusError) as exc:
+                delay = policy.backoff(attempt)
+                if not policy.should_retry(method, exc, attempt) or not budget.allows(delay):
+                    raise
+            if self._instrumentation.enabled:
+                self._instrumentation.count("tessie.request.retries", method=method, endpoint=endpoint_of(url))
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _send_throttled(self,
+                              client: httpx.AsyncClient,
+                              limiter: RateLimiter,
+                              method: str,
+                              url: str,
+                              payload: Optional[dict]) -> httpx.Response:
+        throttled = 0
+        while True:
+            # The token's own limiter is passed first, so a throttled tenant never holds one of
+            # the worker's shared slots while it waits. The scheduler's slots are also the
+            # token's only concurrency cap (TenantBudget.max_in_flight).
+            async with limiter.slot(), self._scheduler.slot(self._token_key):
+                if self._instrumentation.enabled:
+                    resp = await self._traced_request(client, method, url, payload)
+                else:
+                    resp = await client.request(method, url, json=payload, timeout=self._timeouts.per_attempt())
+                if resp.is_error:
+                    self._scheduler.record_error(self._token_key)
+            # A 429 means the request was rejected before processing, so it is safe to queue it again.
+            if limiter.observe(resp.status_code, resp.headers) is None \
+                    or throttled >= limiter.config.max_throttle_retries:
+                return resp
+            throttled += 1
+
+    async def _traced_request(self,
+                              client: httpx.AsyncClient,
+                              method: str,
+                              url: str,
+                              payload: Optional[dict]) -> httpx.Response:
+        """Sends one attempt in an http.request span and records its latency by endpoint and status."""
+        instrumentation = self._instrumentation
+        endpoint = endpoint_of(url)
+        started = time.perf_counter()
+        with instrumentation.span("http.request", method=method, endpoint=endpoint) as span:
+            try:
+                resp = await client.request(
+                    method, url, json=payload, timeout=self._timeouts.per_attempt(),
+                    extensions={"trace": instrumentation.httpx_tracer()},
                 )
-                for invitation in data["response"]
-            ]
-        )
+            except httpx.HTTPError as exc:
+                instrumentation.observe("tessie.request.duration", time.perf_counter() - started,
+                                        method=method, endpoint=endpoint, status="error")
+                instrumentation.count("tessie.request.errors", endpoint=endpoint, error=type(exc).__name__)
+                raise
+            span.set_attribute("status", resp.status_code)
+        instrumentation.observe("tessie.request.duration", time.perf_counter() - started,
+                                method=method, endpoint=endpoint, status=resp.status_code)
+        if resp.is_error:
+            instrumentation.count("tessie.request.errors", endpoint=endpoint, error=resp.status_code)
+        return resp
+
+    async def list_invitations(self,
+                               vin: str,
+                               max_age: Optional[float] = None,
+                               force_refresh: bool = False,
+                               deadline: DeadlineLike = None) -> InvitationList:
+        key = self._cache_key(vin, "invitations")
+        if not force_refresh:
+            polled = self._store.invitations(self._token_key, vin, max_age)
+            if polled is not None:
+                return polled
+            cached = self._cache.get(key, max_age)
+            if cached is not None:
+                return cached  # type: ignore[no-any-return]
 
-    async def create_invitation(self, vin: str) -> Invitation:
-        url = f"https://api.tessie.com/api/1/vehicles/{vin}/invitations"
-        data = await self.do_request("POST", url)
+        url = f"/api/1/vehicles/{vin}/invitations"
+        generation = self._cache.generation(key)
+        try:
+            data = await self.do_request("GET", url, deadline=deadline, generation=generation)
+        except DeadlineExceeded:
+            stale = self._stale(key)
+            if stale is None:
+                raise
+            return stale.model_copy(update={"stale": True})  # type: ignore[no-any-return]
+        with self._instrumentation.span("model.validate", model="InvitationList"):
+            invitations = InvitationList.model_validate({"invitations": data["response"]})
+        self._cache.set(key, invitations, generation)
+        return invitations
 
-        return Invitation(
-            id=data["response"]["id_s"],
-            share_link=data["response"]["share_link"],
-            state=data["response"]["state"]
+    async def create_invitation(self, vin: str, deadline: DeadlineLike = None) -> Invitation:
+        url = f"/api/1/vehicles/{vin}/invitations"
+        data = await self.do_request("POST", url, deadline=deadline)
+
+        invitation = Invitation.model_validate(data["response"])
+        self._store.forget(self._token_key, vin, "invitations")
+        self._cache.patch(
+            self._cache_key(vin, "invitations"),
+            lambda cached: InvitationList(
+                invitations=[*(item for item in cached.invitations if item.id != invitation.id), invitation]
+            ),
         )
+        return invitation
 
-    async def revoke_invitation(self, vin: str, invite_id: str) -> ActionResult:
-        url = f"https://api.tessie.com/api/1/vehicles/{vin}/invitations/{invite_id}/revoke"
-        data = await self.do_request("POST", url)
-        return ActionResult(
+    async def revoke_invitation(self, vin: str, invite_id: str, deadline: DeadlineLike = None) -> ActionResult:
+        url = f"/api/1/vehicles/{vin}/invitations/{invite_id}/revoke"
+        data = await self.do_request("POST", url, deadline=deadline)
+        result = ActionResult(
             success=data["response"] == "true" or data["response"] == True
         )
+        if result.success:
+            self._store.forget(self._token_key, vin, "invitations")
+            self._cache.patch(
+                self._cache_key(vin, "invitations"),
+                lambda cached: InvitationList(
+                    invitations=[invitation for invitation in cached.invitations if invitation.id != invite_id]
+                ),
+            )
+        return result
 
-    async def list_driver(self, vin: str) -> DriverList:
-        url = f"https://api.tessie.com/api/1/vehicles/{vin}/drivers"
-        data = await self.do_request("GET", url)
-        return DriverList(
-            drivers=[
-                Driver(
-                    user_id=driver["user_id_s"],
-                    name=driver["driver_first_name"] + " " + driver["driver_last_name"]
-                )
-                for driver in data["response"]
-            ]
-        )
+    async def list_driver(self,
+                          vin: str,
+                          max_age: Optional[float] = None,
+                          force_refresh: bool = False,
+                          deadline: DeadlineLike = None) -> DriverList:
+        key = self._cache_key(vin, "drivers")
+        if not force_refresh:
+            polled = self._store.drivers(self._token_key, vin, max_age)
+            if polled is not None:
+                return polled
+            cached = self._cache.get(key, max_age)
+            if cached is not None:
+                return cached  # type: ignore[no-any-return]
+
+        url = f"/api/1/vehicles/{vin}/drivers"
+        generation = self._cache.generation(key)
+        try:
+            data = await self.do_request("GET", url, deadline=deadline, generation=generation)
+        except DeadlineExceeded:
+            stale = self._stale(key)
+            if stale is None:
+                raise
+            return stale.model_copy(update={"stale": True})  # type: ignore[no-any-return]
+        with self._instrumentation.span("model.validate", model="DriverList"):
+            drivers = DriverList.model_validate({"drivers": data["response"]})
+        self._cache.set(key, drivers, generation)
+        return drivers
 
-    async def delete_driver(self, vin: str, user_id: str) -> ActionResult:
-        url = f"https://api.tessie.com/api/1/vehicles/{vin}/drivers?share_user_id={user_id}"
-        data = await self.do_request("DELETE", url)
-        return ActionResult(
+    async def delete_driver(self, vin: str, user_id: str, deadline: DeadlineLike = None) -> ActionResult:
+        url = f"/api/1/vehicles/{vin}/drivers?share_user_id={user_id}"
+        data = await self.do_request("DELETE", url, deadline=deadline)
+        result = ActionResult(
             success=data["response"] == "ok"
         )
+        if result.success:
+            self._store.forget(self._token_key, vin, "drivers")
+            self._cache.patch(
+                self._cache_key(vin, "drivers"),
+                lambda cached: DriverList(drivers=[driver for driver in cached.drivers if driver.user_id != user_id]),
+            )
+        return result
+
+    async def get_vehicle_data(self,
+                               vin: str,
+                               endpoints: Sequence[str] = VEHICLE_DATA_ENDPOINTS,
+                               max_age: Optional[float] = None,
+                               force_refresh: bool = False,
+                               deadline: DeadlineLike = None,
+                               stale_while_revalidate: bool = False,
+                               allow_wake: bool = True) -> VehicleSnapshot:
+        """Returns the requested state sections, fetching only those that are not cached.
+
+        With stale_while_revalidate, expired sections (up to STALE_WHILE_REVALIDATE_LIMIT
+        seconds old) are returned immediately with stale=True and refreshed in the background.
+        Without allow_wake, a car that is not online is never woken up: Tessie's last known
+        state is returned instead, with live=False. Everything else, including local cache
+        hits, was read from the car and has live=True; as_of tells how old it is.
+        """
+        endpoints = list(dict.fromkeys(endpoints))
+        if not force_refresh:
+            polled = self._store.snapshot(self._token_key, vin, endpoints, max_age)
+            if polled is not None:
+                return polled
+
+        keys = {endpoint: self._cache_key(vin, endpoint) for endpoint in endpoints}
+        cached: dict[str, CacheEntry] = {}
+        if not force_refresh:
+            for endpoint, key in keys.items():
+                value = self._cache.get(key, max_age)
+                entry = self._cache.get_entry(key)
+                if value is not None and entry is not None:
+                    cached[endpoint] = entry
+
+        # The local cache only holds vehicle_data reads, so its entries are live data too.
+        live = None if allow_wake else True
+        missing = [endpoint for endpoint in endpoints if endpoint not in cached]
+        if missing and stale_while_revalidate and not force_refresh:
+            stale = self._stale_entries(keys, missing, STALE_WHILE_REVALIDATE_LIMIT)
+            if stale is not None:
+                self._revalidate(vin, missing, deadline, allow_wake)
+                return self._snapshot_from(vin, {**cached, **stale}, stale=True, live=live)
+
+        if not missing:
+            return self._snapshot_from(vin, cached, live=live)
+
+        # The status check and the read share one budget, so deadline bounds the whole call.
+        budget = Deadline.within(deadline, self._timeouts.total)
+        url = f"/api/1/vehicles/{vin}/vehicle_data?endpoints={';'.join(missing)}"
+        try:
+            if not allow_wake:
+                status = await self.get_vehicle_status(vin, deadline=budget)
+                if not status.online:
+                    return await self._last_known_state(vin, endpoints, budget)
+            data = await self.do_request("GET", url, deadline=budget)
+        except DeadlineExceeded:
+            stale = self._stale_entries(keys, missing)
+            if stale is None:
+                raise
+            return self._snapshot_from(vin, {**cached, **stale}, stale=True, live=live)
+
+        with self._instrumentation.span("model.validate", model="VehicleSnapshot"):
+            fetched = VehicleSnapshot.model_validate(
+                {"vin": vin, **{endpoint: data["response"][endpoint] for endpoint in missing}}
+            )
+        for endpoint in missing:
+            self._cache.set(keys[endpoint], getattr(fetched, endpoint))
 
-    async def get_location(self, vin: str) -> Location:
-        url = f"https://api.tessie.com/api/1/vehicles/{vin}/vehicle_data?endpoints=drive_state"
-        data = await self.do_request("GET", url)
-        return Location(
-            latitude=f'{data["response"]["drive_state"]["latitude"]:.9f}',
-            longitude=f'{data["response"]["drive_state"]["longitude"]:.9f}'
+        if not cached:
+            return fetched.model_copy(update={"live": live})
+        return self._snapshot_from(vin, cached, live=live).model_copy(
+            update={endpoint: getattr(fetched, endpoint) for endpoint in missing}
         )
 
-    async def get_battery_level(self, vin: str) -> Battery:
-        url = f"https://api.tessie.com/api/1/vehicles/{vin}/vehicle_data?endpoints=charge_state"
-        data = await self.do_request("GET", url)
+    async def get_vehicle_status(self, vin: str, deadline: DeadlineLike = None) -> VehicleStatus:
+        """Returns whether the car is online, asleep or offline without waking it up."""
+        key = self._cache_key(vin, "status")
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached  # type: ignore[no-any-return]
 
-        return Battery(
-            battery_level=f'{data["response"]["charge_state"]["battery_level"]:.9f}',
-            battery_range=f'{data["response"]["charge_state"]["battery_range"]:.9f}',
+        url = f"/api/1/vehicles/{vin}"
+        data = await self.do_request("GET", url, deadline=deadline)
+        status = VehicleStatus(vin=vin, state=data["response"]["state"])
+        self._cache.set(key, status)
+        return status
+
+    async def _last_known_state(self, vin: str, endpoints: list[str], deadline: DeadlineLike) -> VehicleSnapshot:
+        # Served from Tessie's own copy of the vehicle state; this never wakes the car and is
+        # deliberately kept out of the local cache, which only holds live data.
+        url = f"/{vin}/state?use_cache=true"
+        data = await self.do_request("GET", url, deadline=deadline)
+        return VehicleSnapshot.model_validate(
+            {"vin": vin, "live": False, **{endpoint: data.get(endpoint) for endpoint in endpoints}}
         )
 
+    def _stale_entries(self,
+                       keys: dict[str, CacheKey],
+                       endpoints: list[str],
+                       max_age: Optional[float] = None) -> Optional[dict[str, CacheEntry]]:
+        """Returns the cached entries for all endpoints regardless of TTL, or None if any is missing."""
+        entries: dict[str, CacheEntry] = {}
+        for endpoint in endpoints:
+            entry = self._cache.get_entry(keys[endpoint])
+            if entry is None or (max_age is not None and self._cache.age(entry) > max_age):
+                return None
+            entries[endpoint] = entry
+        return entries
+
+    def _snapshot_from(self,
+                       vin: str,
+                       entries: dict[str, CacheEntry],
+                       stale: Optional[bool] = None,
+                       live: Optional[bool] = None) -> VehicleSnapshot:
+        return VehicleSnapshot(
+            vin=vin,
+            stale=stale,
+            live=live,
+            as_of=min(entry.as_of for entry in entries.values()),
+            **{endpoint: entry.value for endpoint, entry in entries.items()},
+        )
+
+    def _revalidate(self, vin: str, endpoints: list[str], deadline: DeadlineLike, allow_wake: bool) -> None:
+        """Refreshes the given sections in the background, at most once at a time per VIN and sections."""
+        key = (self._token_key, vin, tuple(sorted(endpoints)))
+        # The refresh outlives the call that started it and gets a budget of its own.
+        seconds = deadline.seconds if isinstance(deadline, Deadline) else deadline
+        self._refreshes.start(
+            key,
+            lambda: self.get_vehicle_data(
+                vin, endpoints, force_refresh=True, deadline=seconds, allow_wake=allow_wake
+            ),
+        )
+
+    async def project(self,
+                      vin: str,
+                      section: str,
+                      build: Callable[[Any, VehicleSnapshot], M],
+                      max_age: Optional[float] = None,
+                      force_refresh: bool = False,
+                      deadline: DeadlineLike = None,
+                      stale_while_revalidate: bool = False,
+                      allow_wake: bool = True) -> M:
+        """Fetches one state section like get_vehicle_data and turns it into a model with build, e.g. location_from."""
+        snapshot = await self.get_vehicle_data(
+            vin, [section], max_age, force_refresh, deadline, stale_while_revalidate, allow_wake
+        )
+        state = getattr(snapshot, section)
+        if state is None:
+            raise MissingVehicleState(f"No {section} returned for VIN {vin}")
+
+        return build(state, snapshot)
+
+    async def get_location(self,
+                           vin: str,
+                           max_age: Optional[float] = None,
+                           force_refresh: bool = False,
+                           deadline: DeadlineLike = None,
+                           stale_while_revalidate: bool = False,
+                           allow_wake: bool = True) -> Location:
+        return await self.project(
+            vin, "drive_state", location_from, max_age, force_refresh, deadline, stale_while_revalidate, allow_wake
+        )
+
+    async def get_battery_level(self,
+                                vin: str,
+                                max_age: Optional[float] = None,
+                                force_refresh: bool = False,
+                                deadline: DeadlineLike = None,
+                                stale_while_revalidate: bool = False,
+                                allow_wake: bool = True) -> Battery:
+        return await self.project(
+            vin, "charge_state", battery_from, max_age, force_refresh, deadline, stale_while_revalidate, allow_wake
+        )
+
+    async def get_location_v2(self,
+                              vin: str,
+                              max_age: Optional[float] = None,
+                              force_refresh: bool = False,
+                              deadline: DeadlineLike = None,
+                              stale_while_revalidate: bool = False,
+                              allow_wake: bool = True) -> LocationV2:
+        return await self.project(
+            vin, "drive_state", location_v2_from, max_age, force_refresh, deadline, stale_while_revalidate, allow_wake
+        )
+
+    async def get_battery_level_v2(self,
+                                   vin: str,
+                                   max_age: Optional[float] = None,
+                                   force_refresh: bool = False,
+                                   deadline: DeadlineLike = None,
+                                   stale_while_revalidate: bool = False,
+                                   allow_wake: bool = True) -> BatteryV2:
+        return await self.project(
+            vin, "charge_state", battery_v2_from, max_age, force_refresh, deadline, stale_while_revalidate, allow_wake
+        )
+
+    async def list_vehicles(self, only_active: bool = False, deadline: DeadlineLike = None) -> VehicleList:
+        """Returns the last known state of every vehicle on the account in a single request."""
+        url = f"/vehicles?only_active={str(only_active).lower()}"
+        data = await self.do_request("GET", url, deadline=deadline)
+        return VehicleList(
+            vehicles=[
+                VehicleSnapshot.model_validate(
+                    {
+                        "vin": vehicle["vin"],
+                        **{
+                            endpoint: (vehicle.get("last_state") or {}).get(endpoint)
+                            for endpoint in VEHICLE_DATA_ENDPOINTS
+                        },
+                    }
+                )
+                for vehicle in data["results"]
+            ]
+        )
+
+    async def _paginate(self,
+                        url: str,
+                        start: int,
+                        end: int,
+                        window: int,
+                        key: str,
+                        deadline: DeadlineLike = None) -> AsyncIterator[dict]:
+        """Yields the results of a history endpoint between start and end (unix seconds), oldest first.
+
+        The range is requested one window at a time, and the next window is only
+        fetched once the caller has consumed the previous one. Each item belongs
+        to the window containing its `key` timestamp, so items on a boundary are
+        yielded once.
+        """
+        if window <= 0:
+            raise ValueError(f"History window must be positive, got {window}")
+
+        separator = "&" if "?" in url else "?"
+        page_start = start
+        async with self.held():
+            while page_start <= end:
+                page_end = min(page_start + window, end)
+                last = page_end >= end
+                data = await self.do_request(
+                    "GET", f"{url}{separator}from={page_start}&to={page_end}", deadline=deadline
+                )
+                for item in sorted(data.get("results") or [], key=lambda item: item[key]):
+                    if page_start <= item[key] < page_end or (last and item[key] == end):
+                        yield item
+                if last:
+                    break
+                page_start = page_end
+
+    async def iter_path(self,
+                        vin: str,
+                        start: int,
+                        end: int,
+                        window: int = PATH_WINDOW,
+                        deadline: DeadlineLike = None) -> AsyncIterator[PathPoint]:
+        """Streams the recorded positions of the car between start and end.
+
+        A deadline in seconds applies per page; pass a Deadline to bound the whole range.
+        """
+        async for item in self._paginate(f"/{vin}/path?separate=false", start, end, window, "timestamp", deadline):
+            yield PathPoint.model_validate(item)
+
+    async def path_series(self,
+                          vin: str,
+                          start: int,
+                          end: int,
+                          window: int = PATH_WINDOW,
+                          deadline: DeadlineLike = None) -> TelemetrySeries:
+        """Loads the recorded path between start and end into a columnar series, skipping per-point models."""
+        builder = SeriesBuilder()
+        async for item in self._paginate(f"/{vin}/path?separate=false", start, end, window, "timestamp", deadline):
+            builder.append(item)
+        return builder.build()
 
+    async def iter_drives(self,
+                          vin: str,
+                          start: int,
+                          end: int,
+                          window: int = DRIVES_WINDOW,
+                          deadline: DeadlineLike = None) -> AsyncIterator[Drive]:
+        """Streams the drives that started between start and end, with distances in km."""
+        url = f"/{vin}/drives?distance_format=km&timezone=UTC"
+        async for item in self._paginate(url, start, end, window, "started_at", deadline):
+            yield Drive.model_validate(item)
 
+    async def iter_charges(self,
+                           vin: str,
+                           start: int,
+                           end: int,
+                           window: int = CHARGES_WINDOW,
+                           deadline: DeadlineLike = None) -> AsyncIterator[Charge]:
+        """Streams the charging sessions that started between start and end."""
+        url = f"/{vin}/charges?distance_format=km&timezone=UTC"
+        async for item in self._paginate(url, start, end, window, "started_at", deadline):
+            yield Charge.model_validate(item)
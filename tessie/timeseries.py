@@ -0,0 +1,204 @@
+import math
+import numpy as np
+import numpy.typing as npt
+
+from array import array
+from typing import Iterable, Optional, Sequence
+
+from tessie.history import EARTH_RADIUS_KM
+from tessie.model import EnergyReport
+
+# Segments shorter than this (km) count as standing still.
+STATIONARY_KM = 0.05
+
+
+def haversine_km_array(lat1: npt.ArrayLike, lon1: npt.ArrayLike, lat2: npt.ArrayLike, lon2: npt.ArrayLike) -> np.ndarray:
+    """tessie.history.haversine_km over arrays (or scalars) in degrees, returning an array of km."""
+    phi1, phi2 = np.radians(lat1), np.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = np.radians(np.subtract(lon2, lon1))
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlambda / 2) ** 2
+    return np.asarray(2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0))))
+
+
+class TelemetrySeries:
+    """Columnar telemetry of one car: parallel typed arrays ordered by timestamp.
+
+    Timestamps are int64 unix seconds, positions float64 degrees, battery level
+    (percent) and range (km) float32 with NaN where a sample has no value. A
+    point costs 32 bytes instead of a pydantic object per sample.
+    """
+
+    timestamp: np.ndarray
+    latitude: np.ndarray
+    longitude: np.ndarray
+    battery_level: np.ndarray
+    battery_range: np.ndarray
+    _segments: Optional[np.ndarray]
+
+    def __init__(self,
+                 timestamp: npt.ArrayLike,
+                 latitude: npt.ArrayLike,
+                 longitude: npt.ArrayLike,
+                 battery_level: Optional[npt.ArrayLike] = None,
+                 battery_range: Optional[npt.ArrayLike] = None) -> None:
+        self.timestamp = np.asarray(timestamp, dtype=np.int64)
+        n = len(self.timestamp)
+        self.latitude = np.asarray(latitude, dtype=np.float64)
+        self.longitude = np.asarray(longitude, dtype=np.float64)
+        self.battery_level = np.asarray(battery_level if battery_level is not None else np.full(n, np.nan),
+                                        dtype=np.float32)
+        self.battery_range = np.asarray(battery_range if battery_range is not None else np.full(n, np.nan),
+                                        dtype=np.float32)
+        if not all(len(column) == n for column in (self.latitude, self.longitude, self.battery_level,
+                                                   self.battery_range)):
+            raise ValueError("All telemetry columns must have the same length")
+        self._segments = None
+        if n > 1 and np.any(np.diff(self.timestamp) < 0):
+            order = np.argsort(self.timestamp, kind="stable")
+            for name in ("timestamp", "latitude", "longitude", "battery_level", "battery_range"):
+                setattr(self, name, getattr(self, name)[order])
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column.nbytes for column in (self.timestamp, self.latitude, self.longitude,
+                                                self.battery_level, self.battery_range))
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict]) -> "TelemetrySeries":
+        builder = SeriesBuilder()
+        for record in records:
+            builder.append(record)
+        return builder.build()
+
+    @classmethod
+    def concat(cls, series: Sequence["TelemetrySeries"]) -> "TelemetrySeries":
+        if not series:
+            return cls([], [], [])
+        return cls(
+            np.concatenate([s.timestamp for s in series]),
+            np.concatenate([s.latitude for s in series]),
+            np.concatenate([s.longitude for s in series]),
+            np.concatenate([s.battery_level for s in series]),
+            np.concatenate([s.battery_range for s in series]),
+        )
+
+    def between(self, start: int, end: int) -> "TelemetrySeries":
+        """Returns the samples with start <= timestamp < end, sharing memory with this series."""
+        lo, hi = np.searchsorted(self.timestamp, [start, end], side="left")
+        return TelemetrySeries(
+            self.timestamp[lo:hi],
+            self.latitude[lo:hi],
+            self.longitude[lo:hi],
+            self.battery_level[lo:hi],
+            self.battery_range[lo:hi],
+        )
+
+    def segment_km(self) -> np.ndarray:
+        """Distance between each pair of consecutive samples (length n - 1), computed once per series."""
+        if self._segments is None:
+            self._segments = haversine_km_array(self.latitude[:-1], self.longitude[:-1], self.latitude[1:], self.longitude[1:])
+        return self._segments
+
+    def distance_km(self) -> float:
+        return float(self.segment_km().sum()) if len(self) > 1 else 0.0
+
+    def energy_per_km(self, capacity_kwh: float) -> Optional[float]:
+        """kWh per km while moving, from the battery percentage used on segments that covered distance."""
+        if len(self) < 2:
+            return None
+        segments = self.segment_km()
+        used = -np.diff(self.battery_level.astype(np.float64))
+        moving = (segments >= STATIONARY_KM) & ~np.isnan(used)
+        distance = segments[moving].sum()
+        if distance <= 0:
+            return None
+        return float(np.clip(used[moving], 0.0, None).sum() * capacity_kwh / 100 / distance)
+
+    def idle_drain(self) -> Optional[float]:
+        """Battery percent lost per hour while parked; segments that gained charge are ignored."""
+        if len(self) < 2:
+            return None
+        used = -np.diff(self.battery_level.astype(np.float64))
+        hours = np.diff(self.timestamp) / 3600
+        parked = (self.segment_km() < STATIONARY_KM) & ~np.isnan(used) & (used >= 0) & (hours > 0)
+        total_hours = hours[parked].sum()
+        if total_hours <= 0:
+            return None
+        return float(used[parked].sum() / total_hours)
+
+    def resample(self, interval: int) -> "TelemetrySeries":
+        """Averages the samples in fixed buckets of interval seconds; empty buckets are dropped."""
+        if interval <= 0:
+            raise ValueError(f"Resample interval must be positive, got {interval}")
+        if len(self) == 0:
+            return self
+
+        buckets = self.timestamp // interval
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        counts = np.diff(np.r_[starts, len(self)])
+
+        def mean(column: np.ndarray) -> np.ndarray:
+            present = ~np.isnan(column)
+            totals = np.add.reduceat(np.where(present, column, 0.0).astype(np.float64), starts)
+            samples = np.add.reduceat(present.astype(np.int64), starts)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                return np.where(samples > 0, totals / np.maximum(samples, 1), np.nan)
+
+        return TelemetrySeries(
+            buckets[starts] * interval,
+            np.add.reduceat(self.latitude, starts) / counts,
+            np.add.reduceat(self.longitude, starts) / counts,
+            mean(self.battery_level),
+            mean(self.battery_range),
+        )
+
+
+def energy_report(series: TelemetrySeries, capacity_kwh: float) -> EnergyReport:
+    return EnergyReport(
+        points=len(series),
+        distance_km=series.distance_km(),
+        kwh_per_km=series.energy_per_km(capacity_kwh),
+        idle_drain_per_hour=series.idle_drain(),
+    )
+
+
+class SeriesBuilder:
+    """Appends raw path records into compact typed buffers without creating a model per sample."""
+
+    _timestamp: array
+    _latitude: array
+    _longitude: array
+    _battery_level: array
+    _battery_range: array
+
+    def __init__(self) -> None:
+        self._timestamp = array("q")
+        self._latitude = array("d")
+        self._longitude = array("d")
+        self._battery_level = array("f")
+        self._battery_range = array("f")
+
+    def append(self, record: dict) -> None:
+        battery_level = record.get("battery_level")
+        battery_range = record.get("battery_range")
+        self._timestamp.append(int(record["timestamp"]))
+        self._latitude.append(float(record["latitude"]))
+        self._longitude.append(float(record["longitude"]))
+        self._battery_level.append(math.nan if battery_level is None else float(battery_level))
+        self._battery_range.append(math.nan if battery_range is None else float(battery_range))
+
+    def __len__(self) -> int:
+        return len(self._timestamp)
+
+    def build(self) -> TelemetrySeries:
+        return TelemetrySeries(
+            np.array(self._timestamp, dtype=np.int64),
+            np.array(self._latitude, dtype=np.float64),
+            np.array(self._longitude, dtype=np.float64),
+            np.array(self._battery_level, dtype=np.float32),
+            np.array(self._battery_range, dtype=np.float32),
+        )
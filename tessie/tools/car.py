@@ -1,45 +1,141 @@
 import httpx
-from typing import Annotated
+from typing import Annotated, Any, Callable, Optional
 
 from arcade_tdk import ToolContext, tool
+from pydantic import BaseModel
 from tessie import utils
 
-from ..tessie_client import TessieClient
-from arcade_tdk.errors import ToolExecutionError
+from ..model import VEHICLE_DATA_ENDPOINTS, VehicleSnapshot
+from ..deadline import Deadline, DeadlineExceeded, READ_TIMEOUT_HINT
+from ..instrumentation import instrumented
+from ..registry import default_clients
+from ..tessie_client import battery_from, battery_v2_from, location_from, location_v2_from
+from arcade_tdk.errors import RetryableToolError, ToolExecutionError
 
 
-@tool(requires_secrets=["TESSIE_TOKEN"])
-async def get_location(vin: Annotated[str, "The VIN of the car for which the invite should be revoked."],
-                      context: ToolContext) -> dict[str, str]:
-    """Returns the current location of the car with the given VIN."""
+async def _project(vin: str,
+                   context: ToolContext,
+                   section: str,
+                   build: Callable[[Any, VehicleSnapshot], BaseModel],
+                   what: str,
+                   max_age: Optional[int],
+                   force_refresh: bool,
+                   deadline: Optional[float],
+                   stale_while_revalidate: bool,
+                   allow_wake: bool) -> dict[str, Any]:
     utils.validate_vin(vin)
-    client = TessieClient(context.get_secret("TESSIE_TOKEN"))
+    budget = Deadline.start(deadline)
+    client = await default_clients.get(context.get_secret("TESSIE_TOKEN"))
 
     try:
-        location = await client.get_location(vin)
-        return location.model_dump()
+        model = await client.project(vin, section, build, max_age, force_refresh, budget, stale_while_revalidate, allow_wake)
+        return model.model_dump(mode="json", exclude_none=True)
+    except DeadlineExceeded as exc:
+        raise RetryableToolError(
+            message=f"Timed out getting {what} for VIN {vin}",
+            developer_message=(
+                f"Deadline exceeded while getting {what} for VIN {vin}: {exc}"
+            ),
+            additional_prompt_content=READ_TIMEOUT_HINT
+        )
     except httpx.HTTPError as exc:
         raise ToolExecutionError(
-            message=f"Failed to get location for VIN {vin}",
+            message=f"Failed to get {what} for VIN {vin}",
             developer_message=(
-                f"Error occurred while getting location for VIN {vin}: {exc}"
+                f"Error occurred while getting {what} for VIN {vin}: {exc}"
             )
         )
 
+
+@tool(requires_secrets=["TESSIE_TOKEN"])
+@instrumented
+async def get_location(vin: Annotated[str, "The VIN of the car for which the invite should be revoked."],
+                      context: ToolContext,
+                      max_age: Annotated[Optional[int], "Maximum age in seconds of a cached value that is acceptable."] = None,
+                      force_refresh: Annotated[bool, "Bypass the cache and fetch fresh data."] = False,
+                      deadline: Annotated[Optional[float], "Maximum number of seconds to wait for the Tessie API."] = None,
+                      stale_while_revalidate: Annotated[bool, "Return an expired cached value immediately and refresh it in the background."] = False,
+                      allow_wake: Annotated[bool, "Allow waking the car for live data. If false and the car is asleep, its last known state is returned."] = True) -> dict[str, Any]:
+    """Returns the current location of the car with the given VIN."""
+    return await _project(vin, context, "drive_state", location_from, "location",
+                          max_age, force_refresh, deadline, stale_while_revalidate, allow_wake)
+
 @tool(requires_secrets=["TESSIE_TOKEN"])
+@instrumented
 async def get_battery(vin: Annotated[str, "The VIN of the car for which the invite should be revoked."],
-                context: ToolContext) -> dict[str, str]:
+                context: ToolContext,
+                max_age: Annotated[Optional[int], "Maximum age in seconds of a cached value that is acceptable."] = None,
+                force_refresh: Annotated[bool, "Bypass the cache and fetch fresh data."] = False,
+                deadline: Annotated[Optional[float], "Maximum number of seconds to wait for the Tessie API."] = None,
+                stale_while_revalidate: Annotated[bool, "Return an expired cached value immediately and refresh it in the background."] = False,
+                allow_wake: Annotated[bool, "Allow waking the car for live data. If false and the car is asleep, its last known state is returned."] = True) -> dict[str, Any]:
     """Returns the battery level of the car with the given VIN."""
+    return await _project(vin, context, "charge_state", battery_from, "battery level",
+                          max_age, force_refresh, deadline, stale_while_revalidate, allow_wake)
+
+@tool(requires_secrets=["TESSIE_TOKEN"])
+@instrumented
+async def get_vehicle_snapshot(vin: Annotated[str, "The VIN of the car for which the state should be retrieved."],
+                               context: ToolContext,
+                               endpoints: Annotated[
+                                   Optional[list[str]],
+                                   "State sections to fetch: drive_state, charge_state, climate_state, vehicle_state. "
+                                   "Defaults to all of them."
+                               ] = None,
+                               max_age: Annotated[Optional[int], "Maximum age in seconds of a cached value that is acceptable."] = None,
+                               force_refresh: Annotated[bool, "Bypass the cache and fetch fresh data."] = False,
+                               deadline: Annotated[Optional[float], "Maximum number of seconds to wait for the Tessie API."] = None,
+                               stale_while_revalidate: Annotated[bool, "Return an expired cached value immediately and refresh it in the background."] = False,
+                               allow_wake: Annotated[bool, "Allow waking the car for live data. If false and the car is asleep, its last known state is returned."] = True) -> dict[str, Any]:
+    """Returns location, battery, climate and vehicle state of the car with the given VIN in a single request."""
     utils.validate_vin(vin)
-    client = TessieClient(context.get_secret("TESSIE_TOKEN"))
+    endpoints = endpoints or list(VEHICLE_DATA_ENDPOINTS)
+    utils.validate_endpoints(endpoints)
+    budget = Deadline.start(deadline)
+    client = await default_clients.get(context.get_secret("TESSIE_TOKEN"))
 
     try:
-        battery = await client.get_battery_level(vin)
-        return battery.model_dump()
+        snapshot = await client.get_vehicle_data(vin, endpoints, max_age, force_refresh, budget, stale_while_revalidate, allow_wake)
+        return snapshot.model_dump(mode="json", exclude_none=True)
+    except DeadlineExceeded as exc:
+        raise RetryableToolError(
+            message=f"Timed out getting vehicle state for VIN {vin}",
+            developer_message=(
+                f"Deadline exceeded while getting vehicle state for VIN {vin}: {exc}"
+            ),
+            additional_prompt_content=READ_TIMEOUT_HINT
+        )
     except httpx.HTTPError as exc:
         raise ToolExecutionError(
-            message=f"Failed to get battery level for VIN {vin}",
+            message=f"Failed to get vehicle state for VIN {vin}",
             developer_message=(
-                f"Error occurred while getting battery level for VIN {vin}: {exc}"
+                f"Error occurred while getting vehicle state for VIN {vin}: {exc}"
             )
-        )
\ No newline at end of file
+        )
+
+@tool(requires_secrets=["TESSIE_TOKEN"])
+@instrumented
+async def get_location_v2(vin: Annotated[str, "The VIN of the car for which the location should be retrieved."],
+                          context: ToolContext,
+                          max_age: Annotated[Optional[int], "Maximum age in seconds of a cached value that is acceptable."] = None,
+                          force_refresh: Annotated[bool, "Bypass the cache and fetch fresh data."] = False,
+                          deadline: Annotated[Optional[float], "Maximum number of seconds to wait for the Tessie API."] = None,
+                          stale_while_revalidate: Annotated[bool, "Return an expired cached value immediately and refresh it in the background."] = False,
+                          allow_wake: Annotated[bool, "Allow waking the car for live data. If false and the car is asleep, its last known state is returned."] = True) -> dict[str, Any]:
+    """Returns the current location of the car with the given VIN as numeric latitude and longitude."""
+    return await _project(vin, context, "drive_state", location_v2_from, "location",
+                          max_age, force_refresh, deadline, stale_while_revalidate, allow_wake)
+
+@tool(requires_secrets=["TESSIE_TOKEN"])
+@instrumented
+async def get_battery_v2(vin: Annotated[str, "The VIN of the car for which the battery level should be retrieved."],
+                         context: ToolContext,
+                         max_age: Annotated[Optional[int], "Maximum age in seconds of a cached value that is acceptable."] = None,
+                         force_refresh: Annotated[bool, "Bypass the cache and fetch fresh data."] = False,
+                         deadline: Annotated[Optional[float], "Maximum number of seconds to wait for the Tessie API."] = None,
+                         stale_while_revalidate: Annotated[bool, "Return an expired cached value immediately and refresh it in the background."] = False,
+                         allow_wake: Annotated[bool, "Allow waking the car for live data. If false and the car is asleep, its last known state is returned."] = True) -> dict[str, Any]:
+    """Returns the battery level (percent) and range of the car with the given VIN as numbers."""
+    return await _project(vin, context, "charge_state", battery_v2_from, "battery level",
+                          max_age, force_refresh, deadline, stale_while_revalidate, allow_wake)
+
@@ -1,23 +1,61 @@
 import httpx
-from typing import Annotated
+from typing import Annotated, Any, Optional
 
 from arcade_tdk import ToolContext, tool
 from tessie import utils
 
+from ..archive import default_archive
+from ..deadline import Deadline, DeadlineExceeded, READ_TIMEOUT_HINT, WRITE_TIMEOUT_HINT
+from ..instrumentation import instrumented
+from ..model import DriverList
+from ..registry import default_clients
+from ..retry import DEFAULT_RETRY_POLICY
 from ..tessie_client import TessieClient
-from arcade_tdk.errors import ToolExecutionError
+from arcade_tdk.errors import RetryableToolError, ToolExecutionError
+
+
+async def _drivers(client: TessieClient,
+                   vin: str,
+                   max_age: Optional[int],
+                   force_refresh: bool,
+                   deadline: Optional[Deadline]) -> DriverList:
+    # While the API is unreachable, e.g. right after a restart, fall back to the list the
+    # poller last saved in the local archive.
+    try:
+        return await client.list_driver(vin, max_age, force_refresh, deadline)
+    except httpx.HTTPError as exc:
+        archive = default_archive()
+        if archive is None or not DEFAULT_RETRY_POLICY.transient(exc):
+            raise
+        archived = await archive.drivers(client.token_key, vin)
+        if archived is None:
+            raise
+        return archived.model_copy(update={"stale": True})
 
 
 @tool(requires_secrets=["TESSIE_TOKEN"])
+@instrumented
 async def list_driver(vin: Annotated[str, "The VIN of the car for which the drivers should be retrieved."],
-                      context: ToolContext) -> dict[str, list[dict[str, str]]]:
+                      context: ToolContext,
+                      max_age: Annotated[Optional[int], "Maximum age in seconds of a cached value that is acceptable."] = None,
+                      force_refresh: Annotated[bool, "Bypass the cache and fetch fresh data."] = False,
+                      deadline: Annotated[Optional[float], "Maximum number of seconds to wait for the Tessie API."] = None) -> dict[str, Any]:
     """Returns a list of drivers for a car with the given VIN."""
     utils.validate_vin(vin)
-    client = TessieClient(context.get_secret("TESSIE_TOKEN"))
+    budget = Deadline.start(deadline)
+    client = await default_clients.get(context.get_secret("TESSIE_TOKEN"))
 
     try:
-        drivers = await client.list_driver(vin)
-        return drivers.model_dump()
+        drivers = await _drivers(client, vin, max_age, force_refresh, budget)
+        return drivers.model_dump(exclude_none=True)
+    except DeadlineExceeded as exc:
+        raise RetryableToolError(
+            message=f"Timed out listing drivers for VIN {vin}",
+            developer_message=(
+                f"Deadline exceeded while listing drivers for VIN {vin}: {exc}"
+            ),
+            additional_prompt_content=READ_TIMEOUT_HINT
+        )
     except httpx.HTTPError as exc:
         raise ToolExecutionError(
             message=f"Failed to list drivers for VIN {vin}",
@@ -27,16 +65,27 @@ async def list_driver(vin: Annotated[str, "The VIN of the car for which the driv
         )
 
 @tool(requires_secrets=["TESSIE_TOKEN"])
+@instrumented
 async def delete_driver(vin: Annotated[str, "VIN of the car for which the driver should be removed."],
                 user_id: Annotated[str, "User ID."],
-                context: ToolContext) -> dict[str, bool]:
+                context: ToolContext,
+                deadline: Annotated[Optional[float], "Maximum number of seconds to wait for the Tessie API."] = None) -> dict[str, bool]:
     """Removes a driver's access to a Tesla vehicle by removing access to the car."""
     utils.validate_vin(vin)
-    client = TessieClient(context.get_secret("TESSIE_TOKEN"))
+    budget = Deadline.start(deadline)
+    client = await default_clients.get(context.get_secret("TESSIE_TOKEN"))
 
     try:
-        result = await client.delete_driver(vin, user_id)
+        result = await client.delete_driver(vin, user_id, budget)
         return result.model_dump()
+    except DeadlineExceeded as exc:
+        raise RetryableToolError(
+            message=f"Timed out deleting driver for VIN {vin}",
+            developer_message=(
+                f"Deadline exceeded while deleting driver for VIN {vin}: {exc}"
+            ),
+            additional_prompt_content=WRITE_TIMEOUT_HINT
+        )
     except httpx.HTTPError as exc:
         raise ToolExecutionError(
             message=f"Failed to delete driver for VIN {vin}",
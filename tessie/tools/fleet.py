@@ -0,0 +1,135 @@
+import asyncio
+import time
+import httpx
+from typing import Annotated, Any, Awaitable, Callable
+
+from arcade_tdk import ToolContext, tool
+from pydantic import BaseModel
+from tessie import utils
+
+from ..model import EnergyReport, FleetSnapshot, FleetVehicle
+from ..instrumentation import instrumented
+from ..registry import default_clients
+from ..tessie_client import battery_from, location_from
+from ..timeseries import energy_report
+from .history import DEFAULT_BATTERY_CAPACITY_KWH, path_series
+from arcade_tdk.errors import ToolExecutionError
+
+FLEET_CONCURRENCY = 10
+
+
+async def _fan_out(vins: list[str],
+                   fetch: Callable[[str], Awaitable[BaseModel]],
+                   concurrency: int = FLEET_CONCURRENCY) -> dict[str, Any]:
+    """Runs fetch for every VIN with bounded concurrency, collecting per-VIN errors instead of failing."""
+    if not vins:
+        raise ToolExecutionError(
+            message="At least one VIN is required",
+            developer_message="The vins parameter is empty"
+        )
+
+    semaphore = asyncio.Semaphore(concurrency)
+    vehicles: dict[str, Any] = {}
+    errors: dict[str, str] = {}
+
+    async def run(vin: str) -> None:
+        try:
+            utils.validate_vin(vin)
+            async with semaphore:
+                vehicles[vin] = (await fetch(vin)).model_dump(mode="json", exclude_none=True)
+        except ToolExecutionError as exc:
+            errors[vin] = exc.message
+        except (httpx.HTTPError, KeyError, ValueError) as exc:
+            errors[vin] = str(exc) or type(exc).__name__
+
+    unique_vins = sorted(set(vins))
+    await asyncio.gather(*[run(vin) for vin in unique_vins])
+
+    return {
+        "vehicles": {vin: vehicles[vin] for vin in unique_vins if vin in vehicles},
+        "errors": {vin: errors[vin] for vin in unique_vins if vin in errors},
+    }
+
+
+@tool(requires_secrets=["TESSIE_TOKEN"])
+@instrumented
+async def get_fleet_battery(vins: Annotated[list[str], "The VINs of the cars for which the battery level should be retrieved."],
+                            context: ToolContext) -> dict[str, Any]:
+    """Returns the battery level of every car with the given VINs, plus an error message for each VIN that failed."""
+    client = await default_clients.get(context.get_secret("TESSIE_TOKEN"))
+    return await _fan_out(vins, client.get_battery_level)
+
+
+@tool(requires_secrets=["TESSIE_TOKEN"])
+@instrumented
+async def get_fleet_location(vins: Annotated[list[str], "The VINs of the cars for which the location should be retrieved."],
+                             context: ToolContext) -> dict[str, Any]:
+    """Returns the current location of every car with the given VINs, plus an error message for each VIN that failed."""
+    client = await default_clients.get(context.get_secret("TESSIE_TOKEN"))
+    return await _fan_out(vins, client.get_location)
+
+
+@tool(requires_secrets=["TESSIE_TOKEN"])
+@instrumented
+async def get_fleet_battery_v2(vins: Annotated[list[str], "The VINs of the cars for which the battery level should be retrieved."],
+                               context: ToolContext) -> dict[str, Any]:
+    """Returns the numeric battery level and range of every car with the given VINs, plus an error message for each VIN that failed."""
+    client = await default_clients.get(context.get_secret("TESSIE_TOKEN"))
+    return await _fan_out(vins, client.get_battery_level_v2)
+
+
+@tool(requires_secrets=["TESSIE_TOKEN"])
+@instrumented
+async def get_fleet_location_v2(vins: Annotated[list[str], "The VINs of the cars for which the location should be retrieved."],
+                                context: ToolContext) -> dict[str, Any]:
+    """Returns the numeric latitude and longitude of every car with the given VINs, plus an error message for each VIN that failed."""
+    client = await default_clients.get(context.get_secret("TESSIE_TOKEN"))
+    return await _fan_out(vins, client.get_location_v2)
+
+
+@tool(requires_secrets=["TESSIE_TOKEN"])
+@instrumented
+async def get_fleet_energy_report(vins: Annotated[list[str], "The VINs of the cars whose energy use should be analyzed."],
+                                  context: ToolContext,
+                                  days: Annotated[int, "Number of days of history to analyze, ending now."] = 7,
+                                  battery_capacity_kwh: Annotated[float, "Usable battery capacity of each car in kWh."] = DEFAULT_BATTERY_CAPACITY_KWH
+                                  ) -> dict[str, Any]:
+    """Returns distance, energy used per km and idle drain per hour for every car with the given VINs."""
+    utils.validate_days(days)
+    client = await default_clients.get(context.get_secret("TESSIE_TOKEN"))
+    end = int(time.time())
+
+    async def fetch(vin: str) -> EnergyReport:
+        return energy_report(await path_series(client, vin, end - days * 86400, end), battery_capacity_kwh)
+
+    return await _fan_out(vins, fetch)
+
+
+@tool(requires_secrets=["TESSIE_TOKEN"])
+@instrumented
+async def get_fleet_snapshot(context: ToolContext,
+                             only_active: Annotated[bool, "Only include vehicles that are active in Tessie."] = False
+                             ) -> dict[str, Any]:
+    """Returns the last known location and battery level of every car on the account, keyed by VIN."""
+    client = await default_clients.get(context.get_secret("TESSIE_TOKEN"))
+
+    try:
+        vehicles = await client.list_vehicles(only_active)
+    except httpx.HTTPError as exc:
+        raise ToolExecutionError(
+            message="Failed to list vehicles",
+            developer_message=(
+                f"Error occurred while listing vehicles: {exc}"
+            )
+        )
+
+    snapshot = FleetSnapshot(
+        vehicles={
+            vehicle.vin: FleetVehicle(
+                location=location_from(vehicle.drive_state) if vehicle.drive_state else None,
+                battery=battery_from(vehicle.charge_state) if vehicle.charge_state else None,
+            )
+            for vehicle in sorted(vehicles.vehicles, key=lambda vehicle: vehicle.vin)
+        }
+    )
+    return snapshot.model_dump(mode="json", exclude_none=True)
@@ -0,0 +1,116 @@
+import httpx
+from typing import Annotated, Any, Optional
+
+from arcade_tdk import ToolContext, tool
+from pydantic import ValidationError
+
+from ..geo import FleetGeo, Geofence, default_geo
+from ..instrumentation import instrumented
+from ..registry import default_clients
+from ..tessie_client import TessieClient
+from arcade_tdk.errors import ToolExecutionError
+
+
+async def _refresh(client: TessieClient) -> FleetGeo:
+    """Moves every car of the account to its last known position with a single bulk request.
+
+    Positions younger than the account's positions_ttl are reused instead of downloading the fleet again.
+    """
+    geo = default_geo.get(client.token_key)
+    if geo.fresh:
+        return geo
+    try:
+        vehicles = await client.list_vehicles()
+    except httpx.HTTPError as exc:
+        raise ToolExecutionError(
+            message="Failed to get vehicle locations",
+            developer_message=(
+                f"Error occurred while listing vehicles: {exc}"
+            )
+        )
+
+    for vehicle in vehicles.vehicles:
+        if vehicle.drive_state is not None:
+            geo.update(vehicle.vin, vehicle.drive_state.latitude, vehicle.drive_state.longitude)
+    geo.mark_refreshed()
+    return geo
+
+
+def _geofence(**fields: Any) -> Geofence:
+    try:
+        return Geofence(**fields)
+    except ValidationError as exc:
+        raise ToolExecutionError(
+            message="Invalid geofence",
+            developer_message=f"Could not build geofence from {fields}: {exc}"
+        )
+
+
+@tool(requires_secrets=["TESSIE_TOKEN"])
+@instrumented
+async def find_vehicles_near(latitude: Annotated[float, "Latitude of the center point."],
+                             longitude: Annotated[float, "Longitude of the center point."],
+                             radius_km: Annotated[float, "Search radius in kilometers."],
+                             context: ToolContext) -> dict[str, Any]:
+    """Returns the cars within radius_km of the given point, nearest first."""
+    geo = await _refresh(await default_clients.get(context.get_secret("TESSIE_TOKEN")))
+    neighbors = geo.index.within_radius(latitude, longitude, radius_km)
+    return {"vehicles": [neighbor.model_dump(mode="json") for neighbor in neighbors]}
+
+
+@tool(requires_secrets=["TESSIE_TOKEN"])
+@instrumented
+async def find_nearest_vehicles(latitude: Annotated[float, "Latitude of the point."],
+                                longitude: Annotated[float, "Longitude of the point."],
+                                context: ToolContext,
+                                k: Annotated[int, "Number of cars to return."] = 5) -> dict[str, Any]:
+    """Returns the k cars closest to the given point, nearest first."""
+    geo = await _refresh(await default_clients.get(context.get_secret("TESSIE_TOKEN")))
+    neighbors = geo.index.nearest(latitude, longitude, k)
+    return {"vehicles": [neighbor.model_dump(mode="json") for neighbor in neighbors]}
+
+
+@tool(requires_secrets=["TESSIE_TOKEN"])
+@instrumented
+async def find_vehicles_in_area(polygon: Annotated[list[list[float]], "The corners of the area as [latitude, longitude] pairs."],
+                                context: ToolContext) -> dict[str, Any]:
+    """Returns the VINs of the cars inside the given polygon."""
+    fence = _geofence(name="area", polygon=polygon)
+    geo = await _refresh(await default_clients.get(context.get_secret("TESSIE_TOKEN")))
+    return {"vins": geo.index.within(fence)}
+
+
+@tool(requires_secrets=["TESSIE_TOKEN"])
+@instrumented
+async def add_geofence(name: Annotated[str, "Name of the geofence; an existing geofence with this name is replaced."],
+                       context: ToolContext,
+                       latitude: Annotated[Optional[float], "Latitude of the center of a circular geofence."] = None,
+                       longitude: Annotated[Optional[float], "Longitude of the center of a circular geofence."] = None,
+                       radius_km: Annotated[Optional[float], "Radius of a circular geofence in kilometers."] = None,
+                       polygon: Annotated[Optional[list[list[float]]], "The corners of a polygon geofence as [latitude, longitude] pairs."] = None
+                       ) -> dict[str, Any]:
+    """Adds a circular or polygon geofence and returns the VINs of the cars currently inside it."""
+    fence = _geofence(name=name, latitude=latitude, longitude=longitude, radius_km=radius_km, polygon=polygon)
+    geo = await _refresh(await default_clients.get(context.get_secret("TESSIE_TOKEN")))
+    geo.add_fence(fence)
+    return {"geofence": fence.model_dump(mode="json", exclude_none=True), "inside": geo.inside(name)}
+
+
+@tool(requires_secrets=["TESSIE_TOKEN"])
+@instrumented
+async def remove_geofence(name: Annotated[str, "Name of the geofence to remove."],
+                          context: ToolContext) -> dict[str, Any]:
+    """Removes the geofence with the given name."""
+    client = await default_clients.get(context.get_secret("TESSIE_TOKEN"))
+    return {"success": default_geo.get(client.token_key).remove_fence(name)}
+
+
+@tool(requires_secrets=["TESSIE_TOKEN"])
+@instrumented
+async def check_geofences(context: ToolContext) -> dict[str, Any]:
+    """Returns the geofence enter and exit events since the last check and the cars inside each geofence."""
+    geo = await _refresh(await default_clients.get(context.get_secret("TESSIE_TOKEN")))
+    return {
+        "events": [event.model_dump(mode="json") for event in geo.drain_events()],
+        "inside": {fence.name: geo.inside(fence.name) for fence in geo.fences},
+    }
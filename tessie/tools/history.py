@@ -0,0 +1,192 @@
+import time
+import httpx
+from typing import Annotated, Any, AsyncIterator
+
+from arcade_tdk import ToolContext, tool
+from tessie import utils
+
+from ..archive import default_archive
+from ..deadline import DeadlineExceeded
+from ..history import summarize_charges, summarize_drives, summarize_path
+from ..model import Charge, Drive, PathPoint
+from ..instrumentation import instrumented
+from ..registry import default_clients
+from ..tessie_client import TessieClient
+from ..timeseries import TelemetrySeries, energy_report
+from arcade_tdk.errors import RetryableToolError, ToolExecutionError
+
+DEFAULT_BATTERY_CAPACITY_KWH = 75.0
+
+
+# History is read from the local archive when one is configured, after syncing the
+# requested range into it; otherwise it is streamed from the Tessie API.
+
+async def _drives(client: TessieClient, vin: str, start: int, end: int) -> AsyncIterator[Drive]:
+    archive = default_archive()
+    if archive is None:
+        async for drive in client.iter_drives(vin, start, end):
+            yield drive
+        return
+
+    await archive.sync_drives(client, vin, start, end)
+    async for drive in archive.iter_drives(client.token_key, vin, start, end):
+        yield drive
+
+
+async def _charges(client: TessieClient, vin: str, start: int, end: int) -> AsyncIterator[Charge]:
+    archive = default_archive()
+    if archive is None:
+        async for charge in client.iter_charges(vin, start, end):
+            yield charge
+        return
+
+    await archive.sync_charges(client, vin, start, end)
+    async for charge in archive.iter_charges(client.token_key, vin, start, end):
+        yield charge
+
+
+async def _path(client: TessieClient, vin: str, start: int, end: int) -> AsyncIterator[PathPoint]:
+    archive = default_archive()
+    if archive is None:
+        async for point in client.iter_path(vin, start, end):
+            yield point
+        return
+
+    await archive.sync_path(client, vin, start, end)
+    async for point in archive.iter_path(client.token_key, vin, start, end):
+        yield point
+
+
+async def path_series(client: TessieClient, vin: str, start: int, end: int) -> TelemetrySeries:
+    archive = default_archive()
+    if archive is None:
+        return await client.path_series(vin, start, end)
+
+    await archive.sync_path(client, vin, start, end)
+    return await archive.path_series(client.token_key, vin, start, end)
+
+
+@tool(requires_secrets=["TESSIE_TOKEN"])
+@instrumented
+async def get_drive_summary(vin: Annotated[str, "The VIN of the car for which the drives should be summarized."],
+                            context: ToolContext,
+                            days: Annotated[int, "Number of days of history to summarize, ending now."] = 7) -> dict[str, Any]:
+    """Returns the number of drives, distance, energy used and efficiency of the car with the given VIN."""
+    utils.validate_vin(vin)
+    utils.validate_days(days)
+    client = await default_clients.get(context.get_secret("TESSIE_TOKEN"))
+    end = int(time.time())
+
+    try:
+        summary = await summarize_drives(_drives(client, vin, end - days * 86400, end))
+        return summary.model_dump(mode="json", exclude_none=True)
+    except DeadlineExceeded as exc:
+        raise RetryableToolError(
+            message=f"Timed out getting drives for VIN {vin}",
+            developer_message=(
+                f"Deadline exceeded while getting drives for VIN {vin}: {exc}"
+            ),
+            additional_prompt_content="Retry with fewer days of history."
+        )
+    except httpx.HTTPError as exc:
+        raise ToolExecutionError(
+            message=f"Failed to get drives for VIN {vin}",
+            developer_message=(
+                f"Error occurred while getting drives for VIN {vin}: {exc}"
+            )
+        )
+
+
+@tool(requires_secrets=["TESSIE_TOKEN"])
+@instrumented
+async def get_charging_summary(vin: Annotated[str, "The VIN of the car for which the charging sessions should be summarized."],
+                               context: ToolContext,
+                               days: Annotated[int, "Number of days of history to summarize, ending now."] = 30) -> dict[str, Any]:
+    """Returns the number of charging sessions, energy added and cost of the car with the given VIN."""
+    utils.validate_vin(vin)
+    utils.validate_days(days)
+    client = await default_clients.get(context.get_secret("TESSIE_TOKEN"))
+    end = int(time.time())
+
+    try:
+        summary = await summarize_charges(_charges(client, vin, end - days * 86400, end))
+        return summary.model_dump(mode="json", exclude_none=True)
+    except DeadlineExceeded as exc:
+        raise RetryableToolError(
+            message=f"Timed out getting charging sessions for VIN {vin}",
+            developer_message=(
+                f"Deadline exceeded while getting charging sessions for VIN {vin}: {exc}"
+            ),
+            additional_prompt_content="Retry with fewer days of history."
+        )
+    except httpx.HTTPError as exc:
+        raise ToolExecutionError(
+            message=f"Failed to get charging sessions for VIN {vin}",
+            developer_message=(
+                f"Error occurred while getting charging sessions for VIN {vin}: {exc}"
+            )
+        )
+
+
+@tool(requires_secrets=["TESSIE_TOKEN"])
+@instrumented
+async def get_distance_traveled(vin: Annotated[str, "The VIN of the car for which the distance should be calculated."],
+                                context: ToolContext,
+                                days: Annotated[int, "Number of days of history to include, ending now."] = 1) -> dict[str, Any]:
+    """Returns the distance the car with the given VIN traveled along its recorded path, and the battery it used."""
+    utils.validate_vin(vin)
+    utils.validate_days(days)
+    client = await default_clients.get(context.get_secret("TESSIE_TOKEN"))
+    end = int(time.time())
+
+    try:
+        summary = await summarize_path(_path(client, vin, end - days * 86400, end))
+        return summary.model_dump(mode="json", exclude_none=True)
+    except DeadlineExceeded as exc:
+        raise RetryableToolError(
+            message=f"Timed out getting the path for VIN {vin}",
+            developer_message=(
+                f"Deadline exceeded while getting the path for VIN {vin}: {exc}"
+            ),
+            additional_prompt_content="Retry with fewer days of history."
+        )
+    except httpx.HTTPError as exc:
+        raise ToolExecutionError(
+            message=f"Failed to get the path for VIN {vin}",
+            developer_message=(
+                f"Error occurred while getting the path for VIN {vin}: {exc}"
+            )
+        )
+
+
+@tool(requires_secrets=["TESSIE_TOKEN"])
+@instrumented
+async def get_energy_report(vin: Annotated[str, "The VIN of the car for which the energy use should be analyzed."],
+                            context: ToolContext,
+                            days: Annotated[int, "Number of days of history to analyze, ending now."] = 7,
+                            battery_capacity_kwh: Annotated[float, "Usable battery capacity of the car in kWh."] = DEFAULT_BATTERY_CAPACITY_KWH
+                            ) -> dict[str, Any]:
+    """Returns the distance, energy used per km while driving and battery drain per hour while parked of the car with the given VIN."""
+    utils.validate_vin(vin)
+    utils.validate_days(days)
+    client = await default_clients.get(context.get_secret("TESSIE_TOKEN"))
+    end = int(time.time())
+
+    try:
+        series = await path_series(client, vin, end - days * 86400, end)
+        return energy_report(series, battery_capacity_kwh).model_dump(mode="json", exclude_none=True)
+    except DeadlineExceeded as exc:
+        raise RetryableToolError(
+            message=f"Timed out getting the path for VIN {vin}",
+            developer_message=(
+                f"Deadline exceeded while getting the path for VIN {vin}: {exc}"
+            ),
+            additional_prompt_content="Retry with fewer days of history."
+        )
+    except httpx.HTTPError as exc:
+        raise ToolExecutionError(
+            message=f"Failed to get the path for VIN {vin}",
+            developer_message=(
+                f"Error occurred while getting the path for VIN {vin}: {exc}"
+            )
+        )
@@ -1,23 +1,61 @@
 import httpx
-from typing import Annotated, Dict, List
+from typing import Annotated, Any, Dict, List, Optional
 
 from arcade_tdk import ToolContext, tool
 from tessie import utils
 
+from ..archive import default_archive
+from ..deadline import Deadline, DeadlineExceeded, READ_TIMEOUT_HINT, WRITE_TIMEOUT_HINT
+from ..instrumentation import instrumented
+from ..model import InvitationList
+from ..registry import default_clients
+from ..retry import DEFAULT_RETRY_POLICY
 from ..tessie_client import TessieClient
-from arcade_tdk.errors import ToolExecutionError
+from arcade_tdk.errors import RetryableToolError, ToolExecutionError
+
+
+async def _invitations(client: TessieClient,
+                       vin: str,
+                       max_age: Optional[int],
+                       force_refresh: bool,
+                       deadline: Optional[Deadline]) -> InvitationList:
+    # While the API is unreachable, e.g. right after a restart, fall back to the list the
+    # poller last saved in the local archive.
+    try:
+        return await client.list_invitations(vin, max_age, force_refresh, deadline)
+    except httpx.HTTPError as exc:
+        archive = default_archive()
+        if archive is None or not DEFAULT_RETRY_POLICY.transient(exc):
+            raise
+        archived = await archive.invitations(client.token_key, vin)
+        if archived is None:
+            raise
+        return archived.model_copy(update={"stale": True})
 
 
 @tool(requires_secrets=["TESSIE_TOKEN"])
+@instrumented
 async def list_invitation(vin: Annotated[str, "The VIN of the car for which the invite should be created."],
-                    context: ToolContext) -> dict[str, list[dict[str, str]]]:
+                    context: ToolContext,
+                    max_age: Annotated[Optional[int], "Maximum age in seconds of a cached value that is acceptable."] = None,
+                    force_refresh: Annotated[bool, "Bypass the cache and fetch fresh data."] = False,
+                    deadline: Annotated[Optional[float], "Maximum number of seconds to wait for the Tessie API."] = None) -> dict[str, Any]:
     """Returns a list of invitations for a car with the given VIN."""
     utils.validate_vin(vin)
-    client =  TessieClient(context.get_secret("TESSIE_TOKEN"))
+    budget = Deadline.start(deadline)
+    client =  await default_clients.get(context.get_secret("TESSIE_TOKEN"))
 
     try:
-        invitations = await client.list_invitations(vin)
-        return invitations.model_dump()
+        invitations = await _invitations(client, vin, max_age, force_refresh, budget)
+        return invitations.model_dump(exclude_none=True)
+    except DeadlineExceeded as exc:
+        raise RetryableToolError(
+            message=f"Timed out listing invitations for VIN {vin}",
+            developer_message=(
+                f"Deadline exceeded while listing invitations for VIN {vin}: {exc}"
+            ),
+            additional_prompt_content=READ_TIMEOUT_HINT
+        )
     except httpx.HTTPError as exc:
         raise ToolExecutionError(
             message=f"Failed to list invitations for VIN {vin}",
@@ -28,15 +66,26 @@ async def list_invitation(vin: Annotated[str, "The VIN of the car for which the
 
 
 @tool(requires_secrets=["TESSIE_TOKEN"])
+@instrumented
 async def create_invitation(vin: Annotated[str, "The VIN of the car for which the invite should be created."],
-                      context: ToolContext) -> dict[str, str]:
+                      context: ToolContext,
+                      deadline: Annotated[Optional[float], "Maximum number of seconds to wait for the Tessie API."] = None) -> dict[str, str]:
     """Returns an invitation message for a car with the given VIN."""
     utils.validate_vin(vin)
-    client = TessieClient(context.get_secret("TESSIE_TOKEN"))
+    budget = Deadline.start(deadline)
+    client = await default_clients.get(context.get_secret("TESSIE_TOKEN"))
 
     try:
-        invitation = await client.create_invitation(vin)
+        invitation = await client.create_invitation(vin, budget)
         return invitation.model_dump()
+    except DeadlineExceeded as exc:
+        raise RetryableToolError(
+            message=f"Timed out creating invite for VIN {vin}",
+            developer_message=(
+                f"Deadline exceeded while creating invite for VIN {vin}: {exc}"
+            ),
+            additional_prompt_content=WRITE_TIMEOUT_HINT
+        )
     except httpx.HTTPError as exc:
         raise ToolExecutionError(
             message=f"Failed to create invite for VIN {vin}",
@@ -46,16 +95,27 @@ async def create_invitation(vin: Annotated[str, "The VIN of the car for which th
         )
 
 @tool(requires_secrets=["TESSIE_TOKEN"])
+@instrumented
 async def revoke_invitation(vin: Annotated[str, "The VIN of the car for which the invite should be revoked."],
                       invite_id: Annotated[str, "Previously generated invite ID."],
-                      context: ToolContext) -> dict[str, bool]:
+                      context: ToolContext,
+                      deadline: Annotated[Optional[float], "Maximum number of seconds to wait for the Tessie API."] = None) -> dict[str, bool]:
     """Revokes the invite for a car with the given VIN."""
     utils.validate_vin(vin)
-    client = TessieClient(context.get_secret("TESSIE_TOKEN"))
+    budget = Deadline.start(deadline)
+    client = await default_clients.get(context.get_secret("TESSIE_TOKEN"))
 
     try:
-        result = await client.revoke_invitation(vin, invite_id)
+        result = await client.revoke_invitation(vin, invite_id, budget)
         return result.model_dump()
+    except DeadlineExceeded as exc:
+        raise RetryableToolError(
+            message=f"Timed out revoking invite for VIN {vin}",
+            developer_message=(
+                f"Deadline exceeded while revoking invite for VIN {vin}: {exc}"
+            ),
+            additional_prompt_content=WRITE_TIMEOUT_HINT
+        )
     except httpx.HTTPError as exc:
         raise ToolExecutionError(
             message=f"Failed to revoking invite for VIN {vin}",
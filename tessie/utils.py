@@ -1,4 +1,7 @@
+from typing import Sequence
+
 from arcade_tdk.errors import ToolExecutionError
+from tessie.model import VEHICLE_DATA_ENDPOINTS
 
 
 def validate_vin(vin: str) -> bool:
@@ -15,4 +18,31 @@ def validate_vin(vin: str) -> bool:
             developer_message=f"Invalid VIN length: '{vin}'"
         )
     
-    return True
\ No newline at end of file
+    return True
+
+
+def validate_endpoints(endpoints: Sequence[str]) -> bool:
+    if not endpoints:
+        raise ToolExecutionError(
+            message="At least one vehicle data endpoint is required",
+            developer_message=f"Expected a subset of {', '.join(VEHICLE_DATA_ENDPOINTS)}"
+        )
+
+    unknown = [endpoint for endpoint in endpoints if endpoint not in VEHICLE_DATA_ENDPOINTS]
+    if unknown:
+        raise ToolExecutionError(
+            message=f"Unknown vehicle data endpoints: {', '.join(unknown)}",
+            developer_message=f"Expected a subset of {', '.join(VEHICLE_DATA_ENDPOINTS)}, got {list(endpoints)}"
+        )
+
+    return True
+
+
+def validate_days(days: int) -> bool:
+    if days < 1 or days > 366:
+        raise ToolExecutionError(
+            message=f"days must be between 1 and 366, got {days}",
+            developer_message=f"Invalid history range: {days} days"
+        )
+
+    return True
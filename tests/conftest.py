@@ -0,0 +1,30 @@
+import pytest_asyncio
+
+from tessie.archive import configure_archive
+from tessie.cache import default_cache
+from tessie.geo import default_geo
+from tessie.instrumentation import default_instrumentation
+from tessie.pool import default_pool
+from tessie.ratelimit import default_limiters
+from tessie.registry import default_clients
+from tessie.singleflight import default_refreshes, default_singleflight
+from tessie.store import default_store
+from tessie.tenancy import default_scheduler
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def reset_shared_state():
+    yield
+    await default_refreshes.drain()
+    await default_clients.clear()
+    default_refreshes.reset()
+    default_cache.clear()
+    default_store.clear()
+    default_singleflight.reset()
+    default_limiters.clear()
+    await default_pool.aclose()
+    configure_archive(None)
+    default_geo.clear()
+    default_scheduler.clear()
+    default_instrumentation.disable()
+    default_instrumentation.reset_metrics()
@@ -0,0 +1,162 @@
+import pytest
+from pytest_httpx import HTTPXMock
+
+from arcade_tdk import ToolContext, ToolSecretItem
+
+from tessie.archive import SYNC_OVERLAP, TelemetryArchive, configure_archive
+from tessie.model import Driver, DriverList
+from tessie.pool import token_fingerprint
+from tessie.tessie_client import TessieClient
+from tessie.tools import history
+from tessie.tools.history import get_drive_summary
+
+VIN = "5YJ3E1EA4KF555555"
+NOW = 1_700_000_000
+DAY = 86400
+KEY = token_fingerprint("TESSIE_TOKEN")
+DRIVES_URL = f"https://api.tessie.com/{VIN}/drives?distance_format=km&timezone=UTC"
+
+
+@pytest.fixture
+def mock_context():
+    context = ToolContext()
+    context.secrets = []
+    context.secrets.append(
+        ToolSecretItem(
+            key="TESSIE_TOKEN", value="TESSIE_TOKEN"
+        )
+    )
+    return context
+
+
+def drive(drive_id: int, started_at: int, distance: float = 10.0) -> dict:
+    return {"id": drive_id, "started_at": started_at, "ended_at": started_at + 600,
+            "odometer_distance": distance, "energy_used": distance * 0.15}
+
+
+@pytest.mark.asyncio
+async def test_sync_drives_only_fetches_past_high_water_mark(httpx_mock: HTTPXMock) -> None:
+    archive = TelemetryArchive()
+    client = TessieClient("TESSIE_TOKEN")
+    httpx_mock.add_response(
+        method="GET",
+        url=f"{DRIVES_URL}&from={NOW - 7 * DAY}&to={NOW}",
+        json={"results": [drive(1, NOW - 3 * DAY), drive(2, NOW - 2 * 3600)]},
+    )
+    httpx_mock.add_response(
+        method="GET",
+        url=f"{DRIVES_URL}&from={NOW - SYNC_OVERLAP['drives']}&to={NOW + DAY}",
+        json={"results": [drive(2, NOW - 2 * 3600), drive(3, NOW + 3600)]},
+    )
+
+    assert await archive.sync_drives(client, VIN, NOW - 7 * DAY, NOW) == 2
+    assert await archive.sync_drives(client, VIN, NOW - 7 * DAY, NOW + DAY) == 2
+    # Already covered, so no request is made.
+    assert await archive.sync_drives(client, VIN, NOW - 5 * DAY, NOW) == 0
+
+    assert await archive.high_water(KEY, VIN, "drives") == NOW + DAY
+    assert [d.id async for d in archive.iter_drives(KEY, VIN, NOW - 7 * DAY, NOW + DAY)] == [1, 2, 3]
+    assert [d.id async for d in archive.iter_drives(KEY, VIN, NOW - DAY, NOW)] == [2]
+    await archive.close()
+
+
+@pytest.mark.asyncio
+async def test_archive_survives_restart(httpx_mock: HTTPXMock, tmp_path) -> None:
+    path = str(tmp_path / "telemetry.db")
+    httpx_mock.add_response(
+        method="GET",
+        url=f"https://api.tessie.com/{VIN}/path?separate=false&from={NOW - 3600}&to={NOW}",
+        json={
+            "results": [
+                {"timestamp": NOW - 60, "latitude": 37.1, "longitude": -122.0, "battery_level": 79},
+                {"timestamp": NOW - 3600, "latitude": 37.0, "longitude": -122.0, "battery_level": 80},
+            ]
+        },
+    )
+    archive = TelemetryArchive(path)
+    assert await archive.sync_path(TessieClient("TESSIE_TOKEN"), VIN, NOW - 3600, NOW) == 2
+    await archive.save_snapshot(KEY, VIN, "drivers", DriverList(drivers=[Driver(user_id="1", name="Jane")]))
+    await archive.close()
+
+    reopened = TelemetryArchive(path)
+    assert await reopened.sync_path(TessieClient("TESSIE_TOKEN"), VIN, NOW - 3600, NOW) == 0
+    series = await reopened.path_series(KEY, VIN, NOW - 3600, NOW)
+    assert series.timestamp.tolist() == [NOW - 3600, NOW - 60]
+    assert series.battery_level.tolist() == [80, 79]
+    assert [p.latitude async for p in reopened.iter_path(KEY, VIN, NOW - 120, NOW)] == [37.1]
+    assert await reopened.drivers(KEY, VIN) == DriverList(drivers=[Driver(user_id="1", name="Jane")])
+    assert await reopened.invitations(KEY, VIN) is None
+    await reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_history_tool_reads_from_archive(httpx_mock: HTTPXMock,
+                                               mock_context: ToolContext,
+                                               monkeypatch: pytest.MonkeyPatch) -> None:
+    configure_archive(":memory:")
+    monkeypatch.setattr(history.time, "time", lambda: NOW)
+    httpx_mock.add_response(
+        method="GET",
+        url=f"{DRIVES_URL}&from={NOW - 7 * DAY}&to={NOW}",
+        json={"results": [drive(1, NOW - 3 * DAY, 30.0), drive(2, NOW - DAY, 10.0)]},
+    )
+
+    first = await get_drive_summary(VIN, mock_context)
+    monkeypatch.setattr(history.time, "time", lambda: NOW + 60)
+    httpx_mock.add_response(
+        method="GET",
+        url=f"{DRIVES_URL}&from={NOW - SYNC_OVERLAP['drives']}&to={NOW + 60}",
+        json={"results": []},
+    )
+    second = await get_drive_summary(VIN, mock_context)
+
+    assert first == second
+    assert first["drives"] == 2
+    assert first["distance_km"] == 40.0
+
+
+@pytest.mark.asyncio
+async def test_sync_fetches_gap_between_synced_ranges(httpx_mock: HTTPXMock) -> None:
+    archive = TelemetryArchive()
+    client = TessieClient("TESSIE_TOKEN")
+    httpx_mock.add_response(method="GET", url=f"{DRIVES_URL}&from={NOW - DAY}&to={NOW}", json={"results": []})
+    httpx_mock.add_response(
+        method="GET", url=f"{DRIVES_URL}&from={NOW + 9 * DAY}&to={NOW + 10 * DAY}", json={"results": []}
+    )
+    httpx_mock.add_response(
+        method="GET",
+        url=f"{DRIVES_URL}&from={NOW + 3 * DAY}&to={NOW + 9 * DAY}",
+        json={"results": [drive(1, NOW + 5 * DAY)]},
+    )
+
+    await archive.sync_drives(client, VIN, NOW - DAY, NOW)
+    await archive.sync_drives(client, VIN, NOW + 9 * DAY, NOW + 10 * DAY)
+    # Nothing between NOW and NOW + 9 days was downloaded, so it must not count as synced.
+    assert await archive.sync_drives(client, VIN, NOW + 3 * DAY, NOW + 10 * DAY) == 1
+
+    assert [(r.synced_from, r.synced_to) for r in await archive.synced_ranges(KEY, VIN, "drives")] == [
+        (NOW - DAY, NOW), (NOW + 3 * DAY, NOW + 10 * DAY)
+    ]
+    assert [d.id async for d in archive.iter_drives(KEY, VIN, NOW, NOW + 10 * DAY)] == [1]
+    await archive.close()
+
+
+@pytest.mark.asyncio
+async def test_archive_is_scoped_by_token(httpx_mock: HTTPXMock) -> None:
+    archive = TelemetryArchive()
+    httpx_mock.add_response(
+        method="GET",
+        url=f"{DRIVES_URL}&from={NOW - DAY}&to={NOW}",
+        json={"results": [drive(1, NOW - 3600)]},
+        is_reusable=True,
+    )
+    other = TessieClient("OTHER_TOKEN")
+
+    assert await archive.sync_drives(TessieClient("TESSIE_TOKEN"), VIN, NOW - DAY, NOW) == 1
+    await archive.save_snapshot(KEY, VIN, "drivers", DriverList(drivers=[Driver(user_id="1", name="Jane")]))
+
+    assert [d async for d in archive.iter_drives(other.token_key, VIN, NOW - DAY, NOW)] == []
+    assert await archive.drivers(other.token_key, VIN) is None
+    # The other tenant's range is not synced yet, so it is downloaded for that token.
+    assert await archive.sync_drives(other, VIN, NOW - DAY, NOW) == 1
+    await archive.close()
@@ -0,0 +1,132 @@
+import pytest
+from pytest_httpx import HTTPXMock
+
+from arcade_tdk import ToolContext, ToolSecretItem
+
+from tessie.cache import TTLCache
+from tessie.tools.car import get_location, get_battery, get_vehicle_snapshot
+
+VEHICLE_DATA_URL = "https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF555555/vehicle_data"
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def mock_context():
+    context = ToolContext()
+    context.secrets = []
+    context.secrets.append(
+        ToolSecretItem(
+            key="TESSIE_TOKEN", value="TESSIE_TOKEN"
+        )
+    )
+    return context
+
+
+def test_cache_expires_after_endpoint_ttl() -> None:
+    clock = FakeClock()
+    cache = TTLCache(ttls={"drive_state": 10.0}, clock=clock)
+    key = ("token", "5YJ3E1EA4KF555555", "drive_state")
+
+    cache.set(key, "value")
+    clock.now = 10.0
+    assert cache.get(key) == "value"
+    clock.now = 10.5
+    assert cache.get(key) is None
+    assert cache.get(key, max_age=20.0) == "value"
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.size) == (2, 1, 1)
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    cache = TTLCache(max_size=2)
+    first = ("token", "VIN1", "drivers")
+    second = ("token", "VIN2", "drivers")
+    third = ("token", "VIN3", "drivers")
+
+    cache.set(first, 1)
+    cache.set(second, 2)
+    assert cache.get(first) == 1
+    cache.set(third, 3)
+
+    assert cache.get(second) is None
+    assert cache.get(first) == 1
+    assert cache.stats().evictions == 1
+
+
+def test_set_skips_values_fetched_before_a_patch() -> None:
+    cache = TTLCache()
+    key = ("token", "VIN1", "invitations")
+
+    generation = cache.generation(key)
+    assert cache.patch(key, lambda cached: cached + [1]) is False
+    assert cache.set(key, [], generation) is False
+    assert cache.get(key) is None
+
+    assert cache.set(key, [1], cache.generation(key)) is True
+    assert cache.get(key) == [1]
+
+
+@pytest.mark.asyncio
+async def test_get_location_served_from_cache(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    httpx_mock.add_response(
+        method="GET",
+        url=f"{VEHICLE_DATA_URL}?endpoints=drive_state",
+        json={"response": {"drive_state": {"latitude": 37.4929681, "longitude": -121.9453489}}},
+    )
+
+    first = await get_location("5YJ3E1EA4KF555555", mock_context)
+    second = await get_location("5YJ3E1EA4KF555555", mock_context)
+
+    assert "as_of" not in first
+    assert second.pop("as_of")
+    assert first == second
+    assert len(httpx_mock.get_requests()) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_location_force_refresh(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    httpx_mock.add_response(
+        method="GET",
+        url=f"{VEHICLE_DATA_URL}?endpoints=drive_state",
+        json={"response": {"drive_state": {"latitude": 37.4929681, "longitude": -121.9453489}}},
+    )
+    httpx_mock.add_response(
+        method="GET",
+        url=f"{VEHICLE_DATA_URL}?endpoints=drive_state",
+        json={"response": {"drive_state": {"latitude": 38.0, "longitude": -122.0}}},
+    )
+
+    await get_location("5YJ3E1EA4KF555555", mock_context)
+    assert await get_location("5YJ3E1EA4KF555555", mock_context, force_refresh=True) == {
+        "latitude": "38.000000000",
+        "longitude": "-122.000000000",
+    }
+
+
+@pytest.mark.asyncio
+async def test_snapshot_sections_are_cached_individually(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    httpx_mock.add_response(
+        method="GET",
+        url=f"{VEHICLE_DATA_URL}?endpoints=drive_state;charge_state",
+        json={
+            "response": {
+                "drive_state": {"latitude": 37.4929681, "longitude": -121.9453489},
+                "charge_state": {"battery_level": 85, "battery_range": 275.5},
+            }
+        },
+    )
+
+    await get_vehicle_snapshot("5YJ3E1EA4KF555555", mock_context, ["drive_state", "charge_state"])
+
+    battery = await get_battery("5YJ3E1EA4KF555555", mock_context)
+    assert battery["battery_level"] == "85.000000000"
+    assert battery["battery_range"] == "275.500000000"
+    assert len(httpx_mock.get_requests()) == 1
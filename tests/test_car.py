@@ -1,9 +1,12 @@
+import httpx
 import pytest
 from pytest_httpx import HTTPXMock
 
 from arcade_tdk import ToolContext, ToolSecretItem
 
-from tessie.tools.car import get_location, get_battery
+from arcade_tdk.errors import ToolExecutionError
+
+from tessie.tools.car import get_location, get_battery, get_vehicle_snapshot, get_location_v2, get_battery_v2
 
 @pytest.fixture
 def mock_context():
@@ -46,6 +49,7 @@ async def test_get_location_bad_request(httpx_mock: HTTPXMock, mock_context: Too
         json={
             "error": "Internal server error"
         },
+        is_reusable=True,
     )
 
     with pytest.raises(Exception):
@@ -68,8 +72,8 @@ async def test_get_battery_success(httpx_mock: HTTPXMock, mock_context: ToolCont
     )
 
     assert await get_battery("5YJ3E1EA4KF555555", mock_context) == {
-        "battery_level": "85",
-        "battery_range": "275"
+        "battery_level": "85.000000000",
+        "battery_range": "275.000000000"
     }
 
 @pytest.mark.asyncio
@@ -85,3 +89,234 @@ async def test_get_battery_bad_request(httpx_mock: HTTPXMock, mock_context: Tool
 
     with pytest.raises(Exception):
         await get_battery("5YJ3E1EA4KF555555", mock_context)
+
+@pytest.mark.asyncio
+async def test_get_vehicle_snapshot_success(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    httpx_mock.add_response(
+        method="GET",
+        status_code=200,
+        url="https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF555555/vehicle_data?endpoints=drive_state;charge_state",
+        json={
+            "response": {
+                "drive_state": {
+                    "latitude": 37.4929681,
+                    "longitude": -121.9453489,
+                    "shift_state": None,
+                },
+                "charge_state": {
+                    "battery_level": 85,
+                    "battery_range": 275.5,
+                    "charging_state": "Disconnected",
+                },
+            }
+        },
+    )
+
+    assert await get_vehicle_snapshot("5YJ3E1EA4KF555555", mock_context, ["drive_state", "charge_state"]) == {
+        "vin": "5YJ3E1EA4KF555555",
+        "drive_state": {
+            "latitude": 37.4929681,
+            "longitude": -121.9453489,
+        },
+        "charge_state": {
+            "battery_level": 85,
+            "battery_range": 275.5,
+            "charging_state": "Disconnected",
+        },
+    }
+
+@pytest.mark.asyncio
+async def test_get_vehicle_snapshot_unknown_endpoint(mock_context: ToolContext) -> None:
+    with pytest.raises(ToolExecutionError):
+        await get_vehicle_snapshot("5YJ3E1EA4KF555555", mock_context, ["gui_settings"])
+
+@pytest.mark.asyncio
+async def test_get_location_retries_connection_reset(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    httpx_mock.add_exception(
+        httpx.ReadError("Connection reset by peer"),
+        method="GET",
+        url="https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF555555/vehicle_data?endpoints=drive_state",
+    )
+    httpx_mock.add_response(
+        method="GET",
+        status_code=200,
+        url="https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF555555/vehicle_data?endpoints=drive_state",
+        json={
+            "response": {
+                "drive_state": {
+                    "latitude": 37.4929681,
+                    "longitude": -121.9453489,
+                }
+            }
+        },
+    )
+
+    assert await get_location("5YJ3E1EA4KF555555", mock_context) == {
+        "latitude": "37.492968100",
+        "longitude": "-121.945348900",
+    }
+
+@pytest.mark.asyncio
+async def test_get_battery_asleep_uses_last_known_state(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    httpx_mock.add_response(
+        method="GET",
+        status_code=200,
+        url="https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF555555",
+        json={
+            "response": {
+                "vin": "5YJ3E1EA4KF555555",
+                "state": "asleep"
+            }
+        },
+    )
+    httpx_mock.add_response(
+        method="GET",
+        status_code=200,
+        url="https://api.tessie.com/5YJ3E1EA4KF555555/state?use_cache=true",
+        json={
+            "vin": "5YJ3E1EA4KF555555",
+            "state": "asleep",
+            "charge_state": {
+                "battery_level": 72,
+                "battery_range": 230.5
+            }
+        },
+    )
+
+    assert await get_battery("5YJ3E1EA4KF555555", mock_context, allow_wake=False) == {
+        "battery_level": "72.000000000",
+        "battery_range": "230.500000000",
+        "live": False
+    }
+
+@pytest.mark.asyncio
+async def test_get_battery_asleep_without_last_known_state(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    httpx_mock.add_response(
+        method="GET",
+        status_code=200,
+        url="https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF555555",
+        json={
+            "response": {
+                "vin": "5YJ3E1EA4KF555555",
+                "state": "asleep"
+            }
+        },
+    )
+    httpx_mock.add_response(
+        method="GET",
+        status_code=200,
+        url="https://api.tessie.com/5YJ3E1EA4KF555555/state?use_cache=true",
+        json={
+            "vin": "5YJ3E1EA4KF555555",
+            "state": "asleep"
+        },
+    )
+
+    with pytest.raises(ToolExecutionError):
+        await get_battery("5YJ3E1EA4KF555555", mock_context, allow_wake=False)
+
+@pytest.mark.asyncio
+async def test_get_battery_online_reads_live_data(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    httpx_mock.add_response(
+        method="GET",
+        status_code=200,
+        url="https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF555555",
+        json={
+            "response": {
+                "vin": "5YJ3E1EA4KF555555",
+                "state": "online"
+            }
+        },
+    )
+    httpx_mock.add_response(
+        method="GET",
+        status_code=200,
+        url="https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF555555/vehicle_data?endpoints=charge_state",
+        json={
+            "response": {
+                "charge_state": {
+                    "battery_level": 85,
+                    "battery_range": 275
+                },
+            }
+        },
+    )
+
+    assert await get_battery("5YJ3E1EA4KF555555", mock_context, allow_wake=False) == {
+        "battery_level": "85.000000000",
+        "battery_range": "275.000000000",
+        "live": True
+    }
+
+@pytest.mark.asyncio
+async def test_get_battery_without_wake_from_cache_reports_live(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    httpx_mock.add_response(
+        method="GET",
+        status_code=200,
+        url="https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF555555/vehicle_data?endpoints=charge_state",
+        json={
+            "response": {
+                "charge_state": {
+                    "battery_level": 85,
+                    "battery_range": 275
+                },
+            }
+        },
+    )
+
+    await get_battery("5YJ3E1EA4KF555555", mock_context)
+    battery = await get_battery("5YJ3E1EA4KF555555", mock_context, allow_wake=False)
+
+    assert battery.pop("as_of")
+    assert battery == {
+        "battery_level": "85.000000000",
+        "battery_range": "275.000000000",
+        "live": True
+    }
+    assert len(httpx_mock.get_requests()) == 1
+
+@pytest.mark.asyncio
+async def test_get_location_v2_returns_numbers(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    httpx_mock.add_response(
+        method="GET",
+        status_code=200,
+        url="https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF555555/vehicle_data?endpoints=drive_state",
+        json={
+            "response": {
+                "drive_state": {
+                    "latitude": 37.4929681,
+                    "longitude": -121.9453489,
+                }
+            }
+        },
+    )
+
+    assert await get_location_v2("5YJ3E1EA4KF555555", mock_context) == {
+        "latitude": 37.4929681,
+        "longitude": -121.9453489,
+    }
+
+@pytest.mark.asyncio
+async def test_get_battery_v2_returns_numbers(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    httpx_mock.add_response(
+        method="GET",
+        status_code=200,
+        url="https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF555555/vehicle_data?endpoints=charge_state",
+        json={
+            "response": {
+                "charge_state": {
+                    "battery_level": 85,
+                    "battery_range": 275.5
+                }
+            }
+        },
+    )
+
+    assert await get_battery_v2("5YJ3E1EA4KF555555", mock_context) == {
+        "battery_level": 85,
+        "battery_range": 275.5,
+        "battery_range_unit": "mi",
+    }
+
+    # The v1 tool reads the same cached state and keeps its string format.
+    assert (await get_battery("5YJ3E1EA4KF555555", mock_context))["battery_range"] == "275.500000000"
@@ -0,0 +1,27 @@
+import pytest
+
+from tessie import codec
+from tessie.model import Driver, DriverList, Invitation
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_loads_and_dumps(monkeypatch: pytest.MonkeyPatch, fast: bool) -> None:
+    if not fast:
+        monkeypatch.setattr(codec, "orjson", None)
+
+    body = b'{"response": [{"id_s": "1", "name": "Caf\\u00e9"}], "ok": true}'
+
+    assert codec.loads(body) == {"response": [{"id_s": "1", "name": "Café"}], "ok": True}
+    assert codec.loads(body.decode()) == codec.loads(body)
+    assert codec.loads(codec.dumps({"a": [1, 2.5, None]})) == {"a": [1, 2.5, None]}
+
+
+def test_models_validate_api_payloads() -> None:
+    drivers = DriverList.model_validate(
+        {"drivers": [{"user_id_s": "42", "user_id": 42, "driver_first_name": "Jane", "driver_last_name": "Doe"}]}
+    )
+    invitation = Invitation.model_validate({"id": 7, "id_s": "7", "share_link": "https://link", "state": "pending"})
+
+    assert drivers.drivers == [Driver(user_id="42", name="Jane Doe")]
+    assert invitation == Invitation(id="7", share_link="https://link", state="pending")
+    assert drivers.model_dump() == {"drivers": [{"user_id": "42", "name": "Jane Doe"}], "stale": None}
@@ -0,0 +1,129 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+
+from arcade_tdk import ToolContext, ToolSecretItem
+from arcade_tdk.errors import RetryableToolError
+
+from tessie.deadline import DeadlineExceeded
+from tessie.retry import RetryPolicy
+from tessie.tessie_client import TessieClient
+from tessie.tools.car import get_location
+
+VEHICLE_DATA_URL = "https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF555555/vehicle_data?endpoints=drive_state"
+
+
+@pytest.fixture
+def mock_context():
+    context = ToolContext()
+    context.secrets = []
+    context.secrets.append(
+        ToolSecretItem(
+            key="TESSIE_TOKEN", value="TESSIE_TOKEN"
+        )
+    )
+    return context
+
+
+async def slow_response(request: httpx.Request) -> httpx.Response:
+    await asyncio.sleep(1)
+    return httpx.Response(status_code=200, json={"response": {"drive_state": {"latitude": 1.0, "longitude": 2.0}}})
+
+
+@pytest.mark.asyncio
+async def test_get_location_deadline_exceeded(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    httpx_mock.add_callback(slow_response, method="GET", url=VEHICLE_DATA_URL)
+
+    with pytest.raises(RetryableToolError) as exc_info:
+        await get_location("5YJ3E1EA4KF555555", mock_context, deadline=0.05)
+
+    assert "Timed out" in exc_info.value.message
+
+
+@pytest.mark.asyncio
+async def test_get_location_falls_back_to_stale_value(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    httpx_mock.add_response(
+        method="GET",
+        url=VEHICLE_DATA_URL,
+        json={"response": {"drive_state": {"latitude": 37.4929681, "longitude": -121.9453489}}},
+    )
+    httpx_mock.add_callback(slow_response, method="GET", url=VEHICLE_DATA_URL)
+
+    await get_location("5YJ3E1EA4KF555555", mock_context)
+
+    location = await get_location("5YJ3E1EA4KF555555", mock_context, force_refresh=True, deadline=0.05)
+    assert location.pop("as_of")
+    assert location == {
+        "latitude": "37.492968100",
+        "longitude": "-121.945348900",
+        "stale": True,
+    }
+
+
+@pytest.mark.asyncio
+async def test_retries_stop_when_budget_runs_out(httpx_mock: HTTPXMock) -> None:
+    httpx_mock.add_response(
+        method="GET",
+        status_code=503,
+        url="https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF555555/drivers",
+        is_reusable=True,
+    )
+    client = TessieClient("TESSIE_TOKEN", retry_policy=RetryPolicy(max_attempts=10, backoff_base=5.0, backoff_max=5.0))
+
+    started = time.monotonic()
+    with pytest.raises(httpx.HTTPError):
+        await client.list_driver("5YJ3E1EA4KF555555", deadline=0.5)
+
+    assert time.monotonic() - started < 1.0
+
+
+@pytest.mark.asyncio
+async def test_do_request_raises_deadline_exceeded(httpx_mock: HTTPXMock) -> None:
+    httpx_mock.add_callback(slow_response, method="GET", url=VEHICLE_DATA_URL)
+
+    with pytest.raises(DeadlineExceeded):
+        await TessieClient("TESSIE_TOKEN").do_request(
+            "GET", "/api/1/vehicles/5YJ3E1EA4KF555555/vehicle_data?endpoints=drive_state", deadline=0.05
+        )
+
+
+@pytest.mark.asyncio
+async def test_status_check_falls_back_to_stale_value(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    httpx_mock.add_response(
+        method="GET",
+        url=VEHICLE_DATA_URL,
+        json={"response": {"drive_state": {"latitude": 37.4929681, "longitude": -121.9453489}}},
+    )
+    httpx_mock.add_callback(slow_response, method="GET", url="https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF555555")
+
+    await get_location("5YJ3E1EA4KF555555", mock_context)
+
+    location = await get_location(
+        "5YJ3E1EA4KF555555", mock_context, force_refresh=True, deadline=0.05, allow_wake=False
+    )
+    assert location.pop("as_of")
+    assert location == {
+        "latitude": "37.492968100",
+        "longitude": "-121.945348900",
+        "stale": True,
+        "live": True,
+    }
+
+
+@pytest.mark.asyncio
+async def test_deadline_covers_the_whole_tool_call(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    async def status_response(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.1)
+        return httpx.Response(status_code=200, json={"response": {"state": "online"}})
+
+    httpx_mock.add_callback(status_response, method="GET", url="https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF555555")
+    httpx_mock.add_callback(slow_response, method="GET", url=VEHICLE_DATA_URL, is_optional=True)
+
+    started = time.monotonic()
+    with pytest.raises(RetryableToolError):
+        await get_location("5YJ3E1EA4KF555555", mock_context, deadline=0.2, allow_wake=False)
+
+    assert time.monotonic() - started < 0.25
@@ -3,6 +3,9 @@ from pytest_httpx import HTTPXMock
 
 from arcade_tdk import ToolContext, ToolSecretItem
 
+from tessie.archive import configure_archive
+from tessie.model import Driver, DriverList
+from tessie.pool import token_fingerprint
 from tessie.tools.drivers import list_driver, delete_driver
 
 @pytest.fixture
@@ -41,6 +44,7 @@ async def test_get_drivers_bad_request(httpx_mock: HTTPXMock, mock_context: Tool
         json={
             "response": []
         },
+        is_reusable=True,
     )
 
     with pytest.raises(Exception):
@@ -136,3 +140,96 @@ async def test_delete_driver_server_error(httpx_mock: HTTPXMock, mock_context: T
 
     with pytest.raises(Exception):
         await delete_driver("5YJ3E1EA4KF555555", "user_123", mock_context)
+
+@pytest.mark.asyncio
+async def test_delete_driver_updates_cached_list(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    httpx_mock.add_response(
+        method="GET",
+        status_code=200,
+        url="https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF555555/drivers",
+        json={
+            "response": [
+                {"user_id_s": "user_123", "driver_first_name": "Jane", "driver_last_name": "Doe"},
+                {"user_id_s": "user_456", "driver_first_name": "John", "driver_last_name": "Doe"},
+            ]
+        },
+    )
+    httpx_mock.add_response(
+        method="DELETE",
+        status_code=200,
+        url="https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF555555/drivers?share_user_id=user_123",
+        json={
+            "response": "ok"
+        },
+    )
+
+    await list_driver("5YJ3E1EA4KF555555", mock_context)
+    await delete_driver("5YJ3E1EA4KF555555", "user_123", mock_context)
+
+    assert await list_driver("5YJ3E1EA4KF555555", mock_context) == {
+        "drivers": [
+            {
+                "name": "John Doe",
+                "user_id": "user_456"
+            }
+        ]
+    }
+    assert len(httpx_mock.get_requests()) == 2
+
+@pytest.mark.asyncio
+async def test_get_drivers_retries_server_error(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    httpx_mock.add_response(
+        method="GET",
+        status_code=500,
+        url="https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF555555/drivers",
+        json={
+            "error": "Internal server error"
+        },
+    )
+    httpx_mock.add_response(
+        method="GET",
+        status_code=200,
+        url="https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF555555/drivers",
+        json={
+            "response": []
+        },
+    )
+
+    assert await list_driver("5YJ3E1EA4KF555555", mock_context) == {
+        "drivers": []
+    }
+    assert len(httpx_mock.get_requests()) == 2
+
+@pytest.mark.asyncio
+async def test_delete_driver_is_not_retried(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    httpx_mock.add_response(
+        method="DELETE",
+        status_code=503,
+        url="https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF555555/drivers?share_user_id=user_123",
+        json={
+            "error": "Service unavailable"
+        },
+    )
+
+    with pytest.raises(Exception):
+        await delete_driver("5YJ3E1EA4KF555555", "user_123", mock_context)
+    assert len(httpx_mock.get_requests()) == 1
+
+@pytest.mark.asyncio
+async def test_get_drivers_falls_back_to_archive(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    httpx_mock.add_response(
+        method="GET",
+        status_code=503,
+        url="https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF555555/drivers",
+        is_reusable=True,
+    )
+    archive = configure_archive(":memory:")
+    await archive.save_snapshot(
+        token_fingerprint("TESSIE_TOKEN"), "5YJ3E1EA4KF555555", "drivers",
+        DriverList(drivers=[Driver(user_id="1", name="Ada Lovelace")]),
+    )
+
+    assert await list_driver("5YJ3E1EA4KF555555", mock_context) == {
+        "drivers": [{"user_id": "1", "name": "Ada Lovelace"}],
+        "stale": True,
+    }
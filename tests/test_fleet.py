@@ -0,0 +1,148 @@
+import pytest
+from pytest_httpx import HTTPXMock
+
+from arcade_tdk import ToolContext, ToolSecretItem
+
+from tessie.tools.fleet import get_fleet_battery, get_fleet_location, get_fleet_snapshot, get_fleet_location_v2
+
+@pytest.fixture
+def mock_context():
+    context = ToolContext()
+    context.secrets = []
+    context.secrets.append(
+        ToolSecretItem(
+            key="TESSIE_TOKEN", value="TESSIE_TOKEN"
+        )
+    )
+    return context
+
+@pytest.mark.asyncio
+async def test_get_fleet_battery_partial_results(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    httpx_mock.add_response(
+        method="GET",
+        status_code=200,
+        url="https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF555555/vehicle_data?endpoints=charge_state",
+        json={
+            "response": {
+                "charge_state": {
+                    "battery_level": 85,
+                    "battery_range": 275
+                },
+            }
+        },
+    )
+    httpx_mock.add_response(
+        method="GET",
+        status_code=404,
+        url="https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF111111/vehicle_data?endpoints=charge_state",
+        json={
+            "error": "Car not found"
+        },
+    )
+
+    result = await get_fleet_battery(["5YJ3E1EA4KF555555", "INVALID", "5YJ3E1EA4KF111111"], mock_context)
+
+    assert result["vehicles"] == {
+        "5YJ3E1EA4KF555555": {
+            "battery_level": "85.000000000",
+            "battery_range": "275.000000000"
+        }
+    }
+    assert list(result["errors"]) == ["5YJ3E1EA4KF111111", "INVALID"]
+    assert "VIN must be exactly 17 characters" in result["errors"]["INVALID"]
+
+@pytest.mark.asyncio
+async def test_get_fleet_location_sorted_by_vin(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    for vin in ["5YJ3E1EA4KF222222", "5YJ3E1EA4KF111111"]:
+        httpx_mock.add_response(
+            method="GET",
+            status_code=200,
+            url=f"https://api.tessie.com/api/1/vehicles/{vin}/vehicle_data?endpoints=drive_state",
+            json={
+                "response": {
+                    "drive_state": {
+                        "latitude": 37.5,
+                        "longitude": -121.9,
+                    }
+                }
+            },
+        )
+
+    result = await get_fleet_location(["5YJ3E1EA4KF222222", "5YJ3E1EA4KF111111", "5YJ3E1EA4KF222222"], mock_context)
+
+    assert list(result["vehicles"]) == ["5YJ3E1EA4KF111111", "5YJ3E1EA4KF222222"]
+    assert result["errors"] == {}
+
+@pytest.mark.asyncio
+async def test_get_fleet_snapshot_single_request(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    httpx_mock.add_response(
+        method="GET",
+        status_code=200,
+        url="https://api.tessie.com/vehicles?only_active=false",
+        json={
+            "results": [
+                {
+                    "vin": "5YJ3E1EA4KF222222",
+                    "is_active": True,
+                    "last_state": {
+                        "drive_state": {"latitude": 37.5, "longitude": -121.9},
+                        "charge_state": {"battery_level": 60, "battery_range": 180.5},
+                    }
+                },
+                {
+                    "vin": "5YJ3E1EA4KF111111",
+                    "is_active": False,
+                    "last_state": {
+                        "charge_state": {"battery_level": 85, "battery_range": 275},
+                    }
+                },
+            ]
+        },
+    )
+
+    assert await get_fleet_snapshot(mock_context) == {
+        "vehicles": {
+            "5YJ3E1EA4KF111111": {
+                "battery": {"battery_level": "85.000000000", "battery_range": "275.000000000"},
+            },
+            "5YJ3E1EA4KF222222": {
+                "location": {"latitude": "37.500000000", "longitude": "-121.900000000"},
+                "battery": {"battery_level": "60.000000000", "battery_range": "180.500000000"},
+            },
+        }
+    }
+    assert len(httpx_mock.get_requests()) == 1
+
+@pytest.mark.asyncio
+async def test_get_fleet_snapshot_bad_request(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    httpx_mock.add_response(
+        method="GET",
+        status_code=401,
+        url="https://api.tessie.com/vehicles?only_active=false",
+        json={
+            "error": "Unauthorized"
+        },
+    )
+
+    with pytest.raises(Exception):
+        await get_fleet_snapshot(mock_context)
+
+@pytest.mark.asyncio
+async def test_get_fleet_location_v2(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    httpx_mock.add_response(
+        method="GET",
+        status_code=200,
+        url="https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF111111/vehicle_data?endpoints=drive_state",
+        json={
+            "response": {
+                "drive_state": {
+                    "latitude": 37.5,
+                    "longitude": -121.9,
+                }
+            }
+        },
+    )
+
+    result = await get_fleet_location_v2(["5YJ3E1EA4KF111111"], mock_context)
+
+    assert result == {"vehicles": {"5YJ3E1EA4KF111111": {"latitude": 37.5, "longitude": -121.9}}, "errors": {}}
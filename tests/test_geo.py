@@ -0,0 +1,186 @@
+import random
+
+import pytest
+from pytest_httpx import HTTPXMock
+
+from arcade_tdk import ToolContext, ToolSecretItem
+
+from arcade_tdk.errors import ToolExecutionError
+
+from tessie.geo import FleetGeo, Geofence, SpatialIndex, default_geo, point_in_polygon
+from tessie.history import haversine_km
+from tessie.pool import token_fingerprint
+from tessie.tools.geo import add_geofence, check_geofences, find_nearest_vehicles, find_vehicles_in_area, \
+    find_vehicles_near
+
+VEHICLES_URL = "https://api.tessie.com/vehicles?only_active=false"
+DEPOT = (37.4929, -121.9453)
+SQUARE = [(37.4, -122.0), (37.6, -122.0), (37.6, -121.8), (37.4, -121.8)]
+
+
+@pytest.fixture
+def mock_context():
+    context = ToolContext()
+    context.secrets = []
+    context.secrets.append(
+        ToolSecretItem(
+            key="TESSIE_TOKEN", value="TESSIE_TOKEN"
+        )
+    )
+    return context
+
+
+def vehicles(*positions: tuple[str, float, float]) -> dict:
+    return {
+        "results": [
+            {"vin": vin, "last_state": {"drive_state": {"latitude": lat, "longitude": lon}}}
+            for vin, lat, lon in positions
+        ]
+    }
+
+
+@pytest.fixture
+def fleet() -> SpatialIndex:
+    rng = random.Random(7)
+    index = SpatialIndex()
+    for i in range(2000):
+        index.update(f"VIN{i:014d}", 37.0 + rng.random(), -122.5 + rng.random())
+    return index
+
+
+def test_within_radius_matches_brute_force(fleet: SpatialIndex) -> None:
+    expected = sorted(
+        vin for vin in (f"VIN{i:014d}" for i in range(2000))
+        if haversine_km(*DEPOT, *fleet.position(vin)) <= 5.0
+    )
+
+    found = fleet.within_radius(*DEPOT, 5.0)
+
+    assert sorted(neighbor.vin for neighbor in found) == expected
+    assert [neighbor.distance_km for neighbor in found] == sorted(neighbor.distance_km for neighbor in found)
+
+
+def test_nearest_matches_brute_force(fleet: SpatialIndex) -> None:
+    expected = sorted(
+        (haversine_km(*DEPOT, *fleet.position(f"VIN{i:014d}")), f"VIN{i:014d}") for i in range(2000)
+    )[:5]
+
+    assert [neighbor.vin for neighbor in fleet.nearest(*DEPOT, 5)] == [vin for _, vin in expected]
+    assert len(fleet.nearest(*DEPOT, 5000)) == 2000
+
+
+def test_within_polygon(fleet: SpatialIndex) -> None:
+    expected = sorted(
+        vin for vin in (f"VIN{i:014d}" for i in range(2000)) if point_in_polygon(*fleet.position(vin), SQUARE)
+    )
+
+    assert fleet.within_polygon(SQUARE) == expected
+    assert point_in_polygon(37.5, -121.9, SQUARE)
+    assert not point_in_polygon(37.7, -121.9, SQUARE)
+
+
+def test_queries_cross_the_antimeridian() -> None:
+    index = SpatialIndex()
+    index.update("WEST", 0.0, -179.99)
+    pacific = SpatialIndex()
+    pacific.update("PACIFIC", 10.0, -170.0)
+
+    assert [neighbor.vin for neighbor in index.within_radius(0.0, 179.99, 5.0)] == ["WEST"]
+    assert index.within(Geofence(name="dateline", latitude=0.0, longitude=180.0, radius_km=5.0)) == ["WEST"]
+    assert [neighbor.vin for neighbor in pacific.nearest(0.0, 100.0, 1)] == ["PACIFIC"]
+
+
+def test_radius_covering_the_globe_finds_every_car() -> None:
+    index = SpatialIndex()
+    index.update("NORTH", 89.0, 45.0)
+    index.update("SOUTH", -89.0, -135.0)
+
+    assert [neighbor.vin for neighbor in index.within_radius(0.0, 0.0, 30000.0)] == ["NORTH", "SOUTH"]
+    assert [neighbor.vin for neighbor in index.within_radius(88.0, 0.0, 500.0)] == ["NORTH"]
+
+
+def test_update_moves_vehicle_between_cells() -> None:
+    index = SpatialIndex()
+    index.update("A", 37.0, -122.0)
+    index.update("A", 48.0, 11.0)
+
+    assert index.within_radius(37.0, -122.0, 10.0) == []
+    assert [neighbor.vin for neighbor in index.within_radius(48.0, 11.0, 1.0)] == ["A"]
+    assert len(index) == 1
+
+
+def test_geofence_events_are_incremental() -> None:
+    geo = FleetGeo()
+    geo.update("A", *DEPOT)
+    geo.add_fence(Geofence(name="depot", latitude=DEPOT[0], longitude=DEPOT[1], radius_km=1.0))
+
+    assert geo.inside("depot") == ["A"]
+    assert geo.update("A", DEPOT[0], DEPOT[1] + 0.001) == []
+
+    left = geo.update("A", 38.0, -121.0)
+    assert [(event.vin, event.event) for event in left] == [("A", "exit")]
+    entered = geo.update("A", *DEPOT)
+    assert [(event.vin, event.event) for event in entered] == [("A", "enter")]
+
+    assert [event.event for event in geo.drain_events()] == ["exit", "enter"]
+    assert geo.drain_events() == []
+
+
+def test_geofence_needs_one_shape() -> None:
+    with pytest.raises(ValueError):
+        Geofence(name="both", latitude=1.0, longitude=1.0, radius_km=1.0, polygon=SQUARE)
+    with pytest.raises(ValueError):
+        Geofence(name="none")
+
+
+@pytest.mark.asyncio
+async def test_find_vehicles_near(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    httpx_mock.add_response(
+        method="GET",
+        url=VEHICLES_URL,
+        json=vehicles(("FAR", 48.0, 11.0), ("NEAR", DEPOT[0] + 0.01, DEPOT[1]), ("AT", *DEPOT)),
+        is_reusable=True,
+    )
+
+    near = await find_vehicles_near(DEPOT[0], DEPOT[1], 5.0, mock_context)
+    nearest = await find_nearest_vehicles(DEPOT[0], DEPOT[1], mock_context, k=1)
+    area = await find_vehicles_in_area([list(corner) for corner in SQUARE], mock_context)
+
+    assert [vehicle["vin"] for vehicle in near["vehicles"]] == ["AT", "NEAR"]
+    assert near["vehicles"][0]["distance_km"] == 0.0
+    assert [vehicle["vin"] for vehicle in nearest["vehicles"]] == ["AT"]
+    assert area == {"vins": ["AT", "NEAR"]}
+
+
+@pytest.mark.asyncio
+async def test_check_geofences_reports_exits(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    httpx_mock.add_response(method="GET", url=VEHICLES_URL, json=vehicles(("A", *DEPOT), ("B", *DEPOT)))
+    httpx_mock.add_response(method="GET", url=VEHICLES_URL, json=vehicles(("A", *DEPOT), ("B", 38.0, -121.0)))
+    httpx_mock.add_response(method="GET", url=VEHICLES_URL, json=vehicles(("A", *DEPOT), ("B", 38.0, -121.0)))
+    default_geo.get(token_fingerprint("TESSIE_TOKEN")).positions_ttl = 0
+
+    added = await add_geofence("depot", mock_context, latitude=DEPOT[0], longitude=DEPOT[1], radius_km=2.0)
+    first = await check_geofences(mock_context)
+    second = await check_geofences(mock_context)
+
+    assert added["inside"] == ["A", "B"]
+    assert [(event["vin"], event["geofence"], event["event"]) for event in first["events"]] == [("B", "depot", "exit")]
+    assert first["inside"] == {"depot": ["A"]}
+    assert second["events"] == []
+
+
+@pytest.mark.asyncio
+async def test_queries_reuse_fresh_positions(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    httpx_mock.add_response(method="GET", url=VEHICLES_URL, json=vehicles(("AT", *DEPOT)))
+
+    await find_vehicles_near(DEPOT[0], DEPOT[1], 5.0, mock_context)
+    nearest = await find_nearest_vehicles(DEPOT[0], DEPOT[1], mock_context, k=1)
+
+    assert [vehicle["vin"] for vehicle in nearest["vehicles"]] == ["AT"]
+    assert len(httpx_mock.get_requests()) == 1
+
+
+@pytest.mark.asyncio
+async def test_add_geofence_invalid(mock_context: ToolContext) -> None:
+    with pytest.raises(ToolExecutionError):
+        await add_geofence("broken", mock_context, latitude=DEPOT[0])
@@ -0,0 +1,152 @@
+import pytest
+from pytest_httpx import HTTPXMock
+
+from arcade_tdk import ToolContext, ToolSecretItem
+
+from arcade_tdk.errors import ToolExecutionError
+
+from tessie.history import haversine_km
+from tessie.tessie_client import TessieClient
+from tessie.tools import history
+from tessie.tools.history import get_charging_summary, get_distance_traveled, get_drive_summary
+
+VIN = "5YJ3E1EA4KF555555"
+NOW = 1_700_000_000
+DAY = 86400
+
+
+@pytest.fixture
+def mock_context():
+    context = ToolContext()
+    context.secrets = []
+    context.secrets.append(
+        ToolSecretItem(
+            key="TESSIE_TOKEN", value="TESSIE_TOKEN"
+        )
+    )
+    return context
+
+
+@pytest.fixture(autouse=True)
+def frozen_time(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(history.time, "time", lambda: NOW)
+
+
+def point(timestamp: int, latitude: float = 37.0, battery_level: int = 80) -> dict:
+    return {"timestamp": timestamp, "latitude": latitude, "longitude": -122.0, "battery_level": battery_level}
+
+
+def test_haversine_km() -> None:
+    assert haversine_km(37.0, -122.0, 37.0, -122.0) == 0.0
+    assert haversine_km(0.0, 0.0, 1.0, 0.0) == pytest.approx(111.195, abs=0.01)
+
+
+@pytest.mark.asyncio
+async def test_iter_path_fetches_windows_lazily_without_duplicates(httpx_mock: HTTPXMock) -> None:
+    httpx_mock.add_response(
+        method="GET",
+        url=f"https://api.tessie.com/{VIN}/path?separate=false&from=0&to=3600",
+        json={"results": [point(1800), point(0), point(3600)]},
+    )
+    httpx_mock.add_response(
+        method="GET",
+        url=f"https://api.tessie.com/{VIN}/path?separate=false&from=3600&to=7200",
+        json={"results": [point(3600), point(5400), point(7200)]},
+    )
+    client = TessieClient("TESSIE_TOKEN")
+
+    points = client.iter_path(VIN, 0, 7200, window=3600)
+    first = await points.__anext__()
+    assert first.timestamp == 0
+    assert len(httpx_mock.get_requests()) == 1
+
+    assert [first.timestamp] + [p.timestamp async for p in points] == [0, 1800, 3600, 5400, 7200]
+    assert len(httpx_mock.get_requests()) == 2
+
+
+@pytest.mark.asyncio
+async def test_get_drive_summary(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    httpx_mock.add_response(
+        method="GET",
+        url=f"https://api.tessie.com/{VIN}/drives?distance_format=km&timezone=UTC&from={NOW - 7 * DAY}&to={NOW}",
+        json={
+            "results": [
+                {"id": 1, "started_at": NOW - 3 * DAY, "ended_at": NOW - 3 * DAY + 1800,
+                 "odometer_distance": 30.0, "energy_used": 4.5},
+                {"id": 2, "started_at": NOW - DAY, "ended_at": NOW - DAY + 600,
+                 "odometer_distance": 10.0, "energy_used": 1.5},
+            ]
+        },
+    )
+
+    assert await get_drive_summary(VIN, mock_context) == {
+        "drives": 2,
+        "distance_km": 40.0,
+        "energy_used_kwh": 6.0,
+        "duration_s": 2400,
+        "kwh_per_100km": 15.0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_charging_summary(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    httpx_mock.add_response(
+        method="GET",
+        url=f"https://api.tessie.com/{VIN}/charges?distance_format=km&timezone=UTC&from={NOW - 30 * DAY}&to={NOW}",
+        json={
+            "results": [
+                {"id": 7, "started_at": NOW - 10 * DAY, "ended_at": NOW - 10 * DAY + 3600,
+                 "is_supercharger": True, "energy_added": 40.0, "cost": 16.5},
+                {"id": 8, "started_at": NOW - 2 * DAY, "ended_at": NOW - 2 * DAY + 7200,
+                 "is_supercharger": False, "energy_added": 20.0},
+            ]
+        },
+    )
+
+    assert await get_charging_summary(VIN, mock_context) == {
+        "sessions": 2,
+        "supercharger_sessions": 1,
+        "energy_added_kwh": 60.0,
+        "duration_s": 10800,
+        "cost": 16.5,
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_distance_traveled(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    start = NOW - DAY
+    for page_start in range(start, NOW, 3 * 3600):
+        httpx_mock.add_response(
+            method="GET",
+            url=f"https://api.tessie.com/{VIN}/path?separate=false&from={page_start}&to={page_start + 3 * 3600}",
+            json={
+                "results": [
+                    point(page_start + 60, 37.0 + (page_start - start) / 3600 / 100, 90 - (page_start - start) // 10800)
+                ]
+            },
+        )
+
+    result = await get_distance_traveled(VIN, mock_context)
+
+    assert result["points"] == 8
+    assert result["distance_km"] == pytest.approx(haversine_km(37.0, -122.0, 37.21, -122.0))
+    assert result["battery_used"] == 7
+
+
+@pytest.mark.asyncio
+async def test_get_drive_summary_bad_request(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    httpx_mock.add_response(
+        method="GET",
+        status_code=500,
+        url=f"https://api.tessie.com/{VIN}/drives?distance_format=km&timezone=UTC&from={NOW - 7 * DAY}&to={NOW}",
+        is_reusable=True,
+    )
+
+    with pytest.raises(ToolExecutionError):
+        await get_drive_summary(VIN, mock_context)
+
+
+@pytest.mark.asyncio
+async def test_get_drive_summary_invalid_days(mock_context: ToolContext) -> None:
+    with pytest.raises(ToolExecutionError):
+        await get_drive_summary(VIN, mock_context, days=0)
@@ -0,0 +1,133 @@
+import pytest
+from pytest_httpx import HTTPXMock
+
+from arcade_tdk import ToolContext, ToolSecretItem
+from arcade_tdk.errors import ToolExecutionError
+
+from tessie.instrumentation import InMemoryExporter, Instrumentation, default_instrumentation, endpoint_of
+from tessie.tools.car import get_location
+
+VEHICLE_DATA_URL = "https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF555555/vehicle_data?endpoints=drive_state"
+DRIVE_STATE = {"response": {"drive_state": {"latitude": 37.4929681, "longitude": -121.9453489}}}
+
+
+@pytest.fixture
+def mock_context():
+    context = ToolContext()
+    context.secrets = []
+    context.secrets.append(
+        ToolSecretItem(
+            key="TESSIE_TOKEN", value="TESSIE_TOKEN"
+        )
+    )
+    return context
+
+
+@pytest.fixture
+def exporter():
+    exporter = InMemoryExporter()
+    default_instrumentation.enable(exporter)
+    yield exporter
+    default_instrumentation.disable()
+    default_instrumentation.reset_metrics()
+
+
+def test_endpoint_of() -> None:
+    assert endpoint_of("/api/1/vehicles/5YJ3E1EA4KF555555/vehicle_data?endpoints=drive_state") \
+        == "/api/1/vehicles/{vin}/vehicle_data"
+    assert endpoint_of("https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF555555/invitations/42/revoke") \
+        == "/api/1/vehicles/{vin}/invitations/{id}/revoke"
+    assert endpoint_of("/5YJ3E1EA4KF555555/state?use_cache=true") == "/{vin}/state"
+
+
+def test_disabled_records_nothing() -> None:
+    instrumentation = Instrumentation()
+    exporter = InMemoryExporter()
+    instrumentation._exporters.append(exporter)
+
+    with instrumentation.span("request") as span:
+        span.set_attribute("status", 200)
+    instrumentation.count("tessie.request.retries", endpoint="/x")
+    instrumentation.observe("tessie.request.duration", 0.1, endpoint="/x")
+
+    assert exporter.spans == []
+    assert instrumentation.snapshot() == ([], [])
+
+
+@pytest.mark.asyncio
+async def test_tool_call_is_traced(httpx_mock: HTTPXMock, mock_context: ToolContext,
+                                   exporter: InMemoryExporter) -> None:
+    httpx_mock.add_response(method="GET", url=VEHICLE_DATA_URL, json=DRIVE_STATE)
+
+    await get_location("5YJ3E1EA4KF555555", mock_context)
+    await get_location("5YJ3E1EA4KF555555", mock_context)
+
+    tool_spans = exporter.named("tool.get_location")
+    request, = exporter.named("tessie.request")
+    attempt, = exporter.named("http.request")
+    decode, = exporter.named("json.decode")
+    validate, = exporter.named("model.validate")
+    assert len(tool_spans) == 2
+    assert request.parent_id == tool_spans[0].span_id
+    assert attempt.parent_id == request.span_id
+    assert decode.parent_id == request.span_id
+    assert validate.parent_id == tool_spans[0].span_id
+    assert attempt.attributes == {"method": "GET", "endpoint": "/api/1/vehicles/{vin}/vehicle_data", "status": 200}
+    assert validate.attributes == {"model": "VehicleSnapshot"}
+
+    duration = default_instrumentation.histogram(
+        "tessie.request.duration", method="GET", endpoint="/api/1/vehicles/{vin}/vehicle_data", status=200
+    )
+    assert duration is not None and duration.count == 1
+    assert default_instrumentation.counter("tessie.cache.misses", endpoint="drive_state") == 1
+    assert default_instrumentation.counter("tessie.cache.hits", endpoint="drive_state") == 1
+    assert default_instrumentation.histogram("tessie.tool.duration", tool="get_location", outcome="ok").count == 2
+
+
+@pytest.mark.asyncio
+async def test_retries_and_errors_are_counted(httpx_mock: HTTPXMock, mock_context: ToolContext,
+                                              exporter: InMemoryExporter) -> None:
+    httpx_mock.add_response(method="GET", url=VEHICLE_DATA_URL, status_code=503)
+    httpx_mock.add_response(method="GET", url=VEHICLE_DATA_URL, json=DRIVE_STATE)
+
+    await get_location("5YJ3E1EA4KF555555", mock_context)
+
+    endpoint = "/api/1/vehicles/{vin}/vehicle_data"
+    assert default_instrumentation.counter("tessie.request.retries", method="GET", endpoint=endpoint) == 1
+    assert default_instrumentation.counter("tessie.request.errors", endpoint=endpoint, error=503) == 1
+    assert [span.attributes["status"] for span in exporter.named("http.request")] == [503, 200]
+
+
+@pytest.mark.asyncio
+async def test_tool_errors_are_counted(httpx_mock: HTTPXMock, mock_context: ToolContext,
+                                       exporter: InMemoryExporter) -> None:
+    httpx_mock.add_response(method="GET", url=VEHICLE_DATA_URL, status_code=404, json={"error": "Not found"})
+
+    with pytest.raises(ToolExecutionError):
+        await get_location("5YJ3E1EA4KF555555", mock_context)
+
+    tool_span, = exporter.named("tool.get_location")
+    assert tool_span.status == "error"
+    assert default_instrumentation.counter("tessie.tool.errors", tool="get_location", error="ToolExecutionError") == 1
+    counters, histograms = default_instrumentation.snapshot()
+    assert {counter.name for counter in counters} == {"tessie.cache.misses", "tessie.request.errors", "tessie.tool.errors"}
+    assert {histogram.name for histogram in histograms} == {"tessie.request.duration", "tessie.tool.duration"}
+
+
+@pytest.mark.asyncio
+async def test_httpx_tracer_creates_phase_spans() -> None:
+    instrumentation = Instrumentation(enabled=True)
+    exporter = InMemoryExporter()
+    instrumentation.enable(exporter)
+
+    with instrumentation.span("http.request") as parent:
+        trace = instrumentation.httpx_tracer()
+        await trace("connection.connect_tcp.started", {})
+        await trace("connection.connect_tcp.complete", {})
+        await trace("connection.start_tls.started", {})
+        await trace("connection.start_tls.failed", {"exception": ConnectionResetError()})
+
+    connect, tls, request = exporter.spans
+    assert (connect.name, connect.parent_id, connect.status) == ("connection.connect_tcp", parent.span_id, "ok")
+    assert (tls.name, tls.status) == ("connection.start_tls", "error")
+    assert request.name == "http.request"
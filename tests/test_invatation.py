@@ -1,3 +1,6 @@
+import asyncio
+
+import httpx
 import pytest
 from pytest_httpx import HTTPXMock
 
@@ -177,4 +180,130 @@ async def test_revoke_invitation_server_error(httpx_mock: HTTPXMock, mock_contex
     )
 
     with pytest.raises(Exception):
-        await revoke_invitation("5YJ3E1EA4KF555555", "inv_123", mock_context)
\ No newline at end of file
+        await revoke_invitation("5YJ3E1EA4KF555555", "inv_123", mock_context)
+
+@pytest.mark.asyncio
+async def test_create_invitation_updates_cached_list(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    httpx_mock.add_response(
+        method="GET",
+        status_code=200,
+        url="https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF555555/invitations",
+        json={
+            "response": []
+        },
+    )
+    httpx_mock.add_response(
+        method="POST",
+        status_code=200,
+        url="https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF555555/invitations",
+        json={
+            "response": {
+                "id_s": "429509621657",
+                "state": "pending",
+                "share_link": "https://tessie.com/share/new_inv_123"
+            }
+        },
+    )
+
+    await list_invitation("5YJ3E1EA4KF555555", mock_context)
+    await create_invitation("5YJ3E1EA4KF555555", mock_context)
+
+    assert await list_invitation("5YJ3E1EA4KF555555", mock_context) == {
+        "invitations": [
+            {
+                "id": "429509621657",
+                "state": "pending",
+                "share_link": "https://tessie.com/share/new_inv_123"
+            }
+        ]
+    }
+    assert len(httpx_mock.get_requests()) == 2
+
+@pytest.mark.asyncio
+async def test_revoke_invitation_updates_cached_list(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    httpx_mock.add_response(
+        method="GET",
+        status_code=200,
+        url="https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF555555/invitations",
+        json={
+            "response": [
+                {
+                    "id_s": "inv_123",
+                    "state": "pending",
+                    "share_link": "https://tessie.com/share/inv_123"
+                },
+                {
+                    "id_s": "inv_456",
+                    "state": "pending",
+                    "share_link": "https://tessie.com/share/inv_456"
+                },
+            ]
+        },
+    )
+    httpx_mock.add_response(
+        method="POST",
+        status_code=200,
+        url="https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF555555/invitations/inv_123/revoke",
+        json={
+            "response": "true"
+        },
+    )
+
+    await list_invitation("5YJ3E1EA4KF555555", mock_context)
+    await revoke_invitation("5YJ3E1EA4KF555555", "inv_123", mock_context)
+
+    assert await list_invitation("5YJ3E1EA4KF555555", mock_context) == {
+        "invitations": [
+            {
+                "id": "inv_456",
+                "state": "pending",
+                "share_link": "https://tessie.com/share/inv_456"
+            }
+        ]
+    }
+    assert len(httpx_mock.get_requests()) == 2
+
+@pytest.mark.asyncio
+async def test_list_started_before_create_does_not_overwrite_it(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    new_invitation = {
+        "id_s": "429509621657",
+        "state": "pending",
+        "share_link": "https://tessie.com/share/new_inv_123"
+    }
+    lists = [[], [new_invitation]]
+
+    async def list_response(request: httpx.Request) -> httpx.Response:
+        invitations = lists.pop(0)
+        await asyncio.sleep(0.1 if not invitations else 0)
+        return httpx.Response(status_code=200, json={"response": invitations})
+
+    httpx_mock.add_callback(
+        list_response,
+        method="GET",
+        url="https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF555555/invitations",
+        is_reusable=True,
+    )
+    httpx_mock.add_response(
+        method="POST",
+        status_code=200,
+        url="https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF555555/invitations",
+        json={"response": new_invitation},
+    )
+
+    before = asyncio.ensure_future(list_invitation("5YJ3E1EA4KF555555", mock_context))
+    await asyncio.sleep(0.01)
+    await create_invitation("5YJ3E1EA4KF555555", mock_context)
+    after = await list_invitation("5YJ3E1EA4KF555555", mock_context)
+
+    assert await before == {"invitations": []}
+    expected = {
+        "invitations": [
+            {
+                "id": "429509621657",
+                "state": "pending",
+                "share_link": "https://tessie.com/share/new_inv_123"
+            }
+        ]
+    }
+    assert after == expected
+    assert await list_invitation("5YJ3E1EA4KF555555", mock_context) == expected
@@ -0,0 +1,149 @@
+import subprocess
+import sys
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+
+from arcade_tdk import ToolContext, ToolSecretItem
+from arcade_tdk.errors import ToolExecutionError
+
+from tessie.mock import MockConfig, MockServer, MockTessieTransport
+from tessie.pool import default_pool, resolve_base_url, transport_from_env
+from tessie.tessie_client import TessieClient
+from tessie.tools.car import get_battery_v2, get_location
+from tessie.tools.drivers import delete_driver, list_driver
+from tessie.tools.fleet import get_fleet_battery
+from tessie.tools.history import get_drive_summary
+from tessie.tools.invitation import create_invitation, list_invitation, revoke_invitation
+
+VIN = "5YJ3E1EA4KF000001"
+
+
+@pytest.fixture
+def mock_context():
+    context = ToolContext()
+    context.secrets = []
+    context.secrets.append(
+        ToolSecretItem(
+            key="TESSIE_TOKEN", value="TESSIE_TOKEN"
+        )
+    )
+    return context
+
+
+@pytest.fixture
+def transport():
+    transport = MockTessieTransport(MockConfig(latency=0, seed=1))
+    default_pool.set_transport(transport)
+    yield transport
+    default_pool.set_transport(None)
+
+
+def test_resolve_base_url() -> None:
+    assert resolve_base_url("tessie") == "https://api.tessie.com"
+    assert resolve_base_url("fleet-eu") == "https://fleet-api.prd.eu.vn.cloud.tesla.com"
+    assert resolve_base_url("http://localhost:8080/") == "http://localhost:8080"
+
+
+@pytest.mark.asyncio
+async def test_base_url_from_env(httpx_mock: HTTPXMock, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("TESSIE_BASE_URL", "fleet-na")
+    httpx_mock.add_response(
+        method="GET",
+        url=f"https://fleet-api.prd.na.vn.cloud.tesla.com/api/1/vehicles/{VIN}",
+        json={"response": {"state": "online"}},
+    )
+
+    client = TessieClient("TESSIE_TOKEN")
+    assert (await client.get_vehicle_status(VIN)).state == "online"
+
+
+def test_transport_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    assert transport_from_env() is None
+
+    monkeypatch.setenv("TESSIE_TRANSPORT", "mock")
+    monkeypatch.setenv("TESSIE_MOCK_LATENCY", "0.2")
+    transport = transport_from_env()
+
+    assert isinstance(transport, MockTessieTransport)
+    assert transport.config.latency == 0.2
+
+
+def test_tools_do_not_import_the_mock() -> None:
+    loaded = subprocess.run(
+        [sys.executable, "-c", "import sys, tessie.tools.car; print('tessie.mock' in sys.modules)"],
+        capture_output=True, text=True, check=True,
+    )
+
+    assert loaded.stdout.strip() == "False"
+
+
+@pytest.mark.asyncio
+async def test_tools_run_against_mock(transport: MockTessieTransport, mock_context: ToolContext) -> None:
+    location = await get_location(VIN, mock_context)
+    battery = await get_battery_v2(VIN, mock_context)
+    fleet = await get_fleet_battery(transport.vins, mock_context)
+    summary = await get_drive_summary(VIN, mock_context, days=2)
+
+    assert set(location) == {"latitude", "longitude"}
+    assert 20 <= battery["battery_level"] <= 95
+    assert set(fleet["vehicles"]) == set(transport.vins)
+    assert summary["drives"] == 8
+    assert transport.stats().routes["drives"] == 1
+
+
+@pytest.mark.asyncio
+async def test_mock_keeps_invitations_and_drivers(transport: MockTessieTransport, mock_context: ToolContext) -> None:
+    created = await create_invitation(VIN, mock_context)
+    assert len((await list_invitation(VIN, mock_context, force_refresh=True))["invitations"]) == 3
+
+    assert await revoke_invitation(VIN, created["id"], mock_context) == {"success": True}
+    assert len((await list_invitation(VIN, mock_context, force_refresh=True))["invitations"]) == 2
+
+    drivers = (await list_driver(VIN, mock_context))["drivers"]
+    assert drivers[0] == {"user_id": "1000", "name": "Driver0 Mock"}
+    assert await delete_driver(VIN, "1000", mock_context) == {"success": True}
+    assert len((await list_driver(VIN, mock_context, force_refresh=True))["drivers"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_mock_injects_errors(mock_context: ToolContext) -> None:
+    transport = MockTessieTransport(MockConfig(latency=0, error_rate=1.0))
+    default_pool.set_transport(transport)
+    try:
+        with pytest.raises(ToolExecutionError):
+            await get_location(VIN, mock_context)
+    finally:
+        default_pool.set_transport(None)
+
+    stats = transport.stats()
+    assert stats.requests == 3
+    assert stats.errors == 3
+
+
+@pytest.mark.asyncio
+async def test_mock_unknown_route() -> None:
+    transport = MockTessieTransport(MockConfig(latency=0))
+    client = TessieClient("TESSIE_TOKEN", base_url="http://mock")
+    default_pool.set_transport(transport)
+    try:
+        with pytest.raises(httpx.HTTPStatusError) as exc_info:
+            await client.do_request("GET", "http://mock/unknown")
+    finally:
+        default_pool.set_transport(None)
+    assert exc_info.value.response.status_code == 404
+    assert transport.stats().routes == {}
+
+
+@pytest.mark.asyncio
+async def test_mock_server_reuses_connections(mock_context: ToolContext, monkeypatch: pytest.MonkeyPatch) -> None:
+    async with MockServer(MockTessieTransport(MockConfig(latency=0))) as server:
+        monkeypatch.setenv("TESSIE_BASE_URL", server.url)
+        for vin in server.transport.vins:
+            await get_location(vin, mock_context)
+        await list_driver(VIN, mock_context)
+        await default_pool.aclose()
+
+    assert server.connections == 1
+    assert server.transport.stats().routes == {"vehicle_data": 3, "drivers": 1}
@@ -0,0 +1,149 @@
+from typing import Optional
+
+import pytest
+from pytest_httpx import HTTPXMock
+
+from arcade_tdk import ToolContext, ToolSecretItem
+
+from tessie.poller import PollSchedule, TelemetryPoller
+from tessie.store import StateStore
+from tessie.tessie_client import TessieClient
+from tessie.tools.car import get_location
+
+VIN = "5YJ3E1EA4KF555555"
+OTHER_VIN = "5YJ3E1EA4KF111111"
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def mock_context():
+    context = ToolContext()
+    context.secrets = []
+    context.secrets.append(
+        ToolSecretItem(
+            key="TESSIE_TOKEN", value="TESSIE_TOKEN"
+        )
+    )
+    return context
+
+
+def add_vehicle(httpx_mock: HTTPXMock, vin: str, state: str, shift_state: Optional[str] = None) -> None:
+    httpx_mock.add_response(
+        method="GET",
+        url=f"https://api.tessie.com/api/1/vehicles/{vin}",
+        json={"response": {"vin": vin, "state": state}},
+        is_reusable=True,
+    )
+    vehicle_state = {
+        "drive_state": {"latitude": 37.4929681, "longitude": -121.9453489, "shift_state": shift_state},
+        "charge_state": {"battery_level": 85, "battery_range": 275, "charging_state": "Disconnected"},
+    }
+    if state == "online":
+        httpx_mock.add_response(
+            method="GET",
+            url=f"https://api.tessie.com/api/1/vehicles/{vin}/vehicle_data?endpoints=drive_state;charge_state",
+            json={"response": vehicle_state},
+            is_reusable=True,
+        )
+    else:
+        httpx_mock.add_response(
+            method="GET",
+            url=f"https://api.tessie.com/{vin}/state?use_cache=true",
+            json={"vin": vin, "state": state, **vehicle_state},
+            is_reusable=True,
+        )
+    httpx_mock.add_response(
+        method="GET",
+        url=f"https://api.tessie.com/api/1/vehicles/{vin}/drivers",
+        json={"response": []},
+        is_reusable=True,
+    )
+    httpx_mock.add_response(
+        method="GET",
+        url=f"https://api.tessie.com/api/1/vehicles/{vin}/invitations",
+        json={"response": []},
+        is_reusable=True,
+    )
+
+
+@pytest.mark.asyncio
+async def test_poll_driving_car_uses_short_interval(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    add_vehicle(httpx_mock, VIN, "online", shift_state="D")
+    poller = TelemetryPoller(TessieClient("TESSIE_TOKEN"), [VIN])
+
+    assert await poller.poll_once(VIN) == PollSchedule().driving
+    requests = len(httpx_mock.get_requests())
+
+    location = await get_location(VIN, mock_context)
+
+    assert location["latitude"] == "37.492968100"
+    assert location["live"] is True
+    assert location["as_of"]
+    assert len(httpx_mock.get_requests()) == requests
+
+
+@pytest.mark.asyncio
+async def test_poll_sleeping_car_does_not_wake_it(httpx_mock: HTTPXMock) -> None:
+    add_vehicle(httpx_mock, VIN, "asleep")
+    client = TessieClient("TESSIE_TOKEN")
+    poller = TelemetryPoller(client, [VIN])
+
+    assert await poller.poll_once(VIN) == PollSchedule().asleep
+    assert client.store.get(client.token_key, VIN).mode == "asleep"
+    assert not httpx_mock.get_requests(url=f"https://api.tessie.com/api/1/vehicles/{VIN}/vehicle_data?endpoints=drive_state;charge_state")
+
+
+@pytest.mark.asyncio
+async def test_run_once_follows_adaptive_schedule(httpx_mock: HTTPXMock) -> None:
+    add_vehicle(httpx_mock, VIN, "online", shift_state="D")
+    add_vehicle(httpx_mock, OTHER_VIN, "online")
+    clock = FakeClock()
+    client = TessieClient("TESSIE_TOKEN", store=StateStore(clock=clock))
+    poller = TelemetryPoller(client, [VIN, OTHER_VIN], clock=clock, sleep=clock.sleep)
+
+    assert await poller.run_once() == 15.0
+    assert poller.next_poll(OTHER_VIN) == 300.0
+
+    await clock.sleep(15.0)
+    await poller.run_once()
+
+    assert poller.next_poll(VIN) == 30.0
+    assert poller.next_poll(OTHER_VIN) == 300.0
+    assert client.store.fresh(client.token_key, OTHER_VIN) is not None
+
+    await clock.sleep(600.0)
+    assert client.store.fresh(client.token_key, OTHER_VIN) is None
+
+
+@pytest.mark.asyncio
+async def test_sharing_lists_are_served_from_store(httpx_mock: HTTPXMock) -> None:
+    add_vehicle(httpx_mock, VIN, "online")
+    httpx_mock.add_response(
+        method="POST",
+        url=f"https://api.tessie.com/api/1/vehicles/{VIN}/invitations",
+        json={"response": {"id_s": "7", "share_link": "https://example.com/7", "state": "pending"}},
+    )
+    client = TessieClient("TESSIE_TOKEN")
+    poller = TelemetryPoller(client, [VIN])
+    await poller.poll_once(VIN)
+    client.cache.clear()
+    requests = len(httpx_mock.get_requests())
+
+    assert (await client.list_driver(VIN)).drivers == []
+    assert (await client.list_invitations(VIN)).invitations == []
+    assert len(httpx_mock.get_requests()) == requests
+
+    # A change makes the polled list outdated, so the next read goes upstream.
+    await client.create_invitation(VIN)
+    await client.list_invitations(VIN)
+    assert len(httpx_mock.get_requests()) == requests + 2
@@ -0,0 +1,51 @@
+import pytest
+from pytest_httpx import HTTPXMock
+
+from tessie.pool import ClientPool, PoolConfig
+from tessie.tessie_client import TessieClient
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_client_per_token() -> None:
+    pool = ClientPool()
+
+    first = pool.get("TOKEN_A")
+    assert pool.get("TOKEN_A") is first
+    assert pool.get("TOKEN_B") is not first
+    assert pool.get("TOKEN_A", "http://localhost:8080") is not first
+    assert len(pool) == 3
+
+    await pool.aclose()
+    assert len(pool) == 0
+    assert first.is_closed
+
+
+@pytest.mark.asyncio
+async def test_pool_recreates_closed_client() -> None:
+    pool = ClientPool(PoolConfig(http2=False))
+
+    first = pool.get("TOKEN_A")
+    await first.aclose()
+
+    assert pool.get("TOKEN_A") is not first
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_clients_share_pooled_connection(httpx_mock: HTTPXMock) -> None:
+    pool = ClientPool()
+    httpx_mock.add_response(
+        method="GET",
+        url="https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF555555/drivers",
+        json={"response": []},
+        is_reusable=True,
+    )
+
+    await TessieClient("TOKEN_A", pool=pool).list_driver("5YJ3E1EA4KF555555")
+    await TessieClient("TOKEN_A", pool=pool).list_driver("5YJ3E1EA4KF555555", force_refresh=True)
+
+    assert len(pool) == 1
+    requests = httpx_mock.get_requests()
+    assert len(requests) == 2
+    assert all(request.headers["Authorization"] == "Bearer TOKEN_A" for request in requests)
+    await pool.aclose()
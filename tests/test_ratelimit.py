@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+from pytest_httpx import HTTPXMock
+
+from tessie.pool import token_fingerprint
+from tessie.ratelimit import RateLimitConfig, RateLimiter, default_limiters, parse_retry_after
+from tessie.tessie_client import TessieClient
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.now += seconds
+        await asyncio.sleep(0)
+
+
+def test_parse_retry_after() -> None:
+    assert parse_retry_after("5") == 5.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:10 GMT", now=1445412480.0) == 10.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_queues_beyond_burst() -> None:
+    clock = FakeClock()
+    limiter = RateLimiter(RateLimitConfig(rate=2.0, burst=2), clock=clock, sleep=clock.sleep)
+
+    for _ in range(4):
+        async with limiter.slot():
+            pass
+
+    assert clock.now == pytest.approx(1.0)
+    stats = limiter.stats()
+    assert stats.requests == 4
+    assert stats.max_wait == pytest.approx(0.5)
+    assert stats.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_admits_in_arrival_order() -> None:
+    limiter = RateLimiter(RateLimitConfig(rate=1000.0, burst=1))
+    order: list[int] = []
+
+    async def call(index: int) -> None:
+        async with limiter.slot():
+            order.append(index)
+            await asyncio.sleep(0)
+
+    await asyncio.gather(*[call(index) for index in range(20)])
+
+    assert order == list(range(20))
+
+
+@pytest.mark.asyncio
+async def test_throttled_response_is_queued_again(httpx_mock: HTTPXMock) -> None:
+    httpx_mock.add_response(
+        method="GET",
+        status_code=429,
+        url="https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF555555/drivers",
+        headers={"Retry-After": "0"},
+        json={"error": "Too many requests"},
+    )
+    httpx_mock.add_response(
+        method="GET",
+        status_code=200,
+        url="https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF555555/drivers",
+        json={"response": []},
+    )
+
+    drivers = await TessieClient("TESSIE_TOKEN").list_driver("5YJ3E1EA4KF555555")
+
+    assert drivers.drivers == []
+    stats = default_limiters.get(token_fingerprint("TESSIE_TOKEN")).stats()
+    assert stats.throttled == 1
+    assert stats.requests == 2
+    assert stats.rate < RateLimitConfig().rate
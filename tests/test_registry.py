@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+from pytest_httpx import HTTPXMock
+
+from arcade_tdk import ToolContext, ToolSecretItem
+
+from tessie.cache import default_cache
+from tessie.geo import default_geo
+from tessie.pool import default_pool
+from tessie.registry import ClientRegistry, default_clients
+from tessie.store import default_store
+from tessie.tessie_client import TessieClient
+from tessie.tools.car import get_location
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def mock_context():
+    context = ToolContext()
+    context.secrets = []
+    context.secrets.append(
+        ToolSecretItem(
+            key="TESSIE_TOKEN", value="TESSIE_TOKEN"
+        )
+    )
+    return context
+
+
+@pytest.mark.asyncio
+async def test_concurrent_gets_share_one_client() -> None:
+    registry = ClientRegistry()
+
+    clients = await asyncio.gather(*[registry.get("token-a") for _ in range(50)])
+    other = await registry.get("token-b")
+
+    assert all(client is clients[0] for client in clients)
+    assert other is not clients[0]
+    assert registry.stats().model_dump() == {"clients": 2, "created": 2, "reused": 49, "evicted": 0}
+
+
+@pytest.mark.asyncio
+async def test_idle_clients_are_evicted_with_their_state() -> None:
+    clock = FakeClock()
+    registry = ClientRegistry(idle_timeout=60.0, clock=clock)
+    idle = await registry.get("token-a")
+    default_pool.get("token-a")
+    default_cache.set(idle._cache_key("5YJ3E1EA4KF555555", "drive_state"), {"latitude": 1.0})
+
+    clock.now = 30.0
+    busy = await registry.get("token-b")
+    clock.now = 61.0
+    assert await registry.evict_idle() == 1
+
+    assert len(registry) == 1
+    assert len(default_cache) == 0
+    assert len(default_pool) == 0
+    assert await registry.get("token-b") is busy
+    assert await registry.get("token-a") is not idle
+
+
+@pytest.mark.asyncio
+async def test_eviction_keeps_state_other_holders_use() -> None:
+    clock = FakeClock()
+    registry = ClientRegistry(idle_timeout=60.0, clock=clock)
+    registered = await registry.get("token-a")
+    polling = TessieClient("token-a")
+    default_store.update(polling.token_key, "5YJ3E1EA4KF555555", valid_for=60.0, mode="parked")
+    default_geo.get(polling.token_key).update("5YJ3E1EA4KF555555", 37.5, -121.9)
+
+    async with registered.held():
+        pooled = default_pool.get("token-a")
+        clock.now = 61.0
+        assert await registry.evict_idle() == 1
+        assert not pooled.is_closed
+
+    assert default_store.get(polling.token_key, "5YJ3E1EA4KF555555") is not None
+    assert len(default_geo) == 1
+    assert len(default_pool) == 1
+
+    await polling.aclose()
+    assert len(default_store) == 0
+    assert len(default_geo) == 0
+    assert len(default_pool) == 0
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_client_is_evicted_at_capacity() -> None:
+    registry = ClientRegistry(max_clients=2)
+    first = await registry.get("token-a")
+    await registry.get("token-b")
+    assert await registry.get("token-a") is first
+
+    await registry.get("token-c")
+
+    assert len(registry) == 2
+    assert registry.stats().evicted == 1
+    assert await registry.get("token-a") is first
+
+
+@pytest.mark.asyncio
+async def test_tools_reuse_the_registered_client(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    httpx_mock.add_response(
+        method="GET",
+        url="https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF555555/vehicle_data?endpoints=drive_state",
+        json={"response": {"drive_state": {"latitude": 37.5, "longitude": -121.9}}},
+        is_reusable=True,
+    )
+
+    await get_location("5YJ3E1EA4KF555555", mock_context, force_refresh=True)
+    await get_location("5YJ3E1EA4KF555555", mock_context, force_refresh=True)
+
+    assert default_clients.stats().model_dump() == {"clients": 1, "created": 1, "reused": 1, "evicted": 0}
@@ -0,0 +1,33 @@
+import httpx
+import pytest
+
+from tessie.retry import RetryPolicy
+
+
+def _status_error(status_code: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://api.tessie.com/api/1/vehicles")
+    return httpx.HTTPStatusError("error", request=request, response=httpx.Response(status_code, request=request))
+
+
+def test_retry_only_idempotent_methods() -> None:
+    policy = RetryPolicy()
+
+    assert policy.should_retry("GET", _status_error(502), attempt=1)
+    assert not policy.should_retry("POST", _status_error(502), attempt=1)
+    assert not policy.should_retry("GET", _status_error(404), attempt=1)
+    assert policy.should_retry("GET", httpx.ConnectError("reset"), attempt=1)
+
+
+def test_retry_stops_after_max_attempts() -> None:
+    policy = RetryPolicy(max_attempts=3)
+
+    assert policy.should_retry("GET", _status_error(500), attempt=2)
+    assert not policy.should_retry("GET", _status_error(500), attempt=3)
+
+
+def test_backoff_is_capped_and_jittered() -> None:
+    policy = RetryPolicy(backoff_base=1.0, backoff_max=4.0)
+
+    delays = [policy.backoff(10) for _ in range(100)]
+    assert all(0 <= delay <= 4.0 for delay in delays)
+    assert len(set(delays)) > 1
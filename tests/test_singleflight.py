@@ -0,0 +1,81 @@
+import asyncio
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+
+from arcade_tdk import ToolContext, ToolSecretItem
+
+from tessie.singleflight import SingleFlight, default_singleflight
+from tessie.tools.car import get_battery
+
+
+@pytest.fixture
+def mock_context():
+    context = ToolContext()
+    context.secrets = []
+    context.secrets.append(
+        ToolSecretItem(
+            key="TESSIE_TOKEN", value="TESSIE_TOKEN"
+        )
+    )
+    return context
+
+
+@pytest.mark.asyncio
+async def test_concurrent_get_battery_shares_one_request(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    async def slow_response(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.05)
+        return httpx.Response(
+            status_code=200,
+            json={"response": {"charge_state": {"battery_level": 85, "battery_range": 275}}},
+        )
+
+    httpx_mock.add_callback(
+        slow_response,
+        method="GET",
+        url="https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF555555/vehicle_data?endpoints=charge_state",
+    )
+
+    results = await asyncio.gather(*[
+        get_battery("5YJ3E1EA4KF555555", mock_context, force_refresh=True)
+        for _ in range(300)
+    ])
+
+    assert len(httpx_mock.get_requests()) == 1
+    assert all(result == {"battery_level": "85.000000000", "battery_range": "275.000000000"} for result in results)
+    assert default_singleflight.stats().shared == 299
+
+
+@pytest.mark.asyncio
+async def test_singleflight_shares_exceptions_and_forgets_key() -> None:
+    group = SingleFlight()
+    calls = 0
+
+    async def failing() -> None:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(*[group.do("key", failing) for _ in range(10)], return_exceptions=True)
+
+    assert calls == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert group.stats().in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_singleflight_survives_cancelled_waiter() -> None:
+    group = SingleFlight()
+
+    async def slow() -> str:
+        await asyncio.sleep(0.02)
+        return "done"
+
+    first = asyncio.ensure_future(group.do("key", slow))
+    second = asyncio.ensure_future(group.do("key", slow))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == "done"
@@ -0,0 +1,74 @@
+import asyncio
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+
+from arcade_tdk import ToolContext, ToolSecretItem
+
+from tessie.singleflight import default_refreshes
+from tessie.tools.car import get_battery
+
+VEHICLE_DATA_URL = "https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF555555/vehicle_data?endpoints=charge_state"
+
+
+@pytest.fixture
+def mock_context():
+    context = ToolContext()
+    context.secrets = []
+    context.secrets.append(
+        ToolSecretItem(
+            key="TESSIE_TOKEN", value="TESSIE_TOKEN"
+        )
+    )
+    return context
+
+
+@pytest.mark.asyncio
+async def test_get_battery_serves_stale_and_refreshes_once(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    httpx_mock.add_response(
+        method="GET",
+        url=VEHICLE_DATA_URL,
+        json={"response": {"charge_state": {"battery_level": 80, "battery_range": 250}}},
+    )
+
+    async def sleeping_car(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.05)
+        return httpx.Response(
+            status_code=200,
+            json={"response": {"charge_state": {"battery_level": 79, "battery_range": 247}}},
+        )
+
+    httpx_mock.add_callback(sleeping_car, method="GET", url=VEHICLE_DATA_URL)
+
+    await get_battery("5YJ3E1EA4KF555555", mock_context)
+
+    results = await asyncio.gather(*[
+        get_battery("5YJ3E1EA4KF555555", mock_context, max_age=0, stale_while_revalidate=True)
+        for _ in range(20)
+    ])
+
+    assert all(result["battery_level"] == "80.000000000" for result in results)
+    assert all(result["stale"] is True and result["as_of"] for result in results)
+    assert default_refreshes.stats().calls == 1
+
+    await default_refreshes.drain()
+
+    refreshed = await get_battery("5YJ3E1EA4KF555555", mock_context)
+    assert refreshed["battery_level"] == "79.000000000"
+    assert "stale" not in refreshed
+    assert len(httpx_mock.get_requests()) == 2
+
+
+@pytest.mark.asyncio
+async def test_get_battery_without_cached_value_fetches(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    httpx_mock.add_response(
+        method="GET",
+        url=VEHICLE_DATA_URL,
+        json={"response": {"charge_state": {"battery_level": 80, "battery_range": 250}}},
+    )
+
+    assert await get_battery("5YJ3E1EA4KF555555", mock_context, stale_while_revalidate=True) == {
+        "battery_level": "80.000000000",
+        "battery_range": "250.000000000",
+    }
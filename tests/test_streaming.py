@@ -0,0 +1,148 @@
+import asyncio
+import json
+
+import pytest
+from pytest_httpx import HTTPXMock
+
+from arcade_tdk import ToolContext, ToolSecretItem
+
+from tessie.streaming import TelemetryStream, parse_sse
+from tessie.tessie_client import TessieClient
+from tessie.tools.car import get_battery
+
+STREAM_URL = "https://api.tessie.com/stream"
+VIN = "5YJ3E1EA4KF555555"
+OTHER_VIN = "5YJ3E1EA4KF111111"
+
+
+@pytest.fixture
+def mock_context():
+    context = ToolContext()
+    context.secrets = []
+    context.secrets.append(
+        ToolSecretItem(
+            key="TESSIE_TOKEN", value="TESSIE_TOKEN"
+        )
+    )
+    return context
+
+
+def sse(*events: tuple[str, dict]) -> bytes:
+    """Stand-in for the telemetry feed: encodes (id, payload) pairs as a text/event-stream body."""
+    return "".join(
+        f"id: {event_id}\nevent: telemetry\ndata: {json.dumps(payload)}\n\n" for event_id, payload in events
+    ).encode()
+
+
+async def lines(*items: str):
+    for item in items:
+        yield item
+
+
+@pytest.mark.asyncio
+async def test_parse_sse() -> None:
+    events = [
+        event async for event in parse_sse(lines(
+            ": keep-alive", "retry: 2000", "id: 7", "data: {\"a\":", "data: 1}", "",
+            "event: ping", "data: x", "",
+        ))
+    ]
+
+    assert events[0].id == "7"
+    assert events[0].retry == 2000
+    assert events[0].data == "{\"a\":\n1}"
+    assert events[1].event == "ping"
+
+
+@pytest.mark.asyncio
+async def test_stream_resumes_and_serves_tools_locally(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    httpx_mock.add_response(
+        method="GET",
+        url=STREAM_URL,
+        content=sse(
+            ("1", {"vin": VIN, "charge_state": {"battery_level": 85, "battery_range": 275}}),
+            ("2", {"vin": VIN, "drive_state": {"latitude": 37.5, "longitude": -121.9}}),
+        ),
+    )
+    httpx_mock.add_response(
+        method="GET",
+        url=STREAM_URL,
+        match_headers={"Last-Event-ID": "2"},
+        content=sse(
+            ("3", {"vin": VIN, "charge_state": {"battery_level": 80}}),
+        ),
+    )
+    stream = TelemetryStream(TessieClient("TESSIE_TOKEN"), STREAM_URL)
+
+    await stream.connect_once()
+    await stream.connect_once()
+    stream.flush()
+
+    battery = await get_battery(VIN, mock_context)
+    assert battery["battery_level"] == "80.000000000"
+    assert battery["battery_range"] == "275.000000000"
+    assert battery["live"] is True
+    assert stream.last_event_id == "3"
+    assert stream.stats.coalesced == 2
+    assert len(httpx_mock.get_requests()) == 2
+
+
+@pytest.mark.asyncio
+async def test_stream_applies_backpressure(httpx_mock: HTTPXMock) -> None:
+    httpx_mock.add_response(
+        method="GET",
+        url=STREAM_URL,
+        content=sse(
+            ("1", {"vin": VIN, "charge_state": {"battery_level": 85, "battery_range": 275}}),
+            ("2", {"vin": OTHER_VIN, "charge_state": {"battery_level": 60, "battery_range": 180}}),
+        ),
+    )
+    client = TessieClient("TESSIE_TOKEN")
+    stream = TelemetryStream(client, STREAM_URL, max_pending=1)
+
+    reader = asyncio.ensure_future(stream.connect_once())
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+    assert not reader.done()
+    assert stream.stats.backpressure_waits == 1
+
+    assert stream.flush() == 1
+    await reader
+    assert stream.flush() == 1
+    assert client.store.vins(client.token_key) == [OTHER_VIN, VIN]
+
+
+@pytest.mark.asyncio
+async def test_stream_ignores_invalid_events(httpx_mock: HTTPXMock) -> None:
+    httpx_mock.add_response(
+        method="GET",
+        url=STREAM_URL,
+        content=b"data: not json\n\ndata: {\"no_vin\": true}\n\ndata: [1, 2]\n\n"
+                b"data: {\"vin\": [\"x\"]}\n\ndata: {\"vin\": \"%s\", \"drive_state\": {}}\n\n" % VIN.encode(),
+    )
+    stream = TelemetryStream(TessieClient("TESSIE_TOKEN"), STREAM_URL)
+
+    await stream.connect_once()
+
+    assert stream.stats.invalid == 4
+    assert stream.flush() == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_to_other_host_does_not_send_token(httpx_mock: HTTPXMock) -> None:
+    httpx_mock.add_response(
+        method="GET",
+        url="https://telemetry.example.com/stream",
+        content=sse(("1", {"vin": VIN, "charge_state": {"battery_level": 85, "battery_range": 275}})),
+    )
+    httpx_mock.add_response(method="GET", url=STREAM_URL, content=b"")
+    client = TessieClient("TESSIE_TOKEN")
+
+    await TelemetryStream(client, "https://telemetry.example.com/stream", headers={"X-Feed-Key": "k"}).connect_once()
+    await TelemetryStream(client, "/stream").connect_once()
+
+    external, api = httpx_mock.get_requests()
+    assert "Authorization" not in external.headers
+    assert external.headers["X-Feed-Key"] == "k"
+    assert api.headers["Authorization"] == "Bearer TESSIE_TOKEN"
@@ -0,0 +1,136 @@
+import asyncio
+
+import pytest
+from pytest_httpx import HTTPXMock
+
+from arcade_tdk import ToolContext, ToolSecretItem
+from arcade_tdk.errors import ToolExecutionError
+
+from tessie.tenancy import FairScheduler, TenantBudget, TenantBudgetExceeded, default_scheduler
+from tessie.tools.car import get_location
+
+
+@pytest.fixture
+def mock_context():
+    context = ToolContext()
+    context.secrets = []
+    context.secrets.append(
+        ToolSecretItem(
+            key="TESSIE_TOKEN", value="TESSIE_TOKEN"
+        )
+    )
+    return context
+
+
+async def settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def grant_order(scheduler: FairScheduler, tenant_requests: dict[str, int]) -> list[str]:
+    """Queues the given number of requests per tenant on a busy scheduler and returns the order they run in."""
+    order: list[str] = []
+    await scheduler.acquire("blocker")
+
+    async def request(token_key: str) -> None:
+        await scheduler.acquire(token_key)
+        order.append(token_key)
+
+    tasks = [asyncio.ensure_future(request(token_key))
+             for token_key, count in tenant_requests.items() for _ in range(count)]
+    await settle()
+    scheduler.release("blocker")
+    for _ in tasks:
+        await settle()
+        scheduler.release(order[-1])
+    await asyncio.gather(*tasks)
+    return order
+
+
+@pytest.mark.asyncio
+async def test_backlog_of_one_tenant_does_not_starve_another() -> None:
+    order = await grant_order(FairScheduler(capacity=1), {"noisy": 20, "quiet": 3})
+
+    assert order[:6] == ["noisy", "quiet"] * 3
+    assert order[6:] == ["noisy"] * 17
+
+
+@pytest.mark.asyncio
+async def test_weights_share_slots_proportionally() -> None:
+    scheduler = FairScheduler(capacity=1)
+    scheduler.set_budget("gold", TenantBudget(weight=3.0))
+
+    order = await grant_order(scheduler, {"gold": 12, "basic": 12})
+
+    assert order[:8].count("gold") == 6
+
+
+@pytest.mark.asyncio
+async def test_tenant_concurrency_and_queue_budget() -> None:
+    scheduler = FairScheduler(capacity=10, default_budget=TenantBudget(max_in_flight=1, max_queued=1))
+    await scheduler.acquire("a")
+
+    waiting = asyncio.ensure_future(scheduler.acquire("a"))
+    await settle()
+    assert not waiting.done()
+    with pytest.raises(TenantBudgetExceeded):
+        await scheduler.acquire("a")
+    await scheduler.acquire("b")
+
+    scheduler.release("a")
+    await waiting
+    stats = scheduler.stats()
+    assert stats["a"].rejected == 1
+    assert stats["a"].in_flight == 1
+    assert stats["b"].in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_the_queue() -> None:
+    scheduler = FairScheduler(capacity=1)
+    await scheduler.acquire("a")
+    waiting = asyncio.ensure_future(scheduler.acquire("b"))
+    await settle()
+
+    waiting.cancel()
+    await settle()
+    scheduler.release("a")
+
+    assert scheduler.stats()["b"].queued == 0
+    await asyncio.wait_for(scheduler.acquire("c"), 1)
+
+
+@pytest.mark.asyncio
+async def test_requests_are_recorded_per_tenant(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    httpx_mock.add_response(
+        method="GET",
+        url="https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF555555/vehicle_data?endpoints=drive_state",
+        json={"response": {"drive_state": {"latitude": 37.5, "longitude": -121.9}}},
+        is_reusable=True,
+    )
+
+    await get_location("5YJ3E1EA4KF555555", mock_context)
+    await get_location("5YJ3E1EA4KF555555", mock_context, force_refresh=True)
+
+    [stats] = default_scheduler.stats().values()
+    assert stats.requests == 2
+    assert stats.errors == 0
+    assert stats.in_flight == 0
+    assert stats.latency_p99 >= stats.latency_p50 >= 0.0
+
+
+@pytest.mark.asyncio
+async def test_error_responses_are_recorded_per_tenant(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    httpx_mock.add_response(
+        method="GET",
+        status_code=404,
+        url="https://api.tessie.com/api/1/vehicles/5YJ3E1EA4KF555555/vehicle_data?endpoints=drive_state",
+        json={"error": "Car not found"},
+    )
+
+    with pytest.raises(ToolExecutionError):
+        await get_location("5YJ3E1EA4KF555555", mock_context)
+
+    [stats] = default_scheduler.stats().values()
+    assert stats.requests == 1
+    assert stats.errors == 1
@@ -0,0 +1,142 @@
+import math
+
+import numpy as np
+import pytest
+from pytest_httpx import HTTPXMock
+
+from arcade_tdk import ToolContext, ToolSecretItem
+
+from tessie import history
+from tessie.timeseries import SeriesBuilder, TelemetrySeries, haversine_km_array
+from tessie.tools import fleet
+from tessie.tools import history as history_tools
+from tessie.tools.fleet import get_fleet_energy_report
+from tessie.tools.history import get_energy_report
+
+VIN = "5YJ3E1EA4KF555555"
+OTHER_VIN = "5YJ3E1EA4KF111111"
+NOW = 1_700_000_000
+DAY = 86400
+
+
+@pytest.fixture
+def mock_context():
+    context = ToolContext()
+    context.secrets = []
+    context.secrets.append(
+        ToolSecretItem(
+            key="TESSIE_TOKEN", value="TESSIE_TOKEN"
+        )
+    )
+    return context
+
+
+@pytest.fixture(autouse=True)
+def frozen_time(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(history_tools.time, "time", lambda: NOW)
+    monkeypatch.setattr(fleet.time, "time", lambda: NOW)
+
+
+def trip() -> TelemetrySeries:
+    """Parked for two hours losing 1%, then 0.1 degrees north (about 11.1 km) using 2%, then charging."""
+    return TelemetrySeries(
+        timestamp=[0, 3600, 7200, 7800, 8400, 12000],
+        latitude=[37.0, 37.0, 37.0, 37.05, 37.1, 37.1],
+        longitude=[-122.0] * 6,
+        battery_level=[80, 79.5, 79, 78, 77, 90],
+    )
+
+
+def test_haversine_km_array_matches_scalar() -> None:
+    lat = np.array([37.0, 48.1, -33.9])
+    lon = np.array([-122.0, 11.6, 151.2])
+
+    distances = haversine_km_array(lat[:-1], lon[:-1], lat[1:], lon[1:])
+
+    assert distances == pytest.approx([history.haversine_km(37.0, -122.0, 48.1, 11.6),
+                                       history.haversine_km(48.1, 11.6, -33.9, 151.2)])
+
+
+def test_builder_fills_missing_values_and_sorts() -> None:
+    builder = SeriesBuilder()
+    builder.append({"timestamp": 20, "latitude": 1.0, "longitude": 2.0, "battery_level": 50})
+    builder.append({"timestamp": 10, "latitude": 3.0, "longitude": 4.0})
+
+    series = builder.build()
+
+    assert series.timestamp.tolist() == [10, 20]
+    assert series.latitude.tolist() == [3.0, 1.0]
+    assert math.isnan(series.battery_level[0])
+    assert series.battery_level[1] == 50
+    assert series.nbytes == 2 * 32
+
+
+def test_distance_energy_and_idle_drain() -> None:
+    series = trip()
+
+    assert series.distance_km() == pytest.approx(history.haversine_km(37.0, -122.0, 37.1, -122.0))
+    assert series.energy_per_km(75.0) == pytest.approx(0.02 * 75.0 / series.distance_km())
+    assert series.idle_drain() == pytest.approx(0.5)
+
+
+def test_between_and_resample() -> None:
+    series = trip()
+
+    assert series.between(3600, 8400).timestamp.tolist() == [3600, 7200, 7800]
+
+    hourly = series.resample(3600)
+    assert hourly.timestamp.tolist() == [0, 3600, 7200, 10800]
+    assert hourly.latitude.tolist() == pytest.approx([37.0, 37.0, 37.05, 37.1])
+    assert hourly.battery_level.tolist() == pytest.approx([80, 79.5, 78, 90])
+    assert np.isnan(hourly.battery_range).all()
+
+
+def test_empty_series() -> None:
+    series = TelemetrySeries.concat([])
+
+    assert len(series) == 0
+    assert series.distance_km() == 0.0
+    assert series.energy_per_km(75.0) is None
+    assert series.idle_drain() is None
+    assert len(series.resample(60)) == 0
+
+
+def add_path(httpx_mock: HTTPXMock, vin: str, days: int) -> None:
+    records = [
+        {"timestamp": t, "latitude": lat, "longitude": -122.0, "battery_level": level}
+        for t, lat, level in zip(trip().timestamp.tolist(), trip().latitude.tolist(), trip().battery_level.tolist())
+    ]
+    start = NOW - days * DAY
+    for page_start in range(start, NOW, 3 * 3600):
+        page = [{**record, "timestamp": record["timestamp"] + start} for record in records
+                if page_start <= record["timestamp"] + start < page_start + 3 * 3600]
+        httpx_mock.add_response(
+            method="GET",
+            url=f"https://api.tessie.com/{vin}/path?separate=false&from={page_start}&to={page_start + 3 * 3600}",
+            json={"results": page},
+        )
+
+
+@pytest.mark.asyncio
+async def test_get_energy_report(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    add_path(httpx_mock, VIN, days=1)
+
+    result = await get_energy_report(VIN, mock_context, days=1)
+
+    distance = history.haversine_km(37.0, -122.0, 37.1, -122.0)
+    assert result["points"] == 6
+    assert result["distance_km"] == pytest.approx(distance)
+    assert result["kwh_per_km"] == pytest.approx(1.5 / distance)
+    assert result["idle_drain_per_hour"] == pytest.approx(0.5)
+
+
+@pytest.mark.asyncio
+async def test_get_fleet_energy_report(httpx_mock: HTTPXMock, mock_context: ToolContext) -> None:
+    add_path(httpx_mock, VIN, days=1)
+    add_path(httpx_mock, OTHER_VIN, days=1)
+
+    result = await get_fleet_energy_report([VIN, OTHER_VIN], mock_context, days=1, battery_capacity_kwh=100.0)
+
+    assert list(result["vehicles"]) == [OTHER_VIN, VIN]
+    assert result["vehicles"][VIN]["kwh_per_km"] == pytest.approx(2.0 / history.haversine_km(37.0, -122.0, 37.1, -122.0))
+    assert result["errors"] == {}